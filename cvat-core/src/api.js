@@ -444,6 +444,9 @@ function build() {
                 * @property {integer} clientID read only auto-generated
                 * value which is displayed in a logs
                 * @memberof module:API.cvat.config
+                * @property {string} annotationWireFormat 'json' (default) or 'msgpack',
+                * encoding of annotations sent to and received from the server
+                * @memberof module:API.cvat.config
             */
             get backendAPI() {
                 return config.backendAPI;
@@ -472,6 +475,12 @@ function build() {
             get clientID() {
                 return config.clientID;
             },
+            get annotationWireFormat() {
+                return config.annotationWireFormat;
+            },
+            set annotationWireFormat(value) {
+                config.annotationWireFormat = value;
+            },
         },
         /**
             * Namespace contains some library information e.g. api version
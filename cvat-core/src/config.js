@@ -9,4 +9,6 @@ module.exports = {
     taskID: undefined,
     jobID: undefined,
     clientID: +Date.now().toString().substr(-6),
+    // 'json' or 'msgpack', the latter is smaller and faster to parse for long tracks
+    annotationWireFormat: 'json',
 };
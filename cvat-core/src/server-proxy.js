@@ -5,6 +5,7 @@
 
 /* global
     require:false
+    TextDecoder:false
 */
 
 (() => {
@@ -14,10 +15,29 @@
     } = require('./exceptions');
     const store = require('store');
     const config = require('./config');
+    const {
+        MSGPACK_MEDIA_TYPE,
+        encodeAnnotations,
+        decodeAnnotations,
+    } = require('./wire-format');
+
+    function decodeErrorData(data) {
+        if (!(data instanceof ArrayBuffer)) {
+            return data;
+        }
+
+        // requests with responseType 'arraybuffer' get errors as msgpack or as a plain text
+        try {
+            return decodeAnnotations(data);
+        } catch (error) {
+            return new TextDecoder().decode(data);
+        }
+    }
 
     function generateError(errorData) {
         if (errorData.response) {
-            const message = `${errorData.message}. ${JSON.stringify(errorData.response.data) || ''}.`;
+            const data = decodeErrorData(errorData.response.data);
+            const message = `${errorData.message}. ${JSON.stringify(data) || ''}.`;
             return new ServerError(message, errorData.response.status);
         }
 
@@ -282,17 +302,25 @@
                     queryParams.append("task_type", taskType);
                 }
                 const query = [...queryParams].length > 0 ? `?${queryParams}` : "";
+                const url = `${backendAPI}/tasks/${id}/validate${query}`;
+                const pollInterval = 3000;
 
-                let response = null;
-                try {
-                    response = await Axios.get(`${backendAPI}/tasks/${id}/validate${query}`, {
-                        proxy: config.proxy,
-                    });
-                } catch (errorData) {
-                    throw generateError(errorData);
-                }
-
-                return response.data;
+                return new Promise((resolve, reject) => {
+                    async function request() {
+                        Axios.get(url, {
+                            proxy: config.proxy,
+                        }).then((response) => {
+                            if (response.status === 202) {
+                                setTimeout(request, pollInterval);
+                            } else {
+                                resolve(response.data);
+                            }
+                        }).catch((errorData) => {
+                            reject(generateError(errorData));
+                        });
+                    }
+                    setTimeout(request);
+                });
             }
 
             async function mergeAnnotations(taskId, acceptanceScore) {
@@ -650,16 +678,21 @@
             async function getAnnotations(session, id) {
                 const { backendAPI } = config;
 
+                const msgpack = config.annotationWireFormat === 'msgpack';
                 let response = null;
                 try {
                     response = await Axios.get(`${backendAPI}/${session}s/${id}/annotations`, {
                         proxy: config.proxy,
+                        ...(msgpack ? {
+                            responseType: 'arraybuffer',
+                            headers: { Accept: MSGPACK_MEDIA_TYPE },
+                        } : {}),
                     });
                 } catch (errorData) {
                     throw generateError(errorData);
                 }
 
-                return response.data;
+                return msgpack ? decodeAnnotations(response.data) : response.data;
             }
 
             // Session is 'task' or 'job'
@@ -675,19 +708,31 @@
                     url = `${backendAPI}/${session}s/${id}/annotations?action=${action}`;
                 }
 
+                const msgpack = config.annotationWireFormat === 'msgpack';
                 let response = null;
                 try {
-                    response = await requestFunc(url, JSON.stringify(data), {
-                        proxy: config.proxy,
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                    });
+                    if (msgpack) {
+                        response = await requestFunc(url, encodeAnnotations(data), {
+                            proxy: config.proxy,
+                            responseType: 'arraybuffer',
+                            headers: {
+                                'Content-Type': MSGPACK_MEDIA_TYPE,
+                                Accept: MSGPACK_MEDIA_TYPE,
+                            },
+                        });
+                    } else {
+                        response = await requestFunc(url, JSON.stringify(data), {
+                            proxy: config.proxy,
+                            headers: {
+                                'Content-Type': 'application/json',
+                            },
+                        });
+                    }
                 } catch (errorData) {
                     throw generateError(errorData);
                 }
 
-                return response.data;
+                return msgpack ? decodeAnnotations(response.data) : response.data;
             }
 
             // Session is 'task' or 'job'
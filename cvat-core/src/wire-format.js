@@ -0,0 +1,77 @@
+/*
+* Copyright (C) 2019 Intel Corporation
+* SPDX-License-Identifier: MIT
+*/
+
+/* global
+    require:false
+*/
+
+// Compact encoding of annotations, the server accepts and returns it for 'application/x-msgpack'.
+// The document has the same structure as the JSON one, except that points of shapes
+// and tracked shapes are binary strings of little-endian float32 values.
+(() => {
+    const { encode, decode } = require('@msgpack/msgpack');
+
+    const MSGPACK_MEDIA_TYPE = 'application/x-msgpack';
+
+    function packPoints(points) {
+        const buffer = new ArrayBuffer(points.length * 4);
+        const view = new DataView(buffer);
+        points.forEach((value, index) => view.setFloat32(index * 4, value, true));
+        return new Uint8Array(buffer);
+    }
+
+    function unpackPoints(points) {
+        if (!(points instanceof Uint8Array)) {
+            return points;
+        }
+        const view = new DataView(points.buffer, points.byteOffset, points.byteLength);
+        const result = [];
+        for (let offset = 0; offset + 4 <= points.byteLength; offset += 4) {
+            // float32 has 7 significant digits, the rest are artifacts of the conversion
+            result.push(+view.getFloat32(offset, true).toPrecision(7));
+        }
+        return result;
+    }
+
+    function mapShapePoints(shape, convert) {
+        if (!('points' in shape)) {
+            return shape;
+        }
+        return { ...shape, points: convert(shape.points) };
+    }
+
+    function mapPoints(data, convert) {
+        if (!data || typeof (data) !== 'object' || !('shapes' in data || 'tracks' in data)) {
+            return data;
+        }
+        const result = { ...data };
+        if ('shapes' in data) {
+            result.shapes = data.shapes.map((shape) => mapShapePoints(shape, convert));
+        }
+        if ('tracks' in data) {
+            result.tracks = data.tracks.map((track) => ({
+                ...track,
+                shapes: (track.shapes || []).map((shape) => mapShapePoints(shape, convert)),
+            }));
+        }
+        return result;
+    }
+
+    function encodeAnnotations(data) {
+        const encoded = encode(mapPoints(data, packPoints));
+        // encode() returns a view of a larger buffer, axios would send the whole buffer
+        return encoded.buffer.slice(encoded.byteOffset, encoded.byteOffset + encoded.byteLength);
+    }
+
+    function decodeAnnotations(content) {
+        return mapPoints(decode(new Uint8Array(content)), unpackPoints);
+    }
+
+    module.exports = {
+        MSGPACK_MEDIA_TYPE,
+        encodeAnnotations,
+        decodeAnnotations,
+    };
+})();
@@ -0,0 +1,43 @@
+/*
+ * Copyright (C) 2019 Intel Corporation
+ * SPDX-License-Identifier: MIT
+*/
+
+/* global
+    require:false
+    __dirname:false
+    describe:false
+*/
+
+const fs = require('fs');
+const path = require('path');
+
+const { encodeAnnotations, decodeAnnotations } = require('../../src/wire-format');
+
+// The same fixture is parsed by the server in cvat/apps/engine/tests/test_wire_format.py
+const fixturesDir = path.join(__dirname, '../../../cvat/apps/engine/tests/data');
+const annotations = JSON.parse(fs.readFileSync(path.join(fixturesDir, 'annotations.json')));
+const content = fs.readFileSync(path.join(fixturesDir, 'annotations.msgpack'));
+
+describe('Feature: msgpack wire format', () => {
+    test('encode annotations as the server does', () => {
+        const encoded = encodeAnnotations(annotations);
+        expect(encoded).toBeInstanceOf(ArrayBuffer);
+        expect(Array.from(new Uint8Array(encoded))).toEqual(Array.from(content));
+    });
+
+    test('decode annotations encoded by the server', () => {
+        const { buffer, byteOffset, byteLength } = content;
+        expect(decodeAnnotations(buffer.slice(byteOffset, byteOffset + byteLength)))
+            .toEqual(annotations);
+    });
+
+    test('round trip', () => {
+        expect(decodeAnnotations(encodeAnnotations(annotations))).toEqual(annotations);
+    });
+
+    test('other data is not changed', () => {
+        expect(decodeAnnotations(encodeAnnotations({ detail: 'Not found.' })))
+            .toEqual({ detail: 'Not found.' });
+    });
+});
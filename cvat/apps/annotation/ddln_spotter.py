@@ -24,7 +24,7 @@ format_spec = {
 def dump(file_object, annotations):
     from tempfile import TemporaryDirectory
     from cvat.apps.dataset_manager.util import make_zip_archive
-    from cvat.apps.engine.ddln.transports import migrate, CsvDirectoryImporter, CsvDirectoryExporter, CVATImporter
+    from cvat.apps.engine.ddln.transports import migrate_and_load, CsvDirectoryExporter, CVATImporter
     from cvat.apps.engine.ddln.tasks.spotter import SpotterTaskHandler
     from cvat.apps.engine.ddln.utils import write_task_mapping_file, DdlnYamlWriter
 
@@ -32,9 +32,7 @@ def dump(file_object, annotations):
         importer = CVATImporter(annotations)
         exporter = CsvDirectoryExporter(temp_dir)
         handler = SpotterTaskHandler()
-        migrate(importer, exporter, handler)
-
-        sequences = handler.load_sequences(CsvDirectoryImporter(temp_dir))
+        sequences = migrate_and_load(importer, exporter, handler)
         reporter = handler.validate(sequences)
         validation_file = os.path.join(temp_dir, 'validation.txt')
         reporter.write_text_report(open(validation_file, 'wt'), reporter.severity.WARNING)
@@ -144,7 +144,7 @@ def bulk_create(db_model, objects, flt_param):
                 ids = list(db_model.objects.filter(**flt_param).values_list('id', flat=True))
                 db_model.objects.bulk_create(objects)
 
-                return list(db_model.objects.exclude(id__in=ids).filter(**flt_param))
+                return list(db_model.objects.exclude(id__in=ids).filter(**flt_param).order_by('id'))
         else:
             return db_model.objects.bulk_create(objects)
 
@@ -721,16 +721,38 @@ class TaskAnnotation:
 
     def init_from_db(self):
         self.reset()
-
+        self._load_jobs(self.db_jobs, self.ir_data, self._frame_container)
+
+    def init_versions_from_db(self):
+        """Load annotations of the selected jobs keeping every annotation version apart.
+        Returns OrderedDict {version: (AnnotationIR, FrameContainer or None)}, the same data
+        init_from_db() loads for a job selection by version.
+        """
+        db_jobs_by_version = {}
         for db_job in self.db_jobs:
+            db_jobs_by_version.setdefault(db_job.version, []).append(db_job)
+
+        result = OrderedDict()
+        for version in sorted(db_jobs_by_version):
+            db_jobs = db_jobs_by_version[version]
+            is_extra_annotation = version == 3
+            frame_container = FrameContainer.for_jobs(db_jobs) if is_extra_annotation else None
+            ir_data = AnnotationIR()
+            self._load_jobs(db_jobs, ir_data, frame_container)
+            result[version] = (ir_data, frame_container)
+        return result
+
+    def _load_jobs(self, db_jobs, ir_data, frame_container):
+        for db_job in db_jobs:
             annotation = JobAnnotation(db_job.id, self.user)
             annotation.init_from_db()
-            if annotation.ir_data.version > self.ir_data.version:
-                self.ir_data.version = annotation.ir_data.version
+            if annotation.ir_data.version > ir_data.version:
+                ir_data.version = annotation.ir_data.version
             db_segment = db_job.segment
             start_frame = db_segment.start_frame
             overlap = self.db_task.overlap
-            self._merge_data(annotation.ir_data, start_frame, overlap)
+            data_manager = DataManager(ir_data, frame_container)
+            data_manager.merge(annotation.ir_data, start_frame, overlap)
 
     def dump(self, filename, dumper, scheme, host):
         anno_exporter = Annotation(
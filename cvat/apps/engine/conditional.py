@@ -0,0 +1,59 @@
+import hashlib
+import json
+
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from . import models
+
+# frames never change once a task is created
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def make_etag(*parts):
+    """Returns a strong ETag made of the JSON-serializable parts"""
+    content = json.dumps(parts, sort_keys=True, default=str)
+    return quote_etag(hashlib.sha1(content.encode()).hexdigest())
+
+
+def get_annotations_etag(db_jobs, media_type=None):
+    """Every change of annotations of a job makes a new job commit, so the ids and
+    the last commit versions of the jobs identify their annotations.
+    Representations of different media types get different tags.
+    """
+    versions = db_jobs.annotate(commit_version=Max('commits__version')).order_by('id')
+    return make_etag("annotations", media_type, list(versions.values_list('id', 'commit_version')))
+
+
+def get_task_annotations_etag(task_id, media_type=None):
+    return get_annotations_etag(models.Job.objects.filter(segment__task_id=task_id), media_type)
+
+
+def get_job_annotations_etag(job_id, media_type=None):
+    return get_annotations_etag(models.Job.objects.filter(id=job_id), media_type)
+
+
+def get_frames_meta_etag(db_task):
+    # frames can only be appended to a task, which changes its size
+    return make_etag("frames/meta", db_task.id, db_task.size)
+
+
+def get_not_modified_response(request, etag):
+    """Returns 304 response if the client has the current version of the resource, otherwise None"""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_etag(response, etag)
+    return response
+
+
+def set_etag(response, etag):
+    """Lets clients keep the response, but makes them check it's still current before using it"""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def set_immutable(response):
+    patch_cache_control(response, private=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    return response
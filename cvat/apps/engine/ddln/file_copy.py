@@ -0,0 +1,33 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+
+def copy_tree(source_dir, destination_dir, threads=None):
+    """Copies source_dir to destination_dir like shutil.copytree, files are copied by a pool of threads"""
+    source_dir = Path(source_dir)
+    destination_dir = Path(destination_dir)
+    if threads is None:
+        threads = settings.DDLN_EXPORT_THREADS
+
+    files = []
+    directories = []
+    for dir_path, _, file_names in os.walk(str(source_dir), followlinks=True):
+        relative_dir = Path(dir_path).relative_to(source_dir)
+        destination_dir.joinpath(relative_dir).mkdir(parents=True, exist_ok=False)
+        directories.append(relative_dir)
+        files.extend(relative_dir / name for name in file_names)
+
+    def copy(relative_path):
+        shutil.copy2(str(source_dir / relative_path), str(destination_dir / relative_path))
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # consume the results to raise errors of the copies
+        list(executor.map(copy, files))
+
+    # directories are copied after their content, otherwise copying could change modification time
+    for relative_dir in reversed(directories):
+        shutil.copystat(str(source_dir / relative_dir), str(destination_dir / relative_dir))
@@ -1,5 +1,4 @@
 import logging
-import shutil
 import stat
 import subprocess
 from pathlib import Path
@@ -8,8 +7,9 @@ from tempfile import TemporaryDirectory
 from django.conf import settings
 
 from cvat.apps.engine.models import Task
+from .file_copy import copy_tree
 from .tasks import create_task_handler
-from .transports import CVATImporter, CsvDirectoryExporter, migrate
+from .transports import CVATImporter, CsvDirectoryExporter, migrate_and_load
 from .utils import write_task_mapping_file, DdlnYamlWriter, guess_task_name
 
 logger = logging.getLogger(__name__)
@@ -44,9 +44,7 @@ def export_single_annotation(task, task_type):
         handler = create_task_handler(task_type)
         importer, _ = CVATImporter.for_task(task.id)
         exporter = CsvDirectoryExporter(root_dir, clear_if_exists=False)
-        migrate(importer, exporter, handler)
-
-        sequences = handler.load_sequences(importer)
+        sequences = migrate_and_load(importer, exporter, handler)
         reporter = handler.validate(sequences)
         if reporter.has_violations(reporter.severity.ERROR):
             raise ExportError("Task has validation errors. Please run the validation.")
@@ -78,7 +76,7 @@ def _finalize_export(root_dir, destination_dir):
         raise ExportError("Cannot calculate ddln_id")
     root_dir.joinpath('ddln_id').write_text(ddln_id)
     root_dir.chmod(TARGET_DIR_PERMS)
-    shutil.copytree(str(root_dir), str(destination_dir))
+    copy_tree(root_dir, destination_dir)
 
 
 def calculate_ddln_id(directory, namespace):
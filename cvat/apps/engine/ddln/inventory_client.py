@@ -1,22 +1,25 @@
 import datetime as dt
+import json
 
+import django_rq
 from django.conf import settings
+from django.core.cache import caches
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
 from cvat.apps.engine.log import slogger
-from cvat.apps.engine.utils import singleton, find_range
+from cvat.apps.engine.utils import singleton
 
 
 def record_sequence_completion(job_id, sequence_name, version, task_name, annotator, annotation_date=None):
     if annotation_date is None:
         annotation_date = dt.date.today()
     try:
-        client = create_inventory_client()
-        affected_cells = client.record_sequence_completion(sequence_name, version, task_name, annotator, annotation_date)
-        slogger.glob.info("Job %s completed. Made a record in inventory file: '%s'", job_id, affected_cells)
+        update = ("completion", sequence_name, version, task_name, annotator, _format_date(annotation_date))
+        _queue_update(update)
+        slogger.glob.info("Job %s completed. Queued a record in inventory file: %s", job_id, update)
     except Exception:
-        slogger.glob.exception("Error while making the job completion record")
+        slogger.glob.exception("Error while queueing the job completion record")
 
 
 def record_task_creation(task, segments):
@@ -38,11 +41,11 @@ def record_task_validation(task, validator, validation_date=None):
     if validation_date is None:
         validation_date = dt.date.today()
     try:
-        client = create_inventory_client()
-        affected_cells = client.record_task_validation(task.name, validator, validation_date)
-        slogger.glob.info("Task %s validated. Made a record in inventory file: '%s'", task.id, affected_cells)
+        update = ("validation", task.name, validator, _format_date(validation_date))
+        _queue_update(update)
+        slogger.glob.info("Task %s validated. Queued a record in inventory file: %s", task.id, update)
     except Exception:
-        slogger.glob.exception("Error while making the task validation record")
+        slogger.glob.exception("Error while queueing the task validation record")
 
 
 def record_extra_annotation_creation(task, assignments, version):
@@ -61,6 +64,69 @@ def record_extra_annotation_creation(task, assignments, version):
         slogger.glob.exception("Error while making the extra annotation creation record")
 
 
+def flush_inventory_updates():
+    """Writes all the queued updates to the inventory file in one batch.
+    Updates are removed from the queue only after they are written, failed ones are retried by the next flush.
+    """
+    queue = InventoryUpdateQueue(django_rq.get_connection())
+    updates = queue.peek_all()
+    if not updates:
+        return
+    try:
+        client = create_inventory_client()
+        affected_cells = client.write_updates(updates)
+    except Exception:
+        slogger.glob.exception("Error while writing %s queued records to inventory file: %s", len(updates), updates)
+        _schedule_flush(queue)
+        return
+    queue.remove(len(updates))
+    slogger.glob.info("Made %s records in inventory file: '%s'", len(updates), affected_cells)
+
+
+def _queue_update(update):
+    # making request to google sheet api might take a long time, and every request reads
+    # the spreadsheet, so updates are collected and written by a periodic job in one batch
+    queue = InventoryUpdateQueue(django_rq.get_connection())
+    queue.push(update)
+    _schedule_flush(queue)
+
+
+def _schedule_flush(queue):
+    if queue.mark_flush_scheduled(settings.INVENTORY_FLUSH_INTERVAL):
+        scheduler = django_rq.get_scheduler()
+        scheduler.enqueue_in(dt.timedelta(seconds=settings.INVENTORY_FLUSH_INTERVAL), flush_inventory_updates)
+
+
+def _format_date(date):
+    return "{:%d.%m.%Y}".format(date)
+
+
+class InventoryUpdateQueue:
+    """Updates of the inventory file waiting to be written, shared by all the workers through redis"""
+    key = "inventory.updates"
+    flush_key = "inventory.updates.flush_scheduled"
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def push(self, update):
+        self._connection.rpush(self.key, json.dumps(update))
+
+    def mark_flush_scheduled(self, flush_interval):
+        """Returns True if the caller has to schedule the flush"""
+        # the flag expires, so a lost flush job doesn't block later flushes
+        return bool(self._connection.set(self.flush_key, 1, nx=True, ex=2 * flush_interval))
+
+    def peek_all(self):
+        # updates pushed after this point schedule another flush
+        self._connection.delete(self.flush_key)
+        return [json.loads(value) for value in self._connection.lrange(self.key, 0, -1)]
+
+    def remove(self, count):
+        """Removes the first count updates, the ones pushed while they were written stay in the queue"""
+        self._connection.ltrim(self.key, count, -1)
+
+
 @singleton
 def create_inventory_client():
     # googleapiclient.discovery.build() makes http request to fetch coreapi schema
@@ -72,33 +138,66 @@ def create_inventory_client():
     if spreadsheet_id is None or credentials_file is None:
         slogger.glob.warning("Using DummyInventoryClient as inventory configuration is not properly set")
         return DummyInventoryClient()
-    return InventoryClient(spreadsheet_id, credentials_file)
+    credentials = service_account.Credentials.from_service_account_file(
+        credentials_file, scopes=['https://www.googleapis.com/auth/spreadsheets'])
+    service = build('sheets', 'v4', credentials=credentials)
+    return InventoryClient(spreadsheet_id, service, RowIndexStorage(caches['default'], spreadsheet_id))
+
+
+class RowIndex:
+    """Maps (sequence, version, task) to the row of the inventory file.
+    Rows are expected to be only appended to the file, so only the rows after the indexed ones are read to refresh it.
+    The client checks the indexed rows before writing to them and rebuilds the index if they have been moved.
+    """
+    def __init__(self):
+        self.row_count = 0
+        self._rows = {}
+        # first range of consecutive rows of every task, 1-index, end index is inclusive
+        self._task_ranges = {}
+
+    def add_rows(self, values):
+        for row_index, row in enumerate(values, start=self.row_count + 1):
+            if len(row) == 3:
+                self._rows.setdefault(tuple(row), row_index)
+            task_name = row[2] if len(row) >= 3 else None
+            task_range = self._task_ranges.get(task_name)
+            if task_range is None:
+                self._task_ranges[task_name] = [row_index, row_index]
+            elif task_range[1] == row_index - 1:
+                task_range[1] = row_index
+        self.row_count += len(values)
+
+    def get_row_index(self, sequence_name, version, task_name):
+        return self._rows.get((sequence_name, str(version + 1), task_name), -1)
+
+    def get_task_range(self, task_name):
+        start_row, end_row = self._task_ranges.get(task_name, (0, -1))
+        return start_row, end_row
+
+
+class RowIndexStorage:
+    """Keeps the row index between jobs, as every rq job runs in a new process"""
+    def __init__(self, cache, spreadsheet_id):
+        self._cache = cache
+        self._key = "inventory.row_index.{}".format(spreadsheet_id)
+
+    def load(self):
+        return self._cache.get(self._key) or RowIndex()
+
+    def save(self, index):
+        self._cache.set(self._key, index, None)
 
 
 class InventoryClient:
-    def __init__(self, spreadsheet_id, credentials_file, scopes=None):
-        if scopes is None:
-            scopes = ['https://www.googleapis.com/auth/spreadsheets']
-        credentials = service_account.Credentials.from_service_account_file(credentials_file, scopes=scopes)
-        self._service = build('sheets', 'v4', credentials=credentials)
+    def __init__(self, spreadsheet_id, service, index_storage=None):
+        self._service = service
         self.spreadsheet_id = spreadsheet_id
+        self._index_storage = index_storage
+        self._index = index_storage.load() if index_storage else RowIndex()
 
     def record_sequence_completion(self, sequence_name, version, task_name, annotator, completion_date):
-        row_index = self._get_row_index(sequence_name, version, task_name)
-        if row_index == -1:
-            raise ValueError("sequence {!r} for task {!r}-v{} is not found.".format(sequence_name, task_name, version))
-        completion_date = "{:%d.%m.%Y}".format(completion_date)
-        row = [annotator, completion_date]
-        request = self._service.spreadsheets().values().update(
-            spreadsheetId=self.spreadsheet_id,
-            range='F{}:G{}'.format(row_index, row_index),
-            valueInputOption='USER_ENTERED',
-            body={
-                'values': [row]
-            }
-        )
-        response_data = request.execute()
-        return response_data['updatedRange']
+        update = ("completion", sequence_name, version, task_name, annotator, _format_date(completion_date))
+        return self.write_updates([update])
 
     def record_task_creation(self, task_name, assignment_data):
         if not assignment_data:
@@ -126,47 +225,123 @@ class InventoryClient:
         return response_data['updates']['updatedRange']
 
     def record_task_validation(self, task_name, validator, validation_date):
-        start_row, end_row = self._get_task_range(task_name)
-        if end_row < start_row:
-            raise ValueError("Records for task {!r} are not found.".format(task_name))
-        validation_date = "{:%d.%m.%Y}".format(validation_date)
-        rows = [[validator, validation_date] for _ in range(start_row, end_row + 1)]
-        request = self._service.spreadsheets().values().update(
+        return self.write_updates([("validation", task_name, validator, _format_date(validation_date))])
+
+    def write_updates(self, updates):
+        """Writes completion and validation records with one batchUpdate request.
+        Records, which rows are not found, are skipped with an error in the log.
+        The indexed rows are checked before writing, the index is rebuilt if the rows have been moved.
+        Returns a list of updated ranges.
+        """
+        data, checks, skipped = self._prepare_updates(updates)
+        if checks and not self._rows_match(checks):
+            slogger.glob.warning("Rows of inventory file have been moved, rebuilding the row index")
+            self._rebuild_index()
+            data, checks, skipped = self._prepare_updates(updates)
+        for update, error in skipped:
+            slogger.glob.error("Cannot make inventory record %s: %s", update, error)
+        if not data:
+            return []
+        request = self._service.spreadsheets().values().batchUpdate(
             spreadsheetId=self.spreadsheet_id,
-            range='H{}:I{}'.format(start_row, end_row),
-            valueInputOption='USER_ENTERED',
             body={
-                'values': rows
+                'valueInputOption': 'USER_ENTERED',
+                'data': data,
             }
         )
         response_data = request.execute()
-        return response_data['updatedRange']
+        return [response['updatedRange'] for response in response_data.get('responses', [])]
 
-    def _get_row_index(self, sequence_name, version, task_name):
-        version = str(version + 1)
-        request = self._service.spreadsheets().values().get(
+    def _prepare_updates(self, updates):
+        """Returns the data of batchUpdate, the rows it expects in the file and the updates, which can't be made"""
+        data = []
+        checks = []
+        skipped = []
+        for update in updates:
+            kind, *args = update
+            try:
+                if kind == "completion":
+                    entry, check = self._get_completion_data(*args)
+                elif kind == "validation":
+                    entry, check = self._get_validation_data(*args)
+                else:
+                    raise ValueError("Unknown inventory record {!r}".format(kind))
+            except ValueError as e:
+                skipped.append((update, e))
+                continue
+            data.append(entry)
+            checks.append(check)
+        return data, checks, skipped
+
+    def _get_completion_data(self, sequence_name, version, task_name, annotator, completion_date):
+        row_index = self._get_row_index(sequence_name, version, task_name)
+        if row_index == -1:
+            raise ValueError("sequence {!r} for task {!r}-v{} is not found.".format(sequence_name, task_name, version))
+        entry = {
+            'range': 'F{}:G{}'.format(row_index, row_index),
+            'values': [[annotator, completion_date]],
+        }
+        return entry, (row_index, row_index, (sequence_name, str(version + 1), task_name))
+
+    def _get_validation_data(self, task_name, validator, validation_date):
+        start_row, end_row = self._get_task_range(task_name)
+        if end_row < start_row:
+            raise ValueError("Records for task {!r} are not found.".format(task_name))
+        entry = {
+            'range': 'H{}:I{}'.format(start_row, end_row),
+            'values': [[validator, validation_date] for _ in range(start_row, end_row + 1)],
+        }
+        return entry, (start_row, end_row, (None, None, task_name))
+
+    def _rows_match(self, checks):
+        """Checks (start row, end row, expected A:C values, None matches any value) with one batchGet request"""
+        request = self._service.spreadsheets().values().batchGet(
             spreadsheetId=self.spreadsheet_id,
-            range='A1:C',
+            ranges=['A{}:C{}'.format(start_row, end_row) for start_row, end_row, _ in checks],
         )
-        response_data = request.execute()
-        for i, row in enumerate(response_data['values'], start=1):
-            if len(row) != 3:
-                continue
-            seq, ver, task = row
-            if seq == sequence_name and ver == version and task == task_name:
-                return i
-        return -1
+        value_ranges = request.execute().get('valueRanges', [])
+        if len(value_ranges) != len(checks):
+            return False
+        for (start_row, end_row, expected), value_range in zip(checks, value_ranges):
+            rows = value_range.get('values', [])
+            if len(rows) != end_row - start_row + 1:
+                return False
+            for row in rows:
+                row = row + [''] * (len(expected) - len(row))
+                if any(value is not None and value != actual for value, actual in zip(expected, row)):
+                    return False
+        return True
+
+    def _get_row_index(self, sequence_name, version, task_name):
+        row_index = self._index.get_row_index(sequence_name, version, task_name)
+        if row_index == -1:
+            self._refresh_index()
+            row_index = self._index.get_row_index(sequence_name, version, task_name)
+        return row_index
 
     def _get_task_range(self, task_name):
-        # 1-index, end index is inclusive
+        # rows of the task could be appended after the last refresh
+        self._refresh_index()
+        return self._index.get_task_range(task_name)
+
+    def _rebuild_index(self):
+        self._index = RowIndex()
+        self._refresh_index()
+        if self._index_storage:
+            self._index_storage.save(self._index)
+
+    def _refresh_index(self):
+        # only the rows appended since the last refresh are read
         request = self._service.spreadsheets().values().get(
             spreadsheetId=self.spreadsheet_id,
-            range='C1:C',
+            range='A{}:C'.format(self._index.row_count + 1),
         )
         response_data = request.execute()
-        values = [row[0] if len(row) == 1 else None for row in response_data['values']]
-        start_index, end_index = find_range(values, lambda v: v == task_name)
-        return start_index + 1, end_index
+        values = response_data.get('values', [])
+        if values:
+            self._index.add_rows(values)
+            if self._index_storage:
+                self._index_storage.save(self._index)
 
 
 class DummyInventoryClient:
@@ -178,3 +353,6 @@ class DummyInventoryClient:
 
     def record_task_validation(self, task_name, validator, validation_date):
         return ''
+
+    def write_updates(self, updates):
+        return []
@@ -1,6 +1,7 @@
 import json
 import logging
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -26,7 +27,13 @@ ignored_logger = logger.getChild("ignored")
 
 
 def request_extra_annotation(task, segments, assignees):
-    segments_data = [(s, s.length, set(s.get_performers())) for s in segments]
+    # performers of all segments are loaded at once, only the ones who can be assigned matter
+    assignee_by_id = {a.id: a for a in assignees}
+    performers_by_segment_id = {s.id: set() for s in segments}
+    db_jobs = models.Job.objects.filter(segment__in=segments, assignee_id__in=assignee_by_id)
+    for segment_id, assignee_id in db_jobs.values_list('segment_id', 'assignee_id'):
+        performers_by_segment_id[segment_id].add(assignee_by_id[assignee_id])
+    segments_data = [(s, s.length, performers_by_segment_id[s.id]) for s in segments]
 
     assignments, failed_segments = extend_assignees(segments_data, assignees)
 
@@ -35,12 +42,14 @@ def request_extra_annotation(task, segments, assignees):
 
     with transaction.atomic():
         version = task.times_annotated
-        for segment, assignee in assignments:
-            db_job = models.Job()
-            db_job.segment = segment
-            db_job.version = version
-            db_job.assignee = assignee
-            db_job.save()
+        models.Job.objects.bulk_create([
+            models.Job(segment=segment, version=version, assignee=assignee)
+            for segment, assignee in assignments
+        ])
+        # bulk_create() skips the post_save signal updating the task status,
+        # the new jobs are being annotated, so is the task
+        if assignments:
+            task.status = models.StatusChoice.ANNOTATION
         task.times_annotated += 1
         task.save()
     record_extra_annotation_creation(task, assignments, version)
@@ -124,14 +133,14 @@ def merge(task_id, file_path, acceptance_score):
     ddln_yaml_file = root_dir / "ddln.yaml"
     invalid_frames_file = root_dir / "invalid.yaml"
 
-    annotation_dirs = []
-    extra_annotation_dir = None
-    for version in range(task.times_annotated):
-        version_dir = versions_dir.joinpath("V{}".format(version + 1))
+    version_dirs = [versions_dir.joinpath("V{}".format(version + 1)) for version in range(task.times_annotated)]
+    for version_dir in version_dirs:
         version_dir.mkdir()
+    _dump_versions(task, version_dirs)
 
-        _dump_version(task, version, version_dir)
-
+    annotation_dirs = []
+    extra_annotation_dir = None
+    for version, version_dir in enumerate(version_dirs):
         is_extra_annotation = version == 3
         if is_extra_annotation:
             extra_annotation_dir = version_dir
@@ -157,7 +166,7 @@ def merge(task_id, file_path, acceptance_score):
     yaml_writer.write_invalid_frames(invalid_frames_file.open("wt"), rejected_frames)
     copy_previous_merge_logs(root_dir, task.times_annotated)
 
-    segments = Segment.objects.with_sequence_name().filter(task_id=task.id).prefetch_related('job_set__assignee')
+    segments = Segment.objects.filter(task_id=task.id).prefetch_related('job_set__assignee')
     serializer_context = dict(
         dataset_id_by_sequence_name=yaml_writer.id_by_seq_name,
         rejected_frames=rejected_frames,
@@ -221,9 +230,15 @@ def _remove_archive_file(file_path):
         archive_path.unlink()
 
 
-def _dump_version(task, version, target_dir):
-    job_selection = dict(version=version, jobs=[])
+def _dump_versions(task, version_dirs):
+    importers = CVATImporter.for_task_versions(task.id)
+    jobs = [(importer, version_dirs[version]) for version, importer in importers.items()]
+    with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as executor:
+        # list() re-raises errors of the workers
+        list(executor.map(lambda job: _dump_version(*job), jobs))
+
+
+def _dump_version(importer, target_dir):
     handler = SpotterTaskHandler()
-    importer, _ = CVATImporter.for_task(task.id, job_selection)
     exporter = CsvDirectoryExporter(target_dir)
     migrate(importer, exporter, handler)
@@ -1,5 +1,5 @@
+import bisect
 import itertools
-import heapq as hq
 
 from cvat.apps.engine.utils import natural_order, grouper
 
@@ -68,37 +68,29 @@ def extend_assignees(sequences_data, assignees):
     """
     assignments = []
     failed_sequences = []
+    # (workload, order) of every assignee sorted by workload,
     # order is required because user instances are not comparable,
     # when two users have the same amount of workload, next value in tuple is compared
-    priority_queue = [(0, order, a) for order, a in enumerate(assignees)]
-    hq.heapify(priority_queue)
+    workloads = [(0, order) for order in range(len(assignees))]
     for sequence, sequence_length, performers in sequences_data:
-        workload, order, candidate = _find_candidate(priority_queue, performers)
+        index = _find_candidate(workloads, assignees, performers)
+        candidate = assignees[workloads[index][1]] if index is not None else None
         if not candidate:
             failed_sequences.append(sequence)
             continue
         assignments.append((sequence, candidate))
-        workload += sequence_length
-        hq.heappush(priority_queue, (workload, order, candidate))
+        workload, order = workloads.pop(index)
+        bisect.insort(workloads, (workload + sequence_length, order))
     return assignments, failed_sequences
 
 
-def _find_candidate(priority_queue, performers):
-    backup = []
-    success = False
-    while priority_queue:
-        workload, order, candidate = hq.heappop(priority_queue)
-        if candidate not in performers:
-            success = True
-            break
-        backup.append((workload, order, candidate))
-
-    for item in backup:
-        hq.heappush(priority_queue, item)
-
-    if not success:
-        return None, None, None
-    # if more than 1 assignee could be added to the same sequence,
-    # the candidate would have to be added to the performers
-    # performers.add(candidate)
-    return workload, order, candidate
+def _find_candidate(workloads, assignees, performers):
+    """Returns index of the least loaded assignee, who is not a performer, or None.
+    Unlike popping from a heap, only the performers, who have less workload, are looked at and the list isn't modified.
+    """
+    for index, (_, order) in enumerate(workloads):
+        # if more than 1 assignee could be added to the same sequence,
+        # the candidate would have to be added to the performers
+        if assignees[order] not in performers:
+            return index
+    return None
@@ -2,6 +2,7 @@ import os
 
 import requests
 from datetime import datetime
+from django.core.cache import caches
 
 from cvat.apps.engine.ddln.tasks import guess_task_type
 from cvat.apps.engine.models import Job, Segment
@@ -12,8 +13,26 @@ METRICS_HOST = "http://{}:{}/api/console/proxy?path=_search&method=POST".format(
 )
 
 
+# composite aggregation page size, ES allows at most 10000 buckets per response
+PAGE_SIZE = 1000
+# statistics of periods, which are over, don't change, the rest are cached for a short time
+CACHE_TIMEOUT = 24 * 60 * 60
+CURRENT_PERIOD_CACHE_TIMEOUT = 60
+
+
 def get_statistics(start, end):
-    data = get_analytics_data(start, end)
+    cache = caches['default']
+    key = "ddln.statistics.{}.{}".format(start.isoformat(), end.isoformat())
+    data = cache.get(key)
+    if data is None:
+        data = calculate_statistics(start, end)
+        timeout = CACHE_TIMEOUT if end < datetime.now() else CURRENT_PERIOD_CACHE_TIMEOUT
+        cache.set(key, data, timeout)
+    return data
+
+
+def calculate_statistics(start, end, search=None):
+    data = get_analytics_data(start, end, search)
     job_ids = [e['job_id'] for e in data]
     db_data = get_db_data(job_ids)
     db_record_by_job_id = {e['job_id']: e for e in db_data}
@@ -23,14 +42,13 @@ def get_statistics(start, end):
 
 
 def get_db_data(job_ids):
-    job_segment_id_pair = [(job.id, job.segment.id) for job in Job.objects.filter(id__in=job_ids)]
+    job_segment_id_pair = list(Job.objects.filter(id__in=job_ids).values_list('id', 'segment_id'))
     segment_ids = [segment_id for job_id, segment_id in job_segment_id_pair]
     segments = (
         Segment.objects
         .filter(id__in=segment_ids)
         .select_related("task")
         .prefetch_related("task__label_set")
-        .with_sequence_name()
     )
     segment_data_by_id = {}
     task_type_by_id = {}
@@ -55,9 +73,12 @@ def get_db_data(job_ids):
     return result
 
 
-def get_analytics_data(start, end):
-    finish_data = _get_jobs_finish_data(start, end)
-    start_data = _get_jobs_start_data(start, end)
+def get_analytics_data(start, end, search=None):
+    """search(query) sends the query to Elasticsearch and returns the response data"""
+    if search is None:
+        search = _search
+    finish_data = _get_jobs_finish_data(start, end, search)
+    start_data = _get_jobs_start_data(start, end, search)
     start_record_by_job_id = {e['job_id']: e for e in start_data}
     result = []
     for finish_entry in finish_data:
@@ -75,68 +96,9 @@ def get_analytics_data(start, end):
     return result
 
 
-def _get_jobs_finish_data(start, end):
-    data = {
-        "aggs": {
-            "job_finish": {
-                "terms": {
-                    "field": "job_id",
-                    "size": 999,
-                    "order": {
-                        "_count": "desc"
-                    }
-                },
-                "aggs": {
-                    "last_entry": {
-                        "top_hits": {
-                            "size": 1,
-                            "sort": [
-                                {
-                                    "@timestamp": {
-                                        "order": "desc",
-                                        "unmapped_type": "date"
-                                    }
-                                }
-                            ]
-                        }
-                    }
-                }
-            }
-        },
-        "size": 0,
-        "query": {
-            "bool": {
-                "must": [
-                    {
-                        "range": {
-                            "@timestamp": {
-                                "gte": _to_unix_milliseconds(start),
-                                "lte": _to_unix_milliseconds(end),
-                                "format": "epoch_millis"
-                            }
-                        }
-                    },
-                    {
-                        "match_phrase": {
-                            "event": {
-                                "query": "Send task info"
-                            }
-                        }
-                    }
-                ],
-                "filter": [],
-                "should": [],
-                "must_not": []
-            }
-        }
-    }
-    headers = {"kbn-version": "6.4.0"}
-    response = requests.post(METRICS_HOST, json=data, headers=headers)
-    json = response.json()
-
+def _get_jobs_finish_data(start, end, search):
     result = []
-    for row in json['aggregations']['job_finish']['buckets']:
-        row_data = row['last_entry']['hits']['hits'][0]['_source']
+    for row_data in _iterate_job_entries(start, end, "Send task info", "desc", search):
         entry = {
             "job_id": row_data['job_id'],
             "assignee": row_data['username'],
@@ -148,25 +110,61 @@ def _get_jobs_finish_data(start, end):
     return result
 
 
-def _get_jobs_start_data(start, end):
-    data = {
-        "aggs": {
-            "job_start": {
-                "terms": {
-                    "field": "job_id",
-                    "size": 999,
-                    "order": {
-                        "_count": "desc"
+def _get_jobs_start_data(start, end, search):
+    result = []
+    for row_data in _iterate_job_entries(start, end, "Load job", "asc", search):
+        entry = {
+            "job_id": row_data['job_id'],
+            "object_count": row_data['object count'],
+            "start_time": _parse_time(row_data['@timestamp']),
+        }
+        result.append(entry)
+    return result
+
+
+def _iterate_job_entries(start, end, event, order, search):
+    """Yields the first (order="asc") or the last (order="desc") event entry of every job in the period.
+    Jobs are paginated with composite aggregation, so busy periods are not truncated.
+    """
+    after_key = None
+    while True:
+        data = _build_job_entries_query(start, end, event, order, after_key)
+        aggregation = search(data)['aggregations']['jobs']
+        buckets = aggregation['buckets']
+        for row in buckets:
+            yield row['entry']['hits']['hits'][0]['_source']
+        after_key = aggregation.get('after_key')
+        if len(buckets) < PAGE_SIZE or after_key is None:
+            return
+
+
+def _build_job_entries_query(start, end, event, order, after_key):
+    composite = {
+        "size": PAGE_SIZE,
+        "sources": [
+            {
+                "job_id": {
+                    "terms": {
+                        "field": "job_id"
                     }
-                },
+                }
+            }
+        ]
+    }
+    if after_key is not None:
+        composite["after"] = after_key
+    return {
+        "aggs": {
+            "jobs": {
+                "composite": composite,
                 "aggs": {
-                    "first_entry": {
+                    "entry": {
                         "top_hits": {
                             "size": 1,
                             "sort": [
                                 {
                                     "@timestamp": {
-                                        "order": "asc",
+                                        "order": order,
                                         "unmapped_type": "date"
                                     }
                                 }
@@ -192,7 +190,7 @@ def _get_jobs_start_data(start, end):
                     {
                         "match_phrase": {
                             "event": {
-                                "query": "Load job"
+                                "query": event
                             }
                         }
                     }
@@ -203,20 +201,13 @@ def _get_jobs_start_data(start, end):
             }
         }
     }
+
+
+def _search(data):
     headers = {"kbn-version": "6.4.0"}
     response = requests.post(METRICS_HOST, json=data, headers=headers)
-    json = response.json()
-
-    result = []
-    for row in json['aggregations']['job_start']['buckets']:
-        row_data = row['first_entry']['hits']['hits'][0]['_source']
-        entry = {
-            "job_id": row_data['job_id'],
-            "object_count": row_data['object count'],
-            "start_time": _parse_time(row_data['@timestamp']),
-        }
-        result.append(entry)
-    return result
+    response.raise_for_status()
+    return response.json()
 
 
 def _parse_time(input):
@@ -0,0 +1,67 @@
+import os
+import time
+from stat import S_ISDIR
+
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_KEY_PREFIX = "ddln.task_metadata."
+
+
+def get_task_metadata(task_name, name, load, refresh=False, directories=("*",)):
+    """Returns load(task_dir) for the incoming directory of the task, cached in the Django cache.
+    The cached value is reused until the task directory or one of the subdirectories matching
+    the directories glob patterns changes its mtime, i.e. a file is added, removed or renamed there.
+    The mtimes are checked at most once in DDLN_TASK_METADATA_CHECK_INTERVAL seconds.
+    Use refresh=True after editing a file in place.
+    """
+    task_dir = settings.INCOMING_TASKS_ROOT / task_name
+    cache = _get_cache()
+    key = CACHE_KEY_PREFIX + "{}.{}".format(task_name, name)
+    cached = None if refresh else cache.get(key)
+    now = time.time()
+    if cached is not None and now - cached[2] < settings.DDLN_TASK_METADATA_CHECK_INTERVAL:
+        return cached[1]
+    state = get_directory_state(task_dir, directories)
+    if cached is not None and cached[0] == state:
+        data = cached[1]
+    else:
+        data = load(task_dir)
+    cache.set(key, (state, data, now), None)
+    return data
+
+
+def get_directory_state(path, directories=("*",)):
+    """Returns sorted ((relative path, mtime_ns), ...) of the directory and its subdirectories matching the patterns"""
+    state = []
+    _add_directory_state(path, path, state)
+    for pattern in directories:
+        try:
+            subdirectories = list(path.glob(pattern))
+        except OSError:
+            continue
+        for subdirectory in subdirectories:
+            _add_directory_state(path, subdirectory, state)
+    return tuple(sorted(set(state)))
+
+
+def _add_directory_state(root, path, state):
+    try:
+        path_stat = os.stat(str(path))
+    except OSError:
+        return
+    if S_ISDIR(path_stat.st_mode):
+        state.append((str(path.relative_to(root)), path_stat.st_mtime_ns))
+
+
+def get_ddln_ids(task_name, refresh=False):
+    """Returns {directory name: ddln id} read from the */ddln_id files of the task"""
+    return get_task_metadata(task_name, "ddln_ids", _load_ddln_ids, refresh)
+
+
+def _load_ddln_ids(task_dir):
+    return {f.parent.name: f.read_text().strip() for f in task_dir.glob("*/ddln_id")}
+
+
+def _get_cache():
+    return caches["default"]
@@ -0,0 +1,96 @@
+import json
+
+from django.core.cache import caches
+from django.db.models import Max
+
+from cvat.apps.engine.models import Job
+from cvat.apps.engine.utils import natural_order
+from .tasks import create_task_handler
+from .transports import CVATImporter
+
+CACHE_KEY_PREFIX = "ddln.validation."
+
+
+def get_validation_id(task_id, task_type, options, job_selection):
+    """Identifies validation of a task with the given parameters, used for cache keys and rq job ids"""
+    return json.dumps([task_id, task_type, options, job_selection], sort_keys=True)
+
+
+def get_cached_report(task_id, task_type, options, job_selection):
+    """Returns the text report if none of the selected jobs changed since the last validation, otherwise None"""
+    validation_id = get_validation_id(task_id, task_type, options, job_selection)
+    cached = _get_cache().get(CACHE_KEY_PREFIX + validation_id)
+    if cached is None:
+        return None
+    states = get_sequence_states(task_id, job_selection)
+    if {name: state for name, (state, _) in cached.items()} != states:
+        return None
+    return _build_text_report(task_type, cached)
+
+
+def validate_task(task_id, task_type, options, job_selection):
+    """Validates the task and returns the text report.
+    Only the sequences, which jobs were committed since the previous validation with the same parameters,
+    are loaded and validated again, violations of other sequences are taken from the cache.
+    """
+    validation_id = get_validation_id(task_id, task_type, options, job_selection)
+    cache = _get_cache()
+    cached = cache.get(CACHE_KEY_PREFIX + validation_id) or {}
+
+    states = get_sequence_states(task_id, job_selection)
+    results = {}
+    changed_jobs = []
+    for sequence_name, state in states.items():
+        cached_state, reporter = cached.get(sequence_name, (None, None))
+        if cached_state == state:
+            results[sequence_name] = (state, reporter)
+        else:
+            changed_jobs.extend(job_id for job_id, _ in state)
+
+    if changed_jobs:
+        reporters = _validate_jobs(task_id, task_type, options, changed_jobs, job_selection['version'])
+        for sequence_name, state in states.items():
+            if sequence_name not in results:
+                results[sequence_name] = (state, reporters.get(sequence_name) or _create_reporter(task_type))
+
+    cache.set(CACHE_KEY_PREFIX + validation_id, results, None)
+    return _build_text_report(task_type, results)
+
+
+def get_sequence_states(task_id, job_selection):
+    """Returns {sequence name: ((job id, last commit version), ...)} for the selected jobs of the task"""
+    db_jobs = Job.objects.filter(segment__task_id=task_id).annotate(commit_version=Max("commits__version"))
+    if job_selection['jobs']:
+        db_jobs = db_jobs.filter(id__in=job_selection['jobs'])
+    if job_selection['version'] is not None:
+        db_jobs = db_jobs.filter(version=job_selection['version'])
+
+    states = {}
+    for job_id, sequence_name, commit_version in db_jobs.order_by('id').values_list(
+            'id', 'segment__sequence_name', 'commit_version'):
+        states.setdefault(sequence_name, []).append((job_id, commit_version or 0))
+    return {name: tuple(state) for name, state in states.items()}
+
+
+def _validate_jobs(task_id, task_type, options, job_ids, version):
+    importer, _ = CVATImporter.for_task(task_id, dict(jobs=job_ids, version=version))
+    handler = create_task_handler(task_type)
+    sequences = handler.load_sequences(importer)
+    reporter = handler.validate(sequences, **options)
+    return reporter.split_by_sequence()
+
+
+def _build_text_report(task_type, results):
+    reporter = _create_reporter(task_type)
+    for sequence_name in sorted(results, key=natural_order):
+        _, sequence_reporter = results[sequence_name]
+        reporter.extend(sequence_reporter)
+    return reporter.get_text_report(reporter.severity.WARNING)
+
+
+def _create_reporter(task_type):
+    return create_task_handler(task_type).reporter_class()
+
+
+def _get_cache():
+    return caches["default"]
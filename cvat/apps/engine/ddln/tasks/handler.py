@@ -1,49 +1,88 @@
 import abc
 import csv as pycsv
-from collections import defaultdict, OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import attrgetter
+
+from django.conf import settings
 
 from cvat.apps.engine.utils import natural_order
-from .models import Sequence, Frame
+from ..task_metadata import get_task_metadata
+from ..utils import guess_task_name
+from .models import SequenceLoader, create_frame, group_sequences
 from ..transports.cvat import CVATFrameWriter, CVATFrameReader
 
 
 class TaskHandler(abc.ABC):
     reporter_class = None
+    # validate(sequences, reporter, **kwargs) function of the task type
+    validation_function = None
+    # glob patterns of the incoming task subdirectories _load_extra_info() reads, None if it reads nothing
+    extra_info_directories = None
 
     def __init__(self):
         self.reporter = self.reporter_class()
 
     def load_sequences(self, importer, image_width=None, image_height=None):
-        frames_by_sequence_name = defaultdict(list)
-        for frame_reader in importer.iterate_frames():
-            if not getattr(frame_reader, "image_width", None) and image_width:
-                frame_reader.image_width = image_width
-            if not getattr(frame_reader, "image_height", None) and image_height:
-                frame_reader.image_height = image_height
+        """Yields sequences one at a time.
+        Importers, which declare groups_frames_by_sequence, are read lazily and their sequences come
+        in the importer order. Frames of other importers are all loaded and sorted first.
+        The CVAT importer reads annotations of the whole task from the database, so only the frames
+        converted for validation are loaded lazily.
+        """
+        frames = self._iterate_frames(importer, image_width, image_height)
+        if getattr(importer, "groups_frames_by_sequence", False):
+            yield from group_sequences(frames)
+            return
+        sequence_loader = self.create_sequence_loader()
+        for sequence_name, frame in frames:
+            sequence_loader.add_frame(sequence_name, frame.name, frame.index, frame.objects)
+        yield from sequence_loader.get_sequences()
+
+    def _iterate_frames(self, importer, image_width, image_height):
+        frame_readers = _set_image_dimensions(importer.iterate_frames(), image_width, image_height)
+        for frame_reader, objects in self.iterate_objects_by_sequence(frame_readers):
             frame_index = getattr(frame_reader, "index", None)
-            self.begin_frame(frame_reader.sequence_name, frame_reader.name, frame_index)
-            frame = Frame(frame_reader.name, list(self.iterate_objects(frame_reader)))
-            if hasattr(frame_reader, 'index'):
-                frame.index = frame_reader.index
-            frames_by_sequence_name[frame_reader.sequence_name].append(frame)
-
-        sequences = []
-        for sequence_name, frames in frames_by_sequence_name.items():
-            frames.sort(key=lambda f: f.name)
-            sequences.append(Sequence(sequence_name, frames))
-        sequences.sort(key=lambda s: natural_order(s.name))
-
-        return sequences
-
-    def finalize_task_creation(self, task):
+            yield frame_reader.sequence_name, create_frame(frame_reader.name, frame_index, objects)
+
+    def iterate_objects_by_sequence(self, frame_readers):
+        """Yields (frame reader, list of objects) for every frame.
+        Consecutive frames of a sequence are passed to iterate_sequence_objects() together.
+        """
+        for _, sequence_frame_readers in groupby(frame_readers, key=attrgetter("sequence_name")):
+            yield from self.iterate_sequence_objects(sequence_frame_readers)
+
+    def iterate_sequence_objects(self, frame_readers):
+        """Yields (frame reader, list of objects) for frames of a sequence, the reporter is at the yielded frame.
+        Frames are read one at a time, task types checking the whole sequence at once can override it.
+        """
+        for frame_reader in frame_readers:
+            self.begin_reader_frame(frame_reader)
+            yield frame_reader, list(self.iterate_objects(frame_reader))
+
+    def create_sequence_loader(self):
+        return SequenceLoader()
+
+    def finalize_task_creation(self, task, job_selection=None):
         pass
 
-    def get_extra_info(self, task):
+    def get_extra_info(self, task_name, refresh=False):
+        """Returns {sequence name: OrderedDict of info} read from the incoming directory of the task"""
+        if self.extra_info_directories is None:
+            return None
+        return get_task_metadata(guess_task_name(task_name), "extra_info", self._load_extra_info, refresh,
+            self.extra_info_directories)
+
+    def _load_extra_info(self, task_dir):
         return None
 
     def begin_frame(self, sequence, frame, frame_index=None):
         self.reporter.begin_frame(sequence, frame, frame_index)
 
+    def begin_reader_frame(self, frame_reader):
+        self.begin_frame(frame_reader.sequence_name, frame_reader.name, getattr(frame_reader, "index", None))
+
     def iterate_objects(self, reader):
         if isinstance(reader, CVATFrameReader):
             return self._iterate_cvat_objects(reader)
@@ -54,9 +93,23 @@ class TaskHandler(abc.ABC):
             return self._write_cvat_object(object, writer)
         return self._write_csv_object(object, writer)
 
-    @abc.abstractmethod
-    def validate(self, sequences, **kwargs):
-        pass
+    def validate(self, sequences, processes=None, **kwargs):
+        """Validates sequences in the calling process or, if processes > 1, in a pool of processes.
+        At most a few sequences of a lazy sequence iterator are kept in memory.
+        Violations are added to self.reporter in natural order of sequence names,
+        after the ones reported while loading.
+        """
+        if processes is None:
+            processes = settings.DDLN_VALIDATION_PROCESSES
+        validation_args = (type(self).validation_function, self.reporter_class, kwargs)
+        if processes > 1:
+            results = _validate_in_pool(sequences, validation_args, processes)
+        else:
+            results = [(s.name, _validate_sequence(s, *validation_args)) for s in sequences]
+        results.sort(key=lambda r: natural_order(r[0]))
+        for _, reporter in results:
+            self.reporter.extend(reporter)
+        return self.reporter
 
     @abc.abstractmethod
     def _iterate_cvat_objects(self, reader):
@@ -108,3 +161,34 @@ class TaskHandler(abc.ABC):
                     for field, value in zip(fields, row):
                         key = "#{} {}".format(i, field)
                         entry[key] = value
+
+
+def _set_image_dimensions(frame_readers, image_width, image_height):
+    for frame_reader in frame_readers:
+        if not getattr(frame_reader, "image_width", None) and image_width:
+            frame_reader.image_width = image_width
+        if not getattr(frame_reader, "image_height", None) and image_height:
+            frame_reader.image_height = image_height
+        yield frame_reader
+
+
+def _validate_sequence(sequence, validation_function, reporter_class, kwargs):
+    reporter = reporter_class()
+    validation_function([sequence], reporter, **kwargs)
+    return reporter
+
+
+def _validate_in_pool(sequences, validation_args, processes):
+    results = []
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for sequence in sequences:
+            future = executor.submit(_validate_sequence, sequence, *validation_args)
+            pending.append((sequence.name, future))
+            # don't let the loader run too far ahead of the workers
+            if len(pending) >= 2 * processes:
+                name, future = pending.popleft()
+                results.append((name, future.result()))
+        for name, future in pending:
+            results.append((name, future.result()))
+    return results
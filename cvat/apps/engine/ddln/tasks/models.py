@@ -1,3 +1,9 @@
+from collections import defaultdict
+from itertools import groupby
+
+from cvat.apps.engine.utils import natural_order
+
+
 class Sequence:
     def __init__(self, name, frames=None):
         if frames is None:
@@ -15,3 +21,40 @@ class Frame:
 
     def __repr__(self):
         return 'Frame<{}>'.format(self.name)
+
+
+def create_frame(frame_name, frame_index, objects):
+    frame = Frame(frame_name, objects)
+    frame.index = frame_index
+    return frame
+
+
+class SequenceLoader:
+    """Groups frames coming in any order into sorted sequences"""
+    def __init__(self):
+        self._frames_by_sequence_name = defaultdict(list)
+
+    def add_frame(self, sequence_name, frame_name, frame_index, objects):
+        self._frames_by_sequence_name[sequence_name].append(create_frame(frame_name, frame_index, objects))
+
+    def get_sequences(self):
+        sequences = []
+        for sequence_name, frames in self._frames_by_sequence_name.items():
+            frames.sort(key=lambda f: f.name)
+            sequences.append(Sequence(sequence_name, frames))
+        sequences.sort(key=lambda s: natural_order(s.name))
+        return sequences
+
+
+def group_sequences(frames):
+    """Groups (sequence_name, frame) pairs into sequences with sorted frames.
+    Frames of a sequence must be consecutive, every sequence is yielded as soon as it is complete.
+    """
+    seen_names = set()
+    for sequence_name, sequence_frames in groupby(frames, key=lambda f: f[0]):
+        if sequence_name in seen_names:
+            raise ValueError("Frames of sequence '{}' are not consecutive".format(sequence_name))
+        seen_names.add(sequence_name)
+        sequence_frames = [frame for _, frame in sequence_frames]
+        sequence_frames.sort(key=lambda f: f.name)
+        yield Sequence(sequence_name, sequence_frames)
@@ -9,28 +9,26 @@ from .persistence import csv, cvat
 
 class SpotterTaskHandler(TaskHandler):
     reporter_class = SpotterValidationReporter
+    validation_function = staticmethod(validate)
+    extra_info_directories = ("spo*", "spo*/tracks")
 
-    def finalize_task_creation(self, task):
-        super().finalize_task_creation(task)
+    def finalize_task_creation(self, task, job_selection=None):
+        super().finalize_task_creation(task, job_selection)
         task_name = guess_task_name(task.name)
         hints_dir = settings.INCOMING_TASKS_ROOT / task_name / "hints"
         if hints_dir.exists():
-            load_hints(hints_dir, task)
+            load_hints(hints_dir, task, job_selection)
 
-    def get_extra_info(self, task):
-        task_name = guess_task_name(task.name)
-        scenario_files = list(settings.INCOMING_TASKS_ROOT.joinpath(task_name).glob("spo*.csv"))
+    def _load_extra_info(self, task_dir):
+        scenario_files = list(task_dir.glob("spo*.csv"))
         if len(scenario_files) != 1:
             return None
         scenario_file = scenario_files[0]
         result = self._get_common_extra_info(scenario_file)
-        track_files = settings.INCOMING_TASKS_ROOT.joinpath(task_name).glob("spo*/tracks/*.csv")
+        track_files = task_dir.glob("spo*/tracks/*.csv")
         self._append_per_sequence_info(result, track_files, ['Track ID', 'target', 'type'])
         return result
 
-    def validate(self, sequences, **kwargs):
-        return validate(sequences, self.reporter, **kwargs)
-
     def _iterate_cvat_objects(self, reader):
         return cvat.iterate_bboxes(reader)
 
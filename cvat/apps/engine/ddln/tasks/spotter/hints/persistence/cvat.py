@@ -1,57 +1,161 @@
+from bisect import bisect_left
+
+from django.db.models import Max
+from django.utils import timezone
+
+from cvat.apps.engine import models
+from cvat.apps.engine.annotation import bulk_create
+from cvat.apps.engine.ddln.utils import parse_frame_name
+
+# number of tracked shapes written to the database at once
+BATCH_SIZE = 10000
+
+
 class HintWriter:
-    def __init__(self, exporter, current_sequence):
-        self._exporter = exporter
-        self._track_by_id = {}
-        self._sequence = current_sequence
-        self.can_have_hints = any(label.name == 'Hint' for label in self._exporter._annotations._label_mapping.values())
+    """Writes hints of a new task straight to the database as tracks of the 'Hint' label.
 
-    def write(self, hint, frame, sequence_name):
+    Every hint id of a sequence becomes a track, which is closed with an outside shape.
+    As with TaskAnnotation.create(), a track is added to every selected job having any of its frames.
+    """
+    def __init__(self, task, job_selection=None, batch_size=BATCH_SIZE):
+        self._task = task
+        self._batch_size = batch_size
+        self._label = models.Label.objects.filter(task=task, name='Hint').prefetch_related('attributespec_set').first()
+        self.can_have_hints = self._label is not None
         if not self.can_have_hints:
             return
-        frame_id = self._exporter._frame_id_by_names.get((frame, sequence_name))
-        if frame_id is None:
+        self._spec_by_name = {spec.name: spec for spec in self._label.attributespec_set.all()}
+
+        self._frames = {}
+        self._frame_sequence = {}
+        images = models.Image.objects.filter(task=task).values_list('frame', 'path', 'width', 'height')
+        for frame, path, width, height in images.iterator():
+            frame_name, sequence_name = parse_frame_name(path)
+            self._frames[frame_name, sequence_name] = (frame, width, height)
+            self._frame_sequence[frame] = sequence_name
+
+        db_jobs = models.Job.objects.filter(segment__task=task).select_related('segment').order_by('id')
+        if job_selection and job_selection['jobs']:
+            db_jobs = db_jobs.filter(id__in=job_selection['jobs'])
+        if job_selection and job_selection['version'] is not None:
+            db_jobs = db_jobs.filter(version=job_selection['version'])
+        self._jobs = [(db_job.id, db_job.segment.start_frame, db_job.segment.stop_frame) for db_job in db_jobs]
+
+        self._track_count = {job_id: 0 for job_id, _, _ in self._jobs}
+        self._pending_tracks = []
+        self._pending_shape_count = 0
+
+    def write_sequence(self, sequence_reader):
+        if not self.can_have_hints:
             return
-        annotations = self._exporter._annotations
-        image_width = annotations._frame_info[frame_id]["width"]
-        image_height = annotations._frame_info[frame_id]["height"]
-        track = self._track_by_id.setdefault(hint.id, annotations.Track(label='Hint', group=0, shapes=[]))
-        attributes = [
-            annotations.Attribute(name="Id", value=hint.id),
-            annotations.Attribute(name="Aircraft_type", value=hint.verbose_type),
-            annotations.Attribute(name="Raw_type", value=hint.type),
-            annotations.Attribute(name="Distance_m", value=str(hint.distance)),
-            annotations.Attribute(name="Height_diff_m", value=str(hint.vertical_distance)),
-            annotations.Attribute(name="Velocity_mps", value=str(hint.velocity)),
-        ]
-        shape = annotations.TrackedShape(
-            frame=frame_id,
-            points=hint.get_points(image_width, image_height),
-            attributes=attributes,
-            outside=False,
-            keyframe=True,
-            type='rectangle',
-            occluded=False,
-            z_order=0,
-        )
-        track.shapes.append(shape)
+        shapes_by_id = {}
+        for frame_reader in sequence_reader.iterate_frames():
+            frame = self._frames.get((frame_reader.name, frame_reader.sequence_name))
+            if frame is None:
+                continue
+            frame_id, image_width, image_height = frame
+            for hint in frame_reader.iterate_hints():
+                shape = (frame_id, hint.get_points(image_width, image_height), self._get_attributes(hint), False)
+                shapes_by_id.setdefault(hint.id, []).append(shape)
+
+        for shapes in shapes_by_id.values():
+            shapes.sort(key=lambda s: s[0])
+            self._close_interpolation(shapes, sequence_reader.sequence_name)
+            self._add_track(shapes)
 
     def finish(self):
-        for track in self._track_by_id.values():
-            self._close_interpolation(track.shapes)
-            self._exporter._annotations.add_track(track)
+        if not self.can_have_hints:
+            return
+        self._flush()
+        self._commit()
+
+    def _get_attributes(self, hint):
+        return [
+            ("Id", hint.id),
+            ("Aircraft_type", hint.verbose_type),
+            ("Raw_type", hint.type),
+            ("Distance_m", str(hint.distance)),
+            ("Height_diff_m", str(hint.vertical_distance)),
+            ("Velocity_mps", str(hint.velocity)),
+        ]
 
-    def _close_interpolation(self, shapes):
-        last_shape = shapes[-1]
-        if (last_shape.frame + 1, self._sequence) not in self._exporter._frame_id_by_names:
+    def _close_interpolation(self, shapes, sequence_name):
+        # the outside shape has to be placed on a frame of the same sequence
+        last_frame = shapes[-1][0]
+        if self._frame_sequence.get(last_frame + 1) != sequence_name:
+            if len(shapes) == 1:
+                return
             shapes.pop()
-            last_shape = shapes[-1]
-        shapes.append(self._exporter._annotations.TrackedShape(
-            frame=last_shape.frame + 1,
-            points=last_shape.points.copy(),
-            attributes=last_shape.attributes.copy(),
-            outside=True,
-            keyframe=True,
-            type='rectangle',
-            occluded=False,
-            z_order=0,
-        ))
+        frame, points, attributes, _ = shapes[-1]
+        shapes.append((frame + 1, list(points), list(attributes), True))
+
+    def _add_track(self, shapes):
+        # shapes are sorted by frame, the first one at or after the job start tells if the job has any
+        frames = [frame for frame, *_ in shapes]
+        for job_id, start_frame, stop_frame in self._jobs:
+            i = bisect_left(frames, start_frame)
+            if i == len(frames) or frames[i] > stop_frame:
+                continue
+            self._track_count[job_id] += 1
+            self._pending_tracks.append((job_id, shapes))
+            self._pending_shape_count += len(shapes)
+        if self._pending_shape_count >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending_tracks:
+            return
+        db_tracks = []
+        db_track_attrvals = []
+        for job_id, shapes in self._pending_tracks:
+            db_tracks.append(models.LabeledTrack(job_id=job_id, label=self._label, frame=shapes[0][0], group=0))
+            # immutable attributes are taken from the last shape as Annotation._import_track() does
+            for name, value in shapes[-1][2]:
+                spec = self._spec_by_name.get(name)
+                if spec is not None and not spec.mutable:
+                    db_track_attrvals.append((len(db_tracks) - 1, spec, value))
+        job_ids = [job_id for job_id, _ in self._pending_tracks]
+        db_tracks = bulk_create(models.LabeledTrack, db_tracks, {"job_id__in": job_ids})
+
+        bulk_create(models.LabeledTrackAttributeVal, [
+            models.LabeledTrackAttributeVal(track_id=db_tracks[i].id, spec=spec, value=value)
+            for i, spec, value in db_track_attrvals
+        ], {})
+
+        db_shapes = []
+        db_shape_attributes = []
+        for db_track, (_, shapes) in zip(db_tracks, self._pending_tracks):
+            for frame, points, attributes, outside in shapes:
+                db_shapes.append(models.TrackedShape(track_id=db_track.id, type='rectangle', occluded=False,
+                    z_order=0, points=points, frame=frame, outside=outside))
+                db_shape_attributes.append(attributes)
+        db_shapes = bulk_create(models.TrackedShape, db_shapes, {"track__job_id__in": job_ids})
+
+        db_shape_attrvals = []
+        for db_shape, attributes in zip(db_shapes, db_shape_attributes):
+            for name, value in attributes:
+                spec = self._spec_by_name.get(name)
+                if spec is not None and spec.mutable:
+                    db_shape_attrvals.append(models.TrackedShapeAttributeVal(shape_id=db_shape.id, spec=spec, value=value))
+        bulk_create(models.TrackedShapeAttributeVal, db_shape_attrvals, {})
+
+        self._pending_tracks = []
+        self._pending_shape_count = 0
+
+    def _commit(self):
+        # every selected job gets the same commit JobAnnotation.create() would make
+        job_ids = list(self._track_count)
+        versions = dict(
+            models.JobCommit.objects.filter(job_id__in=job_ids)
+            .values('job_id').annotate(version=Max('version')).values_list('job_id', 'version')
+        )
+        models.JobCommit.objects.bulk_create([
+            models.JobCommit(
+                job_id=job_id,
+                version=(versions.get(job_id) or 0) + 1,
+                message="Changes: tags - 0; shapes - 0; tracks - {}".format(track_count),
+            )
+            for job_id, track_count in self._track_count.items()
+        ])
+        if any(self._track_count.values()):
+            models.Task.objects.filter(id=self._task.id).update(updated_date=timezone.now())
@@ -1,8 +1,169 @@
+from itertools import groupby
+
+import numpy as np
+
 from .models import label_by_class_id
 from ..validation import BaseValidationReporter
 
+COORDINATES = ('left', 'top', 'right', 'bottom')
+
 
 def validate(sequences, reporter=None, jump_threshold=10):
+    """Reports the same violations as validate_per_object(), but checks the boxes of a sequence in bulk"""
+    if reporter is None:
+        reporter = SpotterValidationReporter()
+    for seq in sequences:
+        reporter.sequence = seq.name
+        if seq.frames:
+            reporter.count_frame(seq.name, len(seq.frames))
+        boxes = _SequenceBoxes(seq)
+        checks = _BoxChecks(boxes, jump_threshold)
+        _report_box_checks(seq, boxes, checks, reporter)
+        _validate_track_id_are_consecutive(set(boxes.track_ids), reporter)
+    return reporter
+
+
+class _SequenceBoxes:
+    """Boxes of a sequence as arrays, ordered by frame and by position within the frame"""
+    def __init__(self, seq):
+        self.objects = [bbox for frame in seq.frames for bbox in frame.objects]
+        self.frame = np.repeat(np.arange(len(seq.frames)), [len(frame.objects) for frame in seq.frames])
+        self.index = np.arange(len(self.objects))
+
+        ltwh = np.array([(b.left, b.top, b.width, b.height) for b in self.objects], dtype=np.float64).reshape(-1, 4)
+        self.left, self.top, self.width, self.height = ltwh.T
+        self.right = self.left + self.width
+        self.bottom = self.top + self.height
+
+        # track and class ids are encoded as integers, *_ids map the codes back to values
+        track_codes = {}
+        self.track = np.array([track_codes.setdefault(b.track_id, len(track_codes)) for b in self.objects],
+            dtype=np.int64)
+        self.track_ids = list(track_codes)
+        class_codes = {}
+        self.class_code = np.array([class_codes.setdefault(b.class_id, len(class_codes)) for b in self.objects],
+            dtype=np.int64)
+        self.class_ids = list(class_codes)
+
+
+class _BoxChecks:
+    def __init__(self, boxes, jump_threshold):
+        b = boxes
+        self.out_of_bounds = np.stack([(c < 0) | (c > 1) | np.isnan(c) for c in (b.left, b.top, b.right, b.bottom)])
+        self.left_gt_right = b.left > b.right
+        self.top_gt_bottom = b.top > b.bottom
+        is_valid = ~self.out_of_bounds.any(axis=0) & (b.left <= b.right) & (b.top <= b.bottom)
+
+        self.invalid_track_id = np.array([not _is_int(t) for t in b.track_ids], dtype=bool)[b.track]
+        self.invalid_class_id = np.array([c not in label_by_class_id for c in b.class_ids], dtype=bool)[b.class_code]
+
+        # boxes sorted by track, frame and position, the first box of a track is never a duplicate
+        order = np.lexsort((b.index, b.frame, b.track))
+        sorted_track, sorted_frame = b.track[order], b.frame[order]
+        same_track = np.zeros(len(order), dtype=bool)
+        same_track[1:] = sorted_track[1:] == sorted_track[:-1]
+        same_frame = np.zeros(len(order), dtype=bool)
+        same_frame[1:] = same_track[1:] & (sorted_frame[1:] == sorted_frame[:-1])
+
+        self.duplicated_track_id = np.zeros(len(order), dtype=bool)
+        self.duplicated_track_id[order] = same_frame
+
+        # class of a track is compared with the preceding box of the same track
+        self.previous_class_box = np.full(len(order), -1)
+        changed = same_track.copy()
+        changed[1:] &= b.class_code[order[1:]] != b.class_code[order[:-1]]
+        self.previous_class_box[order[changed]] = order[np.flatnonzero(changed) - 1]
+
+        # position is compared with the last box of the same track on the previous frame
+        group_start = np.where(same_frame, 0, np.arange(len(order)))
+        group_start = np.maximum.accumulate(group_start)
+        candidate = group_start - 1
+        has_candidate = candidate >= 0
+        candidate = np.where(has_candidate, candidate, 0)
+        has_previous = (
+            has_candidate
+            & (sorted_track[candidate] == sorted_track)
+            & (sorted_frame[candidate] == sorted_frame - 1)
+        )
+        previous_box = np.full(len(order), -1)
+        previous_box[order[has_previous]] = order[candidate[has_previous]]
+
+        current = np.flatnonzero((previous_box >= 0) & is_valid)
+        previous = previous_box[current]
+        current, previous = current[is_valid[previous]], previous[is_valid[previous]]
+
+        almost_equal = np.ones(len(current), dtype=bool)
+        for values in (b.left, b.top, b.width, b.height):
+            almost_equal &= _isclose(values[current], values[previous], abs_tol=1e-5)
+        self.no_move = np.zeros(len(order), dtype=bool)
+        self.no_move[current[almost_equal]] = True
+
+        current, previous = current[~almost_equal], previous[~almost_equal]
+        embracing_width = np.maximum(b.right[current], b.right[previous]) - np.minimum(b.left[current], b.left[previous])
+        embracing_height = np.maximum(b.bottom[current], b.bottom[previous]) - np.minimum(b.top[current], b.top[previous])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            width_jump = embracing_width / (b.width[current] + b.width[previous])
+            height_jump = embracing_height / (b.height[current] + b.height[previous])
+        self.large_jump = np.zeros(len(order), dtype=bool)
+        self.large_jump[current[(width_jump > jump_threshold) | (height_jump > jump_threshold)]] = True
+
+    def get_flagged_boxes(self):
+        flagged = (
+            self.out_of_bounds.any(axis=0) | self.left_gt_right | self.top_gt_bottom
+            | self.invalid_track_id | self.invalid_class_id | (self.previous_class_box >= 0)
+            | self.duplicated_track_id | self.no_move | self.large_jump
+        )
+        return np.flatnonzero(flagged)
+
+
+def _report_box_checks(seq, boxes, checks, reporter):
+    for frame_position, box_indices in groupby(checks.get_flagged_boxes(), key=lambda i: boxes.frame[i]):
+        frame = seq.frames[frame_position]
+        reporter.frame = frame.name
+        reporter.frame_index = frame.index
+        duplicated_track_ids = set()
+        for i in box_indices:
+            bbox = boxes.objects[i]
+            for coordinate, out_of_bounds in zip(COORDINATES, checks.out_of_bounds[:, i]):
+                if out_of_bounds:
+                    reporter.report_out_of_bounds(coordinate, getattr(bbox, coordinate))
+            if checks.left_gt_right[i]:
+                reporter.report_left_gt_right()
+            if checks.top_gt_bottom[i]:
+                reporter.report_top_gt_bottom()
+            if checks.invalid_track_id[i]:
+                reporter.report_invalid_track_id_value(bbox.track_id)
+            if checks.invalid_class_id[i]:
+                reporter.report_invalid_class_id_value(bbox.class_id)
+            if checks.previous_class_box[i] >= 0:
+                reporter.report_class_id_change(boxes.objects[checks.previous_class_box[i]].class_id, bbox.class_id)
+            if checks.no_move[i]:
+                reporter.report_no_move()
+            if checks.large_jump[i]:
+                reporter.report_large_jump()
+            if checks.duplicated_track_id[i]:
+                duplicated_track_ids.add(bbox.track_id)
+        for track_id in duplicated_track_ids:
+            reporter.report_track_id_duplication(track_id)
+    reporter.frame = None
+    reporter.frame_index = None
+
+
+def _isclose(a, b, rel_tol=1e-9, abs_tol=0.0):
+    """Element-wise math.isclose() for finite values"""
+    return np.abs(a - b) <= np.maximum(rel_tol * np.maximum(np.abs(a), np.abs(b)), abs_tol)
+
+
+def _is_int(value):
+    try:
+        int(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def validate_per_object(sequences, reporter=None, jump_threshold=10):
+    """Reference implementation of validate(), which checks boxes one by one"""
     if reporter is None:
         reporter = SpotterValidationReporter()
     for seq in sequences:
@@ -25,6 +25,25 @@ class BaseValidationReporter:
     def clear(self):
         self._violations.clear()
 
+    def extend(self, other):
+        """Appends violations and frame counts collected by another reporter"""
+        self._violations.extend(other._violations)
+        for sequence_name, count in other._frames_count_by_sequence.items():
+            self._frames_count_by_sequence[sequence_name] = self._frames_count_by_sequence.get(sequence_name, 0) + count
+
+    def split_by_sequence(self):
+        """Returns {sequence name: reporter} with violations and frame counts of each sequence"""
+        result = {}
+        for violation in self._violations:
+            if violation[0] not in result:
+                result[violation[0]] = type(self)()
+            result[violation[0]]._violations.append(violation)
+        for sequence_name, count in self._frames_count_by_sequence.items():
+            if sequence_name not in result:
+                result[sequence_name] = type(self)()
+            result[sequence_name].count_frame(sequence_name, count)
+        return result
+
     def begin_frame(self, sequence, frame, frame_index=None):
         self.sequence = sequence
         self.frame = frame
@@ -63,8 +82,8 @@ class BaseValidationReporter:
         counts = _serialize_counts(self._frames_count_by_sequence)
         return dict(violations=violations, counts=counts)
 
-    def count_frame(self, sequence_name):
-        self._frames_count_by_sequence[sequence_name] = self._frames_count_by_sequence.get(sequence_name, 0) + 1
+    def count_frame(self, sequence_name, count=1):
+        self._frames_count_by_sequence[sequence_name] = self._frames_count_by_sequence.get(sequence_name, 0) + count
 
     @property
     def frame_name(self):
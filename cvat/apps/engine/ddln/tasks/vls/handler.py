@@ -5,9 +5,7 @@ from .persistence import csv, cvat
 
 class VlsTaskHandler(TaskHandler):
     reporter_class = VlsValidationReporter
-
-    def validate(self, sequences, **kwargs):
-        return validate(sequences, self.reporter, **kwargs)
+    validation_function = staticmethod(validate)
 
     def _iterate_cvat_objects(self, reader):
         return cvat.iterate_runways(reader, self.reporter)
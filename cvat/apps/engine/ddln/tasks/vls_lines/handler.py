@@ -2,30 +2,43 @@ import csv as pycsv
 from collections import OrderedDict
 from itertools import groupby
 
-from django.conf import settings
-
 from ..handler import TaskHandler
+from ...transports.cvat import CVATFrameReader
 from .validation import validate, VlsLinesValidationReporter
 from .persistence import csv, cvat
-from ...utils import guess_task_name
 
 
 class VlsLinesTaskHandler(TaskHandler):
     reporter_class = VlsLinesValidationReporter
+    validation_function = staticmethod(validate)
+    extra_info_directories = ("vls*", "vls*/runways")
 
-    def get_extra_info(self, task):
-        task_name = guess_task_name(task.name)
-        scenario_files = list(settings.INCOMING_TASKS_ROOT.joinpath(task_name).glob("vls*.csv"))
+    def _load_extra_info(self, task_dir):
+        scenario_files = list(task_dir.glob("vls*.csv"))
         if len(scenario_files) != 1:
             return None
         scenario_file = scenario_files[0]
         result = self._get_common_extra_info(scenario_file)
-        runway_files = settings.INCOMING_TASKS_ROOT.joinpath(task_name).glob("vls*/runways/*.csv")
+        runway_files = task_dir.glob("vls*/runways/*.csv")
         self._append_per_sequence_info(result, runway_files, ['Runway ID', 'Runway Info'])
         return result
 
-    def validate(self, sequences, **kwargs):
-        return validate(sequences, self.reporter, **kwargs)
+    def iterate_sequence_objects(self, frame_readers):
+        # runway geometry of the whole sequence is processed in one vectorized call,
+        # numpy overhead makes it slower than the per-runway code for the few runways of a frame
+        frame_readers = list(frame_readers)
+        if not frame_readers:
+            return
+        persistence = cvat if isinstance(frame_readers[0], CVATFrameReader) else csv
+        frames = []
+        for frame_reader in frame_readers:
+            frames.append(persistence.parse_runways(frame_reader))
+            # readers of a long sequence mustn't keep a file open each until the sequence is checked
+            _close_reader(frame_reader)
+        checks = persistence.check_runways([runway for frame in frames for runway in persistence.get_runways(frame)])
+        for frame_reader, frame in zip(frame_readers, frames):
+            self.begin_reader_frame(frame_reader)
+            yield frame_reader, list(persistence.finish_runways(frame, checks, self.reporter))
 
     def _iterate_cvat_objects(self, reader):
         return cvat.iterate_runways(reader, self.reporter)
@@ -38,3 +51,9 @@ class VlsLinesTaskHandler(TaskHandler):
 
     def _write_csv_object(self, object, writer):
         csv.write_runway(object, writer)
+
+
+def _close_reader(frame_reader):
+    close = getattr(frame_reader, "close", None)
+    if close is not None:
+        close()
@@ -1,8 +1,10 @@
 import math
-from itertools import combinations
 from typing import Optional
 
-from cvat.apps.engine.ddln.geometry import Line, Point, get_angle_between
+import numpy as np
+
+from cvat.apps.engine.ddln import vectorized_geometry as vg
+from cvat.apps.engine.ddln.geometry import Line, Point
 
 ANGLE_THRESHOLD = 5 * math.pi / 180
 ERROR_THRESHOLD = 30
@@ -34,17 +36,15 @@ class Runway:
         return self.id
 
     def calculate_vanishing_points(self, reporter):
-        lon_lines = [self.left_line, self.center_line, self.right_line]
-        lon_lines = [line for line in lon_lines if line is not None]
-        if len(lon_lines) > 1:
-            self.lon_vanishing_point = self._calculate_vanishing_point(lon_lines, reporter, is_lon=True)
-        lat_lines = [self.start_line, self.designator_line, self.end_line]
-        if all(line is not None for line in lat_lines):
-            self.lat_vanishing_point = self._calculate_vanishing_point(lat_lines, reporter, is_lon=False)
+        for error in calculate_vanishing_points([self])[0]:
+            report_crossing_error(error, reporter)
 
     def fix_order(self, reporter):
-        self._check_lon_order(reporter)
-        self._check_lat_order(reporter)
+        lon_disorder, lat_disorder = find_disorder([self])[0]
+        if lon_disorder:
+            reporter.report_lon_disorder()
+        if lat_disorder:
+            reporter.report_lat_disorder()
 
     def apply_visibility(
         self,
@@ -85,77 +85,91 @@ class Runway:
         return tuple(result)
 
 
-    def _check_lon_order(self, reporter):
-        # end line is intentionally omitted to avoid false-positives
-        lat_lines = [self.start_line, self.designator_line]
-        if any(line is None for line in lat_lines):
-            return
-        left_points = [line.intersect(self.left_line) for line in lat_lines]
-        right_points = [line.intersect(self.right_line) for line in lat_lines]
-        if any(p is None for p in left_points) or any(p is None for p in right_points):
-            reporter.report_lon_disorder()
-            return
-        left_points_side, is_left_correct = _get_points_side(left_points, self.center_line)
-        right_points_side, is_right_correct = _get_points_side(right_points, self.center_line)
-        if not (is_left_correct and is_right_correct and left_points_side == -right_points_side):
-            reporter.report_lon_disorder()
+def calculate_vanishing_points(runways):
+    """Sets vanishing points of all the runways in one vectorized pass.
+
+    Longitudinal vanishing point needs at least 2 lines, lateral one needs all of them.
+    Returns (lon_error, lat_error) for every runway: the largest distance from the line
+    crossings to the vanishing point, NaN if the point isn't set.
+    """
+    lon_lines = _get_lines(runways, ("left_line", "center_line", "right_line"))
+    lat_lines = _get_lines(runways, ("start_line", "designator_line", "end_line"))
+    lon_points, lon_errors = vg.vanishing_points(lon_lines, ANGLE_THRESHOLD)
+    lat_points, lat_errors = vg.vanishing_points(lat_lines, ANGLE_THRESHOLD)
+
+    has_lon_lines = (~np.isnan(lon_lines).any(axis=-1)).sum(axis=1) > 1
+    has_lat_lines = ~np.isnan(lat_lines).any(axis=(1, 2))
+    lon_errors[~has_lon_lines] = np.nan
+    lat_errors[~has_lat_lines] = np.nan
+    for i, runway in enumerate(runways):
+        if has_lon_lines[i]:
+            runway.lon_vanishing_point = _to_point(lon_points[i])
+        if has_lat_lines[i]:
+            runway.lat_vanishing_point = _to_point(lat_points[i])
+    return list(zip(lon_errors.tolist(), lat_errors.tolist()))
+
+
+def find_disorder(runways):
+    """Checks order of the lines of all the runways in one vectorized pass.
+    Returns (lon_disorder, lat_disorder) for every runway.
+    """
+    left, center, right = _get_lines(runways, ("left_line", "center_line", "right_line")).transpose(1, 0, 2)
+    end, designator, start = _get_lines(runways, ("end_line", "designator_line", "start_line")).transpose(1, 0, 2)
+
+    # end line is intentionally omitted to avoid false-positives
+    has_lat_lines = ~np.isnan(start).any(axis=-1) & ~np.isnan(designator).any(axis=-1)
+    left_points = vg.intersect(np.stack([start, designator]), left)
+    right_points = vg.intersect(np.stack([start, designator]), right)
+    has_points = ~np.isnan(left_points).any(axis=(0, 2)) & ~np.isnan(right_points).any(axis=(0, 2))
+    left_side, is_left_correct = _get_points_side(vg.signed_distances(left_points, center))
+    right_side, is_right_correct = _get_points_side(vg.signed_distances(right_points, center))
+    is_lon_correct = has_points & is_left_correct & is_right_correct & (left_side == -right_side)
+    lon_disorder = has_lat_lines & ~is_lon_correct
+
+    original = np.stack([end, designator, start], axis=1)
+    reference_line = np.where(~np.isnan(center), center, np.where(~np.isnan(left), left, right))
+    distant_point = np.array([_from_point(r.lon_vanishing_point) for r in runways], dtype=np.float64).reshape(-1, 2)
+    crossings = vg.intersect(original, reference_line[:, None])
+    with np.errstate(invalid='ignore'):
+        distances = vg.distances(distant_point[:, None], crossings)
+    is_comparable = ~np.isnan(distances).any(axis=1)
+    order = np.argsort(np.where(is_comparable[:, None], distances, 0), axis=1, kind='stable')
+    final = np.take_along_axis(original, order[..., None], axis=1)
+    lat_disorder = is_comparable & ~vg.lines_equal(final, original).all(axis=1)
+
+    return list(zip(lon_disorder.tolist(), lat_disorder.tolist()))
+
+
+def report_crossing_error(error, reporter):
+    if error > ERROR_THRESHOLD:
+        reporter.report_not_crossing(error)
+
+
+def _get_lines(runways, names):
+    lines = vg.lines_to_array(getattr(runway, name) for runway in runways for name in names)
+    return lines.reshape(len(runways), len(names), 3)
+
+
+def _to_point(coordinates):
+    if np.isnan(coordinates).any():
+        return None
+    x, y = coordinates.tolist()
+    return Point(x, y)
 
-    def _check_lat_order(self, reporter):
-        original = [self.end_line, self.designator_line, self.start_line]
-        if any(line is None for line in original):
-            return
-        reference_line = self.center_line or self.left_line or self.right_line
-        distant_point = self.lon_vanishing_point
-        if not (distant_point and reference_line):
-            return
-        final = sorted(original, key=lambda line: distant_point.distance_to(reference_line.intersect(line)))
-        if final != original:
-            reporter.report_lat_disorder()
 
-    def _calculate_vanishing_point(self, lines, reporter, is_lon):
-        combs = ((a.intersect(b), get_lines_angle(a, b)) for a, b in combinations(lines, 2))
-        points, angles = zip(*combs)
-        points = [p for p in points if p]
-        if not points:
-            return None
-        max_angle = max(angles)
-        if max_angle <= ANGLE_THRESHOLD:
-            return None
-
-        average_point = get_average_point(points)
-        max_error = max(p.distance_to(average_point) for p in points)
-        if max_error > ERROR_THRESHOLD:
-            reporter.report_not_crossing(max_error)
-        return average_point
-
-
-def _get_points_side(points, line):
-    # iterate points and figure out on which side of the line the points are placed
+def _from_point(point):
+    return (point.x, point.y) if point else (np.nan, np.nan)
+
+
+def _get_points_side(distances):
+    # figure out on which side of the line the points are placed, points are along the first axis
     # returns:
     #     -1, True - if all the points are to the left of the line
     #     1, True - if all the points are to the right of the line
     #     0, True - if all the points lie on the line
     #     *, False - if some of the points are on the other side of the line
-    if len(points) == 0:
-        return 0, False
-    distances = (p.signed_distance_to(line) for p in points)
-    sides = (-1 if d < 0 else (1 if d > 0 else 0) for d in distances)
-    result = next(sides)
-    is_correct = all(v == result or v == 0 for v in sides)
+    sides = np.sign(distances)
+    result = sides[0]
+    is_correct = ((sides == result) | (sides == 0)).all(axis=0)
     return result, is_correct
 
-
-def get_lines_angle(a, b):
-    angle = get_angle_between(a.get_angle(), b.get_angle())
-    return angle if angle < math.pi / 2 else (math.pi - angle)
-
-
-def get_average_point(points):
-    if not points:
-        return None
-    n = len(points)
-    sum = Point(0, 0)
-    for p in points:
-        sum += p
-    average_point = Point(sum.x / n, sum.y / n)
-    return average_point
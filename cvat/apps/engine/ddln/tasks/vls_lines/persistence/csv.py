@@ -1,14 +1,21 @@
 import math
 
 from cvat.apps.engine.ddln.geometry import Line, Point, PolarPoint, get_angle_between
-from ..models import Runway
+from ..models import Runway, calculate_vanishing_points, report_crossing_error
 
 
 def iterate_runways(reader, reporter):
-    for row in reader._reader:
+    rows = parse_runways(reader)
+    yield from finish_runways(rows, check_runways(get_runways(rows)), reporter)
+
+
+def parse_runways(reader):
+    """Returns a Runway, or the number of values if the row can't be parsed, for every row of the frame"""
+    rows = []
+    for row in reader.iterate_rows():
         runway_id, *lines_data = row
         if len(lines_data) != 12:  # 6 lines, each line is represented by 2 values
-            reporter.report_wrong_values_amount(12, len(lines_data))
+            rows.append(len(lines_data))
             continue
         left = from_row(lines_data[0:2], reader.image_width, reader.image_height)
         right = from_row(lines_data[2:4], reader.image_width, reader.image_height)
@@ -16,14 +23,35 @@ def iterate_runways(reader, reporter):
         start = from_row(lines_data[6:8], reader.image_width, reader.image_height)
         end = from_row(lines_data[8:10], reader.image_width, reader.image_height)
         designator = from_row(lines_data[10:12], reader.image_width, reader.image_height)
-        runway = Runway(runway_id, left, right, center, start, end, designator)
-        runway.calculate_vanishing_points(reporter)
+        rows.append(Runway(runway_id, left, right, center, start, end, designator))
+    return rows
+
+
+def get_runways(rows):
+    return [row for row in rows if isinstance(row, Runway)]
+
+
+def check_runways(runways):
+    """Calculates vanishing points of the runways of any number of frames at once.
+    Returns an iterator over crossing errors of the runways for finish_runways().
+    """
+    return iter(calculate_vanishing_points(runways))
+
+
+def finish_runways(rows, crossing_errors, reporter):
+    # reports are emitted in the order of the rows
+    for row in rows:
+        if not isinstance(row, Runway):
+            reporter.report_wrong_values_amount(12, row)
+            continue
+        for error in next(crossing_errors):
+            report_crossing_error(error, reporter)
         try:
-            fake_invisible_lines(runway)
+            fake_invisible_lines(row)
         except ValueError as e:
             reporter._report(e.args[0])
             continue
-        yield runway
+        yield row
 
 
 def write_runway(runway: Runway, writer):
@@ -1,6 +1,6 @@
 from cvat.apps.engine.ddln.geometry import Line, Point
 from cvat.apps.engine.utils import grouper
-from ..models import Runway
+from ..models import Runway, find_disorder
 from ...utils import build_attrs_dict
 
 
@@ -9,8 +9,18 @@ class RunwayParseError(ValueError):
 
 
 def iterate_runways(reader, reporter):
+    frame = parse_runways(reader)
+    yield from finish_runways(frame, check_runways(get_runways(frame)), reporter)
+
+
+def parse_runways(reader):
+    """Returns (reports, runways) of the frame.
+    Reports are (reporter method name, args), runways are (Runway, visibility) or (None, RunwayParseError).
+    """
+    reports = []
+    runways = []
     if not reader._frame_annotation:
-        return
+        return reports, runways
 
     lons = {}
     lats = {}
@@ -23,24 +33,55 @@ def iterate_runways(reader, reporter):
         runway_id = attrs['Runway_ID']
         if label == 'Vertical line':
             if runway_id in lons:
-                reporter.report_duplicated_rays(runway_id, is_lon=True)
+                reports.append(("report_duplicated_rays", (runway_id, True)))
             lons[runway_id] = (shape, attrs)
         elif label == 'Horizontal line':
             if runway_id in lats:
-                reporter.report_duplicated_rays(runway_id, is_lon=False)
+                reports.append(("report_duplicated_rays", (runway_id, False)))
             lats[runway_id] = (shape, attrs)
         else:
-            reporter.report_unknown_label(label)
+            reports.append(("report_unknown_label", (label,)))
 
     for runway_id in (lats.keys() - lons.keys()):
-        reporter.report_missing_rays(runway_id, is_lon=True)
+        reports.append(("report_missing_rays", (runway_id, True)))
 
     for runway_id, lon in lons.items():
         lat = lats.get(runway_id)
         try:
-            yield _parse_rays(lon, lat, reporter)
+            runways.append(_parse_rays(lon, lat))
         except RunwayParseError as e:
-            reporter._report(e.args[0])
+            runways.append((None, e))
+    return reports, runways
+
+
+def get_runways(frame):
+    _, runways = frame
+    return [runway for runway, _ in runways if runway is not None]
+
+
+def check_runways(runways):
+    """Checks order of the lines of the runways of any number of frames at once.
+    Returns an iterator over (lon_disorder, lat_disorder) of the runways for finish_runways().
+    """
+    return iter(find_disorder(runways))
+
+
+def finish_runways(frame, disorder, reporter):
+    # reports are emitted in the order of the shapes
+    reports, runways = frame
+    for method_name, args in reports:
+        getattr(reporter, method_name)(*args)
+    for runway, visibility in runways:
+        if runway is None:
+            reporter._report(visibility.args[0])
+            continue
+        lon_disorder, lat_disorder = next(disorder)
+        if lon_disorder:
+            reporter.report_lon_disorder()
+        if lat_disorder:
+            reporter.report_lat_disorder()
+        runway.apply_visibility(*visibility)
+        yield runway
 
 
 def write_runway(runway: Runway, writer):
@@ -73,7 +114,7 @@ def write_runway(runway: Runway, writer):
     writer._annotations.add_shape(writer._annotations.LabeledShape(**lat_shape))
 
 
-def _parse_rays(lon, lat, reporter):
+def _parse_rays(lon, lat):
     lon_shape, lon_attrs = lon
     runway_id = lon_attrs['Runway_ID']
     left_visible = bool(int(lon_attrs['Left(1)']))
@@ -94,9 +135,8 @@ def _parse_rays(lon, lat, reporter):
     runway = Runway(runway_id, left, right, center, start, end, designator)
     runway.lon_vanishing_point = lon_vanishing_point
     runway.lat_vanishing_point = lat_vanishing_point
-    runway.fix_order(reporter)
-    runway.apply_visibility(left_visible, right_visible, center_visible, start_visible, end_visible, designator_visible)
-    return runway
+    visibility = (left_visible, right_visible, center_visible, start_visible, end_visible, designator_visible)
+    return runway, visibility
 
 
 def _parse_lines(shape):
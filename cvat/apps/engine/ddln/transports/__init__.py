@@ -1,16 +1,50 @@
 from .csv import CsvDirectoryExporter, CsvZipExporter, CsvDirectoryImporter, CsvZipImporter
 from .cvat import CVATExporter, CVATImporter
+from .packed import PackedDirectoryExporter, PackedZipExporter, PackedDirectoryImporter, PackedZipImporter
 
 
-def migrate(importer, exporter, handler):
+def migrate(importer, exporter, handler, sequence_loader=None):
+    """Copy objects frame by frame from importer to exporter.
+    If sequence_loader is given, it also receives the objects of every frame.
+    """
     with exporter as exporter_rv:
-        for frame_reader in importer.iterate_frames():
-            frame_index = getattr(frame_reader, "index", None)
-            handler.begin_frame(frame_reader.sequence_name, frame_reader.name, frame_index)
-            with exporter_rv.begin_frame(frame_reader.name, frame_reader.sequence_name) as frame_writer:
+        frame_writers = {}
+
+        def begin_frames():
+            for frame_reader in importer.iterate_frames():
+                frame_writer = exporter_rv.begin_frame(frame_reader.name, frame_reader.sequence_name)
                 pass_image_dimensions(frame_reader, frame_writer)
-                for object in handler.iterate_objects(frame_reader):
+                frame_writers[frame_reader] = frame_writer
+                yield frame_reader
+
+        # the handler may read all the frames of a sequence before returning objects of the first one
+        for frame_reader, objects in handler.iterate_objects_by_sequence(begin_frames()):
+            with frame_writers.pop(frame_reader) as frame_writer:
+                for object in objects:
                     handler.write_object(object, frame_writer)
+            if sequence_loader is not None:
+                frame_index = getattr(frame_reader, "index", None)
+                sequence_loader.add_frame(frame_reader.sequence_name, frame_reader.name, frame_index, objects)
+
+
+def migrate_and_load(importer, exporter, handler):
+    """Same as migrate() followed by handler.load_sequences(importer), but iterates over the frames once.
+    Returns the sequences ready for validation.
+    """
+    sequence_loader = handler.create_sequence_loader()
+    migrate(importer, exporter, handler, sequence_loader)
+    return sequence_loader.get_sequences()
+
+
+def convert(importer, exporter):
+    """Copy CSV rows frame by frame between file based transports, e.g. from the per-frame CSV layout
+    to the packed one and back. Rows are copied as is, so no task handler is needed.
+    """
+    with exporter as exporter_rv:
+        for frame_reader in importer.iterate_frames():
+            with exporter_rv.begin_frame(frame_reader.name, frame_reader.sequence_name) as frame_writer:
+                for row in frame_reader.iterate_rows():
+                    frame_writer.write_row(row)
 
 
 def pass_image_dimensions(reader, writer):
@@ -5,6 +5,8 @@ import shutil
 import zipfile
 from pathlib import Path
 
+from cvat.apps.engine.utils import natural_order
+
 
 class CsvDirectoryExporter:
     def __init__(self, base_dir, clear_if_exists=True):
@@ -54,6 +56,9 @@ class FrameZipWriter:
     def __enter__(self):
         return self
 
+    def write_row(self, row):
+        self._writer.writerow(row)
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._archive.writestr(self._path, self._file.getvalue())
 
@@ -69,6 +74,9 @@ class FrameFileWriter:
     def __enter__(self):
         return self
 
+    def write_row(self, row):
+        self._writer.writerow(row)
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._path.write_text(self._file.getvalue())
@@ -88,11 +96,15 @@ class CsvZipImporter:
 
 
 class CsvDirectoryImporter:
+    groups_frames_by_sequence = True
+
     def __init__(self, directory_path):
         self._path = Path(directory_path)
 
     def iterate_frames(self):
-        for path in self._path.glob('*/*_y.csv'):
+        sequence_dirs = sorted((p for p in self._path.iterdir() if p.is_dir()), key=lambda p: natural_order(p.name))
+        paths = (path for sequence_dir in sequence_dirs for path in sequence_dir.glob('*_y.csv'))
+        for path in paths:
             short_path = str(path.relative_to(self._path))
             match = _filename_regex.match(short_path)
             if not match:
@@ -110,5 +122,11 @@ class FrameReader:
         self.image_width = None
         self.image_height = None
 
+    def iterate_rows(self):
+        return iter(self._reader)
+
+    def close(self):
+        self._file.close()
+
 
 _filename_regex = re.compile(r"(.*)/(.*)_y.csv")
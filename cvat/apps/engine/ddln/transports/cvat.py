@@ -26,6 +26,30 @@ class CVATMixin:
         )
         return cls(anno_exporter), annotation
 
+    @classmethod
+    def for_task_versions(cls, task_id):
+        """Returns {version: importer} for all annotation versions of the task.
+        The task and every job are loaded from the database once.
+        """
+        from cvat.apps.annotation.annotation import Annotation
+        from cvat.apps.engine.annotation import TaskAnnotation
+
+        with transaction.atomic():
+            annotation = TaskAnnotation(task_id, AnonymousUser())
+            data_by_version = annotation.init_versions_from_db()
+
+        importers = {}
+        for version, (ir_data, frame_container) in data_by_version.items():
+            anno_exporter = Annotation(
+                annotation_ir=ir_data,
+                db_task=annotation.db_task,
+                scheme='https',
+                host='',
+                frame_container=frame_container,
+            )
+            importers[version] = cls(anno_exporter)
+        return importers
+
 
 class CVATExporter(CVATMixin):
     def __init__(self, annotations):
@@ -72,9 +96,10 @@ class CVATFrameWriter:
 
 
 class CVATImporter(CVATMixin):
+    groups_frames_by_sequence = True
+
     def iterate_frames(self):
-        for frame_annotation in self._annotations.group_by_frame(omit_empty_frames=False):
-            frame_name, sequence_name = parse_frame_name(frame_annotation.name)
+        for frame_annotation, (frame_name, sequence_name) in self._iterate_grouped_frames():
             frame_index = frame_annotation.frame
 
             has_empty_placeholder = any(shape.label.lower() == "empty" for shape in frame_annotation.labeled_shapes)
@@ -84,6 +109,16 @@ class CVATImporter(CVATMixin):
 
             yield CVATFrameReader(frame_annotation, frame_name, sequence_name, frame_index)
 
+    def _iterate_grouped_frames(self):
+        # sequences are frame ranges of the task, unless images were appended to an existing sequence later.
+        # Annotations of all frames are in memory already, the list only refers to them
+        frames = [(f, parse_frame_name(f.name)) for f in self._annotations.group_by_frame(omit_empty_frames=False)]
+        sequence_positions = {}
+        for position, (_, (_, sequence_name)) in enumerate(frames):
+            sequence_positions.setdefault(sequence_name, position)
+        frames.sort(key=lambda f: sequence_positions[f[1][1]])
+        return frames
+
 
 class CVATFrameReader:
     def __init__(self, frame_annotation, frame_name, sequence_name, index):
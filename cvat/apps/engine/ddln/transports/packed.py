@@ -0,0 +1,170 @@
+"""Packed layout: one CSV file per sequence instead of one file per frame.
+
+Every frame starts with a header row (frame name, number of object rows),
+followed by its object rows in the same format as in the per-frame CSV files:
+
+    frame_000,2
+    0.100000,0.100000,0.200000,0.200000,1,1
+    0.300000,0.300000,0.400000,0.400000,2,1
+    frame_001,0
+"""
+import csv
+import io
+import re
+import shutil
+import zipfile
+from pathlib import Path
+
+from cvat.apps.engine.utils import natural_order
+
+PACKED_SUFFIX = "_y.packed.csv"
+
+
+class _PackedExporter:
+    """Frames of a sequence are buffered until a frame of another sequence is written,
+    so only one sequence is kept in memory if the frames are grouped by sequence.
+    """
+    def __init__(self):
+        self._sequence_name = None
+        self._sequence_file = None
+        self._written_sequences = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._end_sequence()
+
+    def begin_frame(self, frame_name, sequence_name):
+        return PackedFrameWriter(self, frame_name, sequence_name)
+
+    def _write_frame(self, sequence_name, content):
+        if sequence_name != self._sequence_name:
+            self._end_sequence()
+            self._sequence_name = sequence_name
+            self._sequence_file = io.StringIO(newline="")
+        self._sequence_file.write(content)
+
+    def _end_sequence(self):
+        if self._sequence_name is None:
+            return
+        append = self._sequence_name in self._written_sequences
+        self._write_sequence(self._sequence_name, self._sequence_file.getvalue(), append)
+        self._written_sequences.add(self._sequence_name)
+        self._sequence_name = None
+        self._sequence_file = None
+
+    def _write_sequence(self, sequence_name, content, append):
+        raise NotImplementedError
+
+
+class PackedDirectoryExporter(_PackedExporter):
+    def __init__(self, base_dir, clear_if_exists=True):
+        super().__init__()
+        self._base_dir_path = Path(base_dir)
+        if clear_if_exists and self._base_dir_path.exists():
+            shutil.rmtree(str(self._base_dir_path))
+
+    def _write_sequence(self, sequence_name, content, append):
+        self._base_dir_path.mkdir(parents=True, exist_ok=True)
+        path = self._base_dir_path / (sequence_name + PACKED_SUFFIX)
+        with path.open('a' if append else 'w', newline="") as file:
+            file.write(content)
+
+
+class PackedZipExporter(_PackedExporter):
+    def __init__(self, file_object):
+        super().__init__()
+        self._archive = zipfile.ZipFile(file_object, 'w')
+
+    def __enter__(self):
+        self._archive.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            super().__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._archive.__exit__(exc_type, exc_val, exc_tb)
+
+    def _write_sequence(self, sequence_name, content, append):
+        if append:
+            raise ValueError("Frames of sequence '{}' aren't grouped together".format(sequence_name))
+        self._archive.writestr(sequence_name + PACKED_SUFFIX, content)
+
+    def get_archive(self):
+        return self._archive
+
+
+class PackedFrameWriter:
+    def __init__(self, exporter, frame_name, sequence_name):
+        self._exporter = exporter
+        self._frame_name = frame_name
+        self._sequence_name = sequence_name
+        self._file = io.StringIO(newline="")
+        self._writer = csv.writer(self._file, lineterminator="\n")
+        self.image_width = None
+        self.image_height = None
+
+    def __enter__(self):
+        return self
+
+    def write_row(self, row):
+        self._writer.writerow(row)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        content = self._file.getvalue()
+        row_count = sum(1 for _ in csv.reader(io.StringIO(content, newline=""), lineterminator="\n"))
+        header = io.StringIO(newline="")
+        csv.writer(header, lineterminator="\n").writerow((self._frame_name, row_count))
+        self._exporter._write_frame(self._sequence_name, header.getvalue() + content)
+
+
+class PackedDirectoryImporter:
+    groups_frames_by_sequence = True
+
+    def __init__(self, directory_path):
+        self._path = Path(directory_path)
+
+    def iterate_frames(self):
+        paths = {path.name[:-len(PACKED_SUFFIX)]: path for path in self._path.glob('*' + PACKED_SUFFIX)}
+        for sequence_name in sorted(paths, key=natural_order):
+            with paths[sequence_name].open('rb') as file:
+                yield from iterate_packed_frames(file, sequence_name)
+
+
+class PackedZipImporter:
+    groups_frames_by_sequence = True
+
+    def __init__(self, file_object):
+        self._archive = zipfile.ZipFile(file_object, "r")
+
+    def iterate_frames(self):
+        matches = (_filename_regex.fullmatch(path) for path in self._archive.namelist())
+        paths = {match.group(1): match.group(0) for match in matches if match}
+        for sequence_name in sorted(paths, key=natural_order):
+            with self._archive.open(paths[sequence_name]) as file:
+                yield from iterate_packed_frames(file, sequence_name)
+
+
+class PackedFrameReader:
+    def __init__(self, rows, frame_name, sequence_name):
+        self.name = frame_name
+        self.sequence_name = sequence_name
+        self._reader = rows
+        self.image_width = None
+        self.image_height = None
+
+    def iterate_rows(self):
+        return iter(self._reader)
+
+
+def iterate_packed_frames(file, sequence_name):
+    reader = csv.reader(io.TextIOWrapper(file, newline=""), lineterminator="\n")
+    for frame_name, row_count in reader:
+        rows = [next(reader) for _ in range(int(row_count))]
+        yield PackedFrameReader(rows, frame_name, sequence_name)
+
+
+_filename_regex = re.compile(r"([^/]*){}".format(re.escape(PACKED_SUFFIX)))
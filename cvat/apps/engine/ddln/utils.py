@@ -8,6 +8,7 @@ import yaml
 from django.conf import settings
 
 from cvat.apps.engine.utils import natural_order
+from .task_metadata import get_ddln_ids
 
 
 def parse_frame_name(path):
@@ -64,18 +65,17 @@ def guess_task_name(name):
     return name
 
 
-def get_annotation_request_id(task_name):
-    task_dir = settings.INCOMING_TASKS_ROOT / task_name
-    ddln_id_files = [*task_dir.glob("spo_*/ddln_id"), *task_dir.glob("vls_*/ddln_id")]
-    if len(ddln_id_files) != 1:
+def get_annotation_request_id(task_name, refresh=False):
+    ddln_ids = get_ddln_ids(task_name, refresh)
+    request_ids = [ddln_id for name, ddln_id in ddln_ids.items() if name.startswith(("spo_", "vls_"))]
+    if len(request_ids) != 1:
         return None
-    return ddln_id_files[0].read_text().strip()
+    return request_ids[0]
 
 
-def get_sequence_id_mapping(task_name):
-    task_dir = settings.INCOMING_TASKS_ROOT / task_name
+def get_sequence_id_mapping(task_name, refresh=False):
     # it's ok that spo_* and vls_* files get into the dict, they won't be accessed later
-    return {f.parent.name: f.read_text().strip() for f in task_dir.glob("*/ddln_id")}
+    return get_ddln_ids(task_name, refresh)
 
 
 class OrderedDumper(yaml.Dumper):
@@ -97,7 +97,8 @@ OrderedDumper.add_representer(type(None), _represent_none)
 class DdlnYamlWriter:
     def __init__(self, task_name, add_merger_info=True):
         self.task_name = guess_task_name(task_name)
-        self.annotation_request_id = get_annotation_request_id(self.task_name)
+        # ddln_id files rewritten in place don't change directory mtimes, exports always read them
+        self.annotation_request_id = get_annotation_request_id(self.task_name, refresh=True)
         self.id_by_seq_name = get_sequence_id_mapping(self.task_name)
         self._add_merger_info = add_merger_info
 
@@ -0,0 +1,90 @@
+"""Array counterparts of the geometry module for processing many lines at once.
+
+Lines are arrays of shape (..., 3) with (a, b, c) coefficients normalized as in Line,
+points are arrays of shape (..., 2). Missing lines and points are NaN.
+"""
+from itertools import combinations
+
+import numpy as np
+
+from .geometry import ABS_TOL, D
+
+
+def lines_to_array(lines):
+    return np.array([(line.a, line.b, line.c) if line is not None else (np.nan,) * 3 for line in lines],
+        dtype=np.float64).reshape(-1, 3)
+
+
+def intersect(first, second):
+    """Intersection points of the lines, NaN for parallel lines"""
+    a1, b1, c1 = np.moveaxis(first, -1, 0)
+    a2, b2, c2 = np.moveaxis(second, -1, 0)
+    divisor = a1 * b2 - a2 * b1
+    divisor = np.where(_isclose_to_zero(divisor), np.nan, divisor)
+    x = (b1 * c2 - b2 * c1) / divisor
+    y = (a2 * c1 - a1 * c2) / divisor
+    return np.stack([x, y], axis=-1)
+
+
+def signed_distances(points, lines):
+    # lines are normalized, so there is no need to divide by sqrt(a ** 2 + b ** 2)
+    return lines[..., 0] * points[..., 0] + lines[..., 1] * points[..., 1] + lines[..., 2]
+
+
+def distances(first, second):
+    return np.sqrt((second[..., 0] - first[..., 0]) ** 2 + (second[..., 1] - first[..., 1]) ** 2)
+
+
+def line_angles(lines):
+    return np.arctan2(-lines[..., 0], lines[..., 1])
+
+
+def get_angle_between(alpha, beta):
+    """Closest angles between alpha and beta in range [0, pi]"""
+    diff = np.mod(beta - alpha, D)
+    return np.where(diff <= np.pi, diff, D - diff)
+
+
+def get_lines_angle(first, second):
+    """Acute angles between the lines"""
+    angle = get_angle_between(line_angles(first), line_angles(second))
+    return np.where(angle < np.pi / 2, angle, np.pi - angle)
+
+
+def vanishing_points(lines, angle_threshold):
+    """Averages pairwise intersections of line groups of shape (N, K, 3).
+
+    There is no vanishing point if the lines don't cross or the largest angle
+    between them is not above angle_threshold.
+    Returns the points (N, 2) and the largest distances (N,) from the intersections to the points.
+    """
+    lines = np.asarray(lines, dtype=np.float64)
+    first, second = zip(*combinations(range(lines.shape[1]), 2))
+    first_lines, second_lines = lines[:, first], lines[:, second]
+
+    points = intersect(first_lines, second_lines)
+    has_point = ~np.isnan(points).any(axis=-1)
+    with np.errstate(invalid='ignore'):
+        angles = get_lines_angle(first_lines, second_lines)
+    has_lines = ~np.isnan(first_lines).any(axis=-1) & ~np.isnan(second_lines).any(axis=-1)
+    max_angle = np.where(has_lines, angles, -np.inf).max(axis=1)
+
+    point_count = has_point.sum(axis=1)
+    exists = (point_count > 0) & (max_angle > angle_threshold)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        average = np.where(has_point[..., None], points, 0).sum(axis=1) / point_count[:, None]
+        errors = np.where(has_point, distances(points, average[:, None]), -np.inf).max(axis=1)
+    average[~exists] = np.nan
+    errors[~exists] = np.nan
+    return average, errors
+
+
+def lines_equal(first, second):
+    """Element-wise Line.__eq__"""
+    diff = np.abs(first - second)
+    tolerance = np.maximum(1e-9 * np.maximum(np.abs(first), np.abs(second)), ABS_TOL)
+    return (diff <= tolerance).all(axis=-1)
+
+
+def _isclose_to_zero(values):
+    return np.abs(values) <= ABS_TOL
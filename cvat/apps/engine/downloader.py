@@ -0,0 +1,107 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _RetriableError(Exception):
+    pass
+
+
+_RETRIABLE_ERRORS = (
+    _RetriableError,
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class Downloader:
+    """Download files concurrently through a pool of HTTP connections.
+
+    Failed downloads are retried with exponential backoff. Data are streamed
+    into '<path>.part' files, which are resumed with HTTP Range requests on retry
+    and renamed to the target path when complete.
+    """
+    def __init__(self, pool_size=8, retries=3, backoff=1.0, block_size=1024 * 1024,
+            timeout=60, on_progress=None):
+        self._pool_size = pool_size
+        self._retries = retries
+        self._backoff = backoff
+        self._block_size = block_size
+        self._timeout = timeout
+        # on_progress(url, downloaded_bytes, total_bytes), total_bytes is None if unknown
+        self._on_progress = on_progress
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = 'Mozilla/5.0'
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def download_all(self, files):
+        """Download the list of (url, path) pairs"""
+        with ThreadPoolExecutor(max_workers=self._pool_size) as executor:
+            for _ in executor.map(lambda f: self.download(*f), files):
+                pass
+
+    def download(self, url, path):
+        for attempt in range(self._retries + 1):
+            try:
+                self._download(url, path)
+                return
+            except _RETRIABLE_ERRORS as err:
+                if attempt == self._retries:
+                    raise DownloadError("Failed to download {}. {}".format(url, err)) from err
+                time.sleep(self._backoff * 2 ** attempt)
+            except requests.RequestException as err:
+                raise DownloadError("Invalid URL: {}. {}".format(url, err)) from err
+
+    def _download(self, url, path):
+        part_path = path + '.part'
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {'Range': 'bytes={}-'.format(offset)} if offset else {}
+
+        with self._session.get(url, headers=headers, stream=True, timeout=self._timeout) as response:
+            if response.status_code == 416 and offset:
+                # the part is either complete or doesn't match the remote file anymore
+                if _get_total_size(response) == offset:
+                    os.replace(part_path, path)
+                    return
+                os.remove(part_path)
+                raise _RetriableError("Cannot resume download")
+            if response.status_code >= 500:
+                raise _RetriableError("{} - {}".format(response.status_code, response.reason))
+            if response.status_code >= 400:
+                raise DownloadError("Failed to download {}. {} - {}".format(
+                    url, response.status_code, response.reason))
+
+            if response.status_code != 206:
+                # server doesn't support ranges, start from the beginning
+                offset = 0
+            total = _get_total_size(response)
+            if total is None and 'Content-Length' in response.headers:
+                total = offset + int(response.headers['Content-Length'])
+
+            downloaded = offset
+            with open(part_path, 'ab' if offset else 'wb') as part_file:
+                for block in response.iter_content(self._block_size):
+                    part_file.write(block)
+                    downloaded += len(block)
+                    if self._on_progress:
+                        self._on_progress(url, downloaded, total)
+
+        if total is not None and downloaded < total:
+            raise _RetriableError("Connection closed after {} of {} bytes".format(downloaded, total))
+        os.replace(part_path, path)
+
+
+def _get_total_size(response):
+    match = re.match(r'bytes (?:\d+-\d+|\*)/(\d+)', response.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
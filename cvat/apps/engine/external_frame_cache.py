@@ -0,0 +1,163 @@
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import django_rq
+from django.conf import settings
+from django.core.cache import caches
+
+from . import models
+from .downloader import Downloader, DownloadError
+from .log import slogger
+
+# share of max_size the cache is reduced to by the eviction
+EVICTION_TARGET = 0.9
+
+
+class ExternalFrameCache:
+    """Read-through disk cache for frames of external tasks.
+
+    Frames are keyed by URL. The modification time of a cached file is updated
+    on every access, the least recently used files are evicted when the total
+    size exceeds max_size.
+
+    The total size is estimated in the Django cache, so the cache directory is only
+    scanned when the estimate is over the budget. The eviction frees a part of the budget,
+    so the next scan happens after a lot of frames have been downloaded.
+    """
+    def __init__(self, root, max_size, pool_size=8, downloader=None):
+        self._root = root
+        self._max_size = max_size
+        self._target_size = int(max_size * EVICTION_TARGET)
+        self._size_key = "external_frame_cache_size:{}".format(root)
+        self._pool_size = pool_size
+        self._downloader = downloader or Downloader(pool_size=pool_size)
+
+    def get_path(self, url):
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self._root, key[:2], key)
+
+    def get(self, url):
+        """Returns the path to the cached frame, downloads the frame if needed"""
+        path = self.get_path(url)
+        if self._touch(path):
+            return path
+        self._download(url, path)
+        self._add_size(os.path.getsize(path))
+        return path
+
+    def prefetch(self, urls):
+        """Download the frames which aren't cached yet concurrently.
+        Returns the list of URLs which failed to download.
+        """
+        missing = [url for url in urls if not self._touch(self.get_path(url))]
+
+        def download(url):
+            path = self.get_path(url)
+            try:
+                self._download(url, path)
+            except DownloadError:
+                return url, 0
+            return None, os.path.getsize(path)
+
+        with ThreadPoolExecutor(max_workers=self._pool_size) as executor:
+            results = list(executor.map(download, missing))
+        self._add_size(sum(size for _, size in results))
+        return [url for url, _ in results if url is not None]
+
+    def evict(self):
+        """Remove the least recently used frames if the cache is over the budget and update the size estimate"""
+        files = []
+        total_size = 0
+        for entry in _scan_files(self._root):
+            # skip downloads in progress
+            if '.tmp' in entry.name:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+        if total_size > self._max_size:
+            files.sort()
+            for _, size, path in files:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                if total_size <= self._target_size:
+                    break
+        caches["default"].set(self._size_key, total_size, None)
+
+    def _add_size(self, size):
+        try:
+            total_size = caches["default"].incr(self._size_key, size)
+        except ValueError:
+            # nothing is known about the size of the cache yet
+            total_size = None
+        if total_size is None or total_size > self._max_size:
+            self.evict()
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _download(self, url, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # concurrent requests for the same frame must not write into the same file
+        temp_path = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+        try:
+            self._downloader.download(url, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            for leftover in (temp_path, temp_path + '.part'):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+
+def _scan_files(root):
+    for entry in os.scandir(root):
+        if entry.is_dir():
+            yield from _scan_files(entry.path)
+        else:
+            yield entry
+
+
+def get_external_frame_cache():
+    if not settings.EXTERNAL_FRAME_CACHE_ROOT:
+        return None
+    return ExternalFrameCache(settings.EXTERNAL_FRAME_CACHE_ROOT, settings.EXTERNAL_FRAME_CACHE_SIZE,
+        pool_size=settings.REMOTE_FILES_POOL_SIZE)
+
+
+def get_external_frame_url(db_image):
+    return "{}{}".format(settings.EXTERNAL_STORAGE_HOST, db_image.url)
+
+
+def prefetch_job_frames(jid):
+    cache = get_external_frame_cache()
+    db_job = models.Job.objects.select_related('segment').get(pk=jid)
+    db_segment = db_job.segment
+    db_images = models.Image.objects.filter(task_id=db_segment.task_id,
+        frame__gte=db_segment.start_frame, frame__lte=db_segment.stop_frame).order_by('frame')
+    failed = cache.prefetch([get_external_frame_url(db_image) for db_image in db_images])
+    if failed:
+        slogger.job[jid].warning("cannot prefetch {} frames: {}".format(len(failed), ", ".join(failed)))
+
+
+def schedule_frame_prefetch(db_job):
+    """Start downloading frames of the job into the cache in background"""
+    if get_external_frame_cache() is None:
+        return
+    queue = django_rq.get_queue('low')
+    rq_id = "/api/v1/jobs/{}/frames/prefetch".format(db_job.id)
+    rq_job = queue.fetch_job(rq_id)
+    if rq_job and not (rq_job.is_finished or rq_job.is_failed):
+        return
+    queue.enqueue_call(func=prefetch_job_frames, args=(db_job.id,), job_id=rq_id)
@@ -0,0 +1,86 @@
+import hashlib
+import os
+
+from django.conf import settings
+
+MANIFEST_NAME = "frame_store.manifest"
+
+
+class FrameStore:
+    """Content-addressed storage of encoded frames shared between tasks.
+
+    Frames are keyed by the hash of the source file and the encoding parameters.
+    Tasks hard link stored files into their data directories, so the number of
+    links of a stored file is its reference count.
+    """
+    def __init__(self, root):
+        self._root = root
+
+    @staticmethod
+    def get_key(source, **params):
+        """The source is either a path or a binary file object"""
+        digest = hashlib.sha256()
+        if isinstance(source, str):
+            with open(source, 'rb') as source_file:
+                _update_digest(digest, source_file)
+        else:
+            _update_digest(digest, source)
+        for name in sorted(params):
+            digest.update("{}={};".format(name, params[name]).encode())
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self._root, key[:2], key[2:4], key + '.jpg')
+
+    def link_to(self, key, dest_path):
+        """Hard link the stored frame to dest_path.
+        Returns False if the frame hasn't been stored yet.
+        """
+        try:
+            os.link(self.get_path(key), dest_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def add(self, key, frame_path):
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.link(frame_path, path)
+        except FileExistsError:
+            # the same source has been stored by another task in the meantime
+            pass
+
+    def release(self, keys):
+        """Remove stored frames which aren't linked from any task anymore."""
+        for key in keys:
+            path = self.get_path(key)
+            try:
+                if os.stat(path).st_nlink == 1:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _update_digest(digest, source_file):
+    for block in iter(lambda: source_file.read(1024 * 1024), b''):
+        digest.update(block)
+
+
+def get_frame_store():
+    if not settings.FRAME_STORE_ROOT:
+        return None
+    return FrameStore(settings.FRAME_STORE_ROOT)
+
+
+def write_manifest(task_dirname, keys, append=False):
+    with open(os.path.join(task_dirname, MANIFEST_NAME), 'a' if append else 'w') as manifest:
+        manifest.writelines(key + '\n' for key in keys)
+
+
+def read_manifest(task_dirname):
+    try:
+        with open(os.path.join(task_dirname, MANIFEST_NAME)) as manifest:
+            return [line.strip() for line in manifest if line.strip()]
+    except FileNotFoundError:
+        return []
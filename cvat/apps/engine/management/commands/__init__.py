@@ -0,0 +1,3 @@
+# Copyright (C) 2018 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
\ No newline at end of file
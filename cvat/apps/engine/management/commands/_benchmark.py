@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+
+def measure(function, *args, repeat=1):
+    """Calls function(*args) repeat times, returns the last result and the average time of a call in ms"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function(*args)
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+class BenchmarkCommand(BaseCommand):
+    def measure(self, name, function, *args, repeat=1):
+        """Writes the average time of function(*args) calls, returns the result"""
+        result, elapsed = measure(function, *args, repeat=repeat)
+        self.stdout.write("{}: {:.1f} ms".format(name, elapsed))
+        return result
@@ -0,0 +1,66 @@
+import gzip
+import json
+import random
+
+from rest_framework.renderers import JSONRenderer
+
+from cvat.apps.engine.annotation import get_job_data
+from cvat.apps.engine.serializers import LabeledDataSerializer
+from cvat.apps.engine.wire_format import brotli, pack_annotations, unpack_annotations
+from ._benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = 'Compare payload size and encoding/decoding time of JSON and msgpack annotations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('jobs', nargs='*', type=int, help='job ids, synthetic annotations if omitted')
+        parser.add_argument('--tracks', type=int, default=500)
+        parser.add_argument('--shapes-per-track', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        if options['jobs']:
+            datasets = [("job {}".format(jid), get_job_data(jid, None)) for jid in options['jobs']]
+        else:
+            name = "{} tracks x {} shapes".format(options['tracks'], options['shapes_per_track'])
+            datasets = [(name, _generate_annotations(options['tracks'], options['shapes_per_track']))]
+
+        repeat = options['repeat']
+        for name, data in datasets:
+            self.stdout.write(name)
+            json_content = self.measure("  json render", lambda: JSONRenderer().render(data), repeat=repeat)
+            self.measure("  json parse", lambda: json.loads(json_content.decode()), repeat=repeat)
+            self.measure("  serializer validation", lambda: _validate(data), repeat=repeat)
+            msgpack_content = self.measure("  msgpack render", lambda: pack_annotations(data), repeat=repeat)
+            self.measure("  msgpack parse", lambda: unpack_annotations(msgpack_content), repeat=repeat)
+
+            sizes = [
+                ("json", json_content),
+                ("msgpack", msgpack_content),
+                ("json+gzip", gzip.compress(json_content, 6)),
+                ("msgpack+gzip", gzip.compress(msgpack_content, 6)),
+            ]
+            if brotli is not None:
+                sizes.append(("json+br", brotli.compress(json_content, quality=5)))
+            for format_name, content in sizes:
+                self.stdout.write("  {:<24} {:>12,} bytes".format(format_name, len(content)))
+
+
+def _validate(data):
+    serializer = LabeledDataSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    return serializer.data
+
+
+def _generate_annotations(track_count, shapes_per_track):
+    rng = random.Random(0)
+    tracks = []
+    for _ in range(track_count):
+        shapes = []
+        for frame in range(shapes_per_track):
+            x, y = rng.uniform(0, 1920), rng.uniform(0, 1080)
+            shapes.append({"type": "rectangle", "frame": frame, "occluded": False, "z_order": 0,
+                "outside": frame == shapes_per_track - 1, "points": [x, y, x + 50.5, y + 50.5], "attributes": []})
+        tracks.append({"frame": 0, "label_id": 1, "group": 0, "attributes": [], "shapes": shapes})
+    return {"version": 0, "tags": [], "shapes": [], "tracks": tracks}
@@ -0,0 +1,27 @@
+import random
+
+from cvat.apps.engine.ddln.sequences import distribute, extend_assignees, group
+from ._benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = 'Time sequence grouping and assignment on synthetic data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sequences', type=int, default=5000)
+        parser.add_argument('--assignees', type=int, default=50)
+        parser.add_argument('--performers', type=int, default=3, help='previous performers of every sequence')
+        parser.add_argument('--chunk-size', type=int, default=3000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        assignees = ["annotator{}".format(i) for i in range(options['assignees'])]
+        sequences = [("seq{}".format(i), rng.randint(100, 2000)) for i in range(options['sequences'])]
+        performers = min(options['performers'], len(assignees))
+        sequences_data = [(name, size, set(rng.sample(assignees, performers))) for name, size in sequences]
+
+        chunks = self.measure('group', group, sequences, options['chunk_size'])
+        self.measure('distribute', distribute, chunks, assignees, 3)
+        assignments, failed = self.measure('extend_assignees', extend_assignees, sequences_data, assignees)
+        self.stdout.write("{} chunks, {} assignments, {} failed".format(len(chunks), len(assignments), len(failed)))
@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from cvat.apps.engine.media_extractors import ImageListExtractor, JPEG_ENCODERS, create_encoder
+from ._benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Compare speed, size and output of JPEG encoders used for frame compression'
+
+    def add_arguments(self, parser):
+        parser.add_argument('images', nargs='+', help='source images')
+        parser.add_argument('--quality', type=int, default=95)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        configs = [(name, optimize) for name in JPEG_ENCODERS for optimize in (True, False)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            reference = None
+            for name, optimize in configs:
+                try:
+                    encoder = create_encoder(name, options['quality'], optimize)
+                    extractor = ImageListExtractor(options['images'], temp_dir, options['quality'], encoder=encoder)
+                    dest_paths = [os.path.join(temp_dir, '{}-{}-{}.jpg'.format(name, optimize, i))
+                        for i in range(len(extractor))]
+                    _, elapsed = measure(_save_images, extractor, dest_paths, repeat=options['repeat'])
+                    elapsed /= len(dest_paths)
+                except ImportError as err:
+                    self.stdout.write("{:<8} optimize={:<5} skipped: {}".format(name, str(optimize), err))
+                    continue
+
+                if reference is None:
+                    reference = dest_paths
+                size = sum(os.path.getsize(p) for p in dest_paths) / len(dest_paths)
+                max_diff = max(_get_max_difference(p1, p2) for p1, p2 in zip(reference, dest_paths))
+                self.stdout.write("{:<8} optimize={:<5} {:8.1f} ms/frame {:10.0f} bytes/frame max diff {}".format(
+                    name, str(optimize), elapsed, size, max_diff))
+
+
+def _save_images(extractor, dest_paths):
+    for frame, dest_path in enumerate(dest_paths):
+        extractor.save_image(frame, dest_path)
+
+
+def _get_max_difference(path1, path2):
+    with Image.open(path1) as image1, Image.open(path2) as image2:
+        data1 = np.asarray(image1, dtype=np.int16)
+        data2 = np.asarray(image2, dtype=np.int16)
+    return int(np.abs(data1 - data2).max())
@@ -0,0 +1,40 @@
+import random
+
+from cvat.apps.engine.ddln.geometry import Line, Point
+from cvat.apps.engine.ddln.tasks.vls_lines.models import Runway, calculate_vanishing_points, find_disorder
+from ._benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = 'Time vanishing point and line order checks of VLS runways batched per frame and per sequence'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--frames', type=int, default=2000)
+        parser.add_argument('--runways', type=int, default=2, help='runways per frame')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        frames = [[_generate_runway(rng, str(i)) for i in range(options['runways'])] for _ in range(options['frames'])]
+
+        self.measure('per frame', _check_per_frame, frames)
+        self.measure('per sequence', _check_per_sequence, frames)
+
+
+def _check_per_frame(frames):
+    for runways in frames:
+        calculate_vanishing_points(runways)
+        find_disorder(runways)
+
+
+def _check_per_sequence(frames):
+    runways = [runway for frame_runways in frames for runway in frame_runways]
+    calculate_vanishing_points(runways)
+    find_disorder(runways)
+
+
+def _generate_runway(rng, runway_id):
+    vanishing_point = Point(rng.uniform(300, 1600), rng.uniform(0, 300))
+    left, center, right = (Line.by_point_and_angle(vanishing_point, rng.uniform(1.2, 1.9)) for _ in range(3))
+    start, designator, end = (Line(0, 1, -rng.uniform(400, 1080)) for _ in range(3))
+    return Runway(runway_id, left, right, center, start, end, designator)
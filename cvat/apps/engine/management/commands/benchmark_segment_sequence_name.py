@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from cvat.apps.engine.ddln.utils import parse_frame_name
+from cvat.apps.engine.models import Image, Segment
+from ._benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Compare query plans and timings of the stored sequence_name of segments and the former image subquery'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tasks', nargs='*', type=int, help='task ids, all tasks if omitted')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        segments = Segment.objects.all()
+        if options['tasks']:
+            segments = segments.filter(task_id__in=options['tasks'])
+
+        start_frame = Image.objects.filter(task_id=models.OuterRef('task_id'), frame=models.OuterRef('start_frame'))
+        subquery = segments.annotate(_start_frame_image_path=models.Subquery(start_frame.values('path')))
+        subquery = subquery.values_list('id', '_start_frame_image_path')
+        stored = segments.values_list('id', 'sequence_name')
+
+        def load_with_subquery():
+            return {id: parse_frame_name(path)[1] if path is not None else '' for id, path in subquery}
+
+        def load_stored():
+            return dict(stored)
+
+        expected = None
+        for name, queryset, load in (('subquery', subquery, load_with_subquery), ('stored', stored, load_stored)):
+            self.stdout.write("{}:\n{}".format(name, queryset.explain(analyze=True)))
+            result, elapsed = measure(load, repeat=options['repeat'])
+            self.stdout.write("{}: {} segments in {:.1f} ms\n".format(name, len(result), elapsed))
+            if expected is None:
+                expected = result
+            elif result != expected:
+                mismatches = [id for id in expected if expected[id] != result.get(id)]
+                self.stdout.write("{}: {} segments differ, e.g. {}".format(name, len(mismatches), mismatches[:10]))
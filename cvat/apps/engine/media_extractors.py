@@ -1,6 +1,9 @@
+import io
 import os
+import tarfile
 import tempfile
 import shutil
+import zipfile
 import numpy as np
 
 from ffmpy import FFmpeg
@@ -21,21 +24,80 @@ def get_mime(name):
 
     return 'unknown'
 
+class PillowEncoder:
+    name = 'pillow'
+
+    def __init__(self, quality, optimize=True):
+        self._quality = quality
+        self._optimize = optimize
+
+    @property
+    def params(self):
+        """Parameters which affect the encoded image"""
+        params = {'quality': self._quality}
+        if not self._optimize:
+            params['optimize'] = False
+        return params
+
+    def encode(self, image, dest_path):
+        image.save(dest_path, format='JPEG', quality=self._quality, optimize=self._optimize)
+
+class OpenCVEncoder(PillowEncoder):
+    """Encodes with libjpeg(-turbo) bundled with OpenCV, which is usually faster than Pillow"""
+    name = 'opencv'
+
+    @property
+    def params(self):
+        return dict(super().params, encoder=self.name)
+
+    def encode(self, image, dest_path):
+        import cv2
+        data = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+        success, result = cv2.imencode('.jpg', data, params=[
+            int(cv2.IMWRITE_JPEG_QUALITY), self._quality,
+            int(cv2.IMWRITE_JPEG_OPTIMIZE), int(self._optimize),
+        ])
+        if not success:
+            raise Exception("Failed to encode image to JPEG format")
+        result.tofile(dest_path)
+
+JPEG_ENCODERS = {encoder.name: encoder for encoder in (PillowEncoder, OpenCVEncoder)}
+
+def create_encoder(name, quality, optimize=True):
+    return JPEG_ENCODERS[name](quality, optimize)
+
+def _rescale_to_8bit(image):
+    """Autoscale integer pixels by factor 2**8 / max to fit into 8bit"""
+    im_data = np.asarray(image)
+    max_value = im_data.max()
+    if max_value > 0:
+        im_data = im_data * (2**8 / max_value)
+    # PIL clips values on conversion to 8bit modes, so does the clip
+    return Image.fromarray(np.clip(im_data, 0, 255).astype(np.uint8))
+
 class MediaExtractor:
-    def __init__(self, source_path, dest_path, image_quality, step, start, stop):
+    def __init__(self, source_path, dest_path, image_quality, step, start, stop, encoder=None):
         self._source_path = source_path
         self._dest_path = dest_path
         self._image_quality = image_quality
         self._step = step
         self._start = start
         self._stop = stop
+        self.encoder = encoder or PillowEncoder(image_quality)
 
     def get_source_name(self):
         return self._source_path
 
+    def open(self, k):
+        return open(self[k], 'rb')
+
+    def read(self, k):
+        with self.open(k) as source_file:
+            return source_file.read()
+
 #Note step, start, stop have no affect
 class ImageListExtractor(MediaExtractor):
-    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0):
+    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0, encoder=None):
         if not source_path:
             raise Exception('No image found')
         super().__init__(
@@ -45,6 +107,7 @@ class ImageListExtractor(MediaExtractor):
             step=1,
             start=0,
             stop=0,
+            encoder=encoder,
         )
 
     def __iter__(self):
@@ -56,24 +119,24 @@ class ImageListExtractor(MediaExtractor):
     def __len__(self):
         return len(self._source_path)
 
-    def save_image(self, k, dest_path):
-        image = Image.open(self[k])
-        # Ensure image data fits into 8bit per pixel before RGB conversion as PIL clips values on conversion
-        if image.mode == "I":
-            # Image mode is 32bit integer pixels.
-            # Autoscale pixels by factor 2**8 / im_data.max() to fit into 8bit
-            im_data = np.array(image)
-            im_data = im_data * (2**8 / im_data.max())
-            image = Image.fromarray(im_data.astype(np.int32))
-        image = image.convert('RGB')
-        image.save(dest_path, quality=self._image_quality, optimize=True)
-        height = image.height
-        width = image.width
-        image.close()
+    def save_image(self, k, dest_path, data=None):
+        """data is the content of the source image if it has already been read"""
+        source_file = self.open(k) if data is None else io.BytesIO(data)
+        with source_file:
+            image = Image.open(source_file)
+            # Ensure image data fits into 8bit per pixel before RGB conversion as PIL clips values on conversion
+            # 16-bit images are opened either as "I" or "I;16*" depending on Pillow version
+            if image.mode == "I" or image.mode.startswith("I;16"):
+                image = _rescale_to_8bit(image)
+            image = image.convert('RGB')
+            self.encoder.encode(image, dest_path)
+            height = image.height
+            width = image.width
+            image.close()
         return width, height
 
 class PDFExtractor(MediaExtractor):
-    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0):
+    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0, encoder=None):
         if not source_path:
             raise Exception('No PDF found')
 
@@ -86,6 +149,7 @@ class PDFExtractor(MediaExtractor):
             step=1,
             start=0,
             stop=0,
+            encoder=encoder,
         )
 
         self._dimensions = []
@@ -118,13 +182,18 @@ class PDFExtractor(MediaExtractor):
     def __len__(self):
         return self._length
 
-    def save_image(self, k, dest_path):
-        shutil.copyfile(self[k], dest_path)
+    def save_image(self, k, dest_path, data=None):
+        """data is the content of the page image if it has already been read"""
+        if data is None:
+            shutil.copyfile(self[k], dest_path)
+        else:
+            with open(dest_path, 'wb') as dest_file:
+                dest_file.write(data)
         return self._dimensions[k]
 
 #Note step, start, stop have no affect
 class DirectoryExtractor(ImageListExtractor):
-    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0):
+    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0, encoder=None):
         image_paths = []
         for source in source_path:
             for root, _, files in os.walk(source):
@@ -138,23 +207,100 @@ class DirectoryExtractor(ImageListExtractor):
             step=1,
             start=0,
             stop=0,
+            encoder=encoder,
         )
 
+class _ZipReader:
+    def __init__(self, path):
+        self._archive = zipfile.ZipFile(path)
+
+    def get_names(self):
+        return [info.filename for info in self._archive.infolist() if not info.is_dir()]
+
+    def open(self, name):
+        return self._archive.open(name)
+
+    def close(self):
+        self._archive.close()
+
+class _TarReader:
+    """Reads members of uncompressed tar files only.
+    Members of a compressed tar can't be read out of order without decompressing
+    the stream from the start every time.
+    """
+    def __init__(self, path):
+        self._archive = tarfile.open(path, 'r:')
+        self._members = {member.name: member for member in self._archive.getmembers() if member.isfile()}
+
+    def get_names(self):
+        return list(self._members)
+
+    def open(self, name):
+        return self._archive.extractfile(self._members[name])
+
+    def close(self):
+        self._archive.close()
+
+def _open_archive(path):
+    if zipfile.is_zipfile(path):
+        return _ZipReader(path)
+    if tarfile.is_tarfile(path):
+        try:
+            return _TarReader(path)
+        except tarfile.ReadError:
+            # compressed tar files are extracted
+            return None
+    return None
+
 #Note step, start, stop have no affect
 class ArchiveExtractor(DirectoryExtractor):
-    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0):
-        Archive(source_path[0]).extractall(dest_path)
-        super().__init__(
-            source_path=[dest_path],
+    """Zip and uncompressed tar members are read directly from the archive, other formats are extracted to disk.
+    Frame paths are the paths the members would have after extraction to dest_path.
+    """
+    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0, encoder=None):
+        self._reader = _open_archive(source_path[0])
+        if self._reader is None:
+            Archive(source_path[0]).extractall(dest_path)
+            super().__init__(
+                source_path=[dest_path],
+                dest_path=dest_path,
+                image_quality=image_quality,
+                step=1,
+                start=0,
+                stop=0,
+                encoder=encoder,
+            )
+            return
+
+        self._members = {}
+        for name in self._reader.get_names():
+            path = os.path.normpath(name)
+            if os.path.isabs(path) or path == '..' or path.startswith('..' + os.sep):
+                continue
+            path = os.path.join(dest_path, path)
+            if get_mime(path) == 'image':
+                self._members[path] = name
+        ImageListExtractor.__init__(self,
+            source_path=list(self._members),
             dest_path=dest_path,
             image_quality=image_quality,
             step=1,
             start=0,
             stop=0,
+            encoder=encoder,
         )
 
+    def __del__(self):
+        if self._reader:
+            self._reader.close()
+
+    def open(self, k):
+        if self._reader is None:
+            return super().open(k)
+        return self._reader.open(self._members[self[k]])
+
 class VideoExtractor(MediaExtractor):
-    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0):
+    def __init__(self, source_path, dest_path, image_quality, step=1, start=0, stop=0, encoder=None):
         from cvat.apps.engine.log import slogger
         _dest_path = tempfile.mkdtemp(prefix='cvat-', suffix='.data')
         super().__init__(
@@ -164,6 +310,7 @@ class VideoExtractor(MediaExtractor):
             step=step,
             start=start,
             stop=stop,
+            encoder=encoder,
             )
         # translate inversed range 1:95 to 2:32
         translated_quality = 96 - self._image_quality
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.10 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+from cvat.apps.engine.ddln.utils import parse_frame_name
+
+
+def fill_sequence_names(apps, schema_editor):
+    Segment = apps.get_model('engine', 'Segment')
+    Image = apps.get_model('engine', 'Image')
+    task_ids = Segment.objects.values_list('task_id', flat=True).distinct()
+    for task_id in task_ids.iterator():
+        segments = list(Segment.objects.filter(task_id=task_id))
+        paths = dict(
+            Image.objects
+            .filter(task_id=task_id, frame__in=[s.start_frame for s in segments])
+            .values_list('frame', 'path')
+        )
+        for segment in segments:
+            path = paths.get(segment.start_frame)
+            segment.sequence_name = parse_frame_name(path)[1] if path is not None else ''
+        Segment.objects.bulk_update(segments, ['sequence_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engine', '0030_store_vanishing_point_on_back_end'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='segment',
+            name='sequence_name',
+            field=models.CharField(default='', max_length=256),
+        ),
+        migrations.RunPython(fill_sequence_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='segment',
+            index=models.Index(fields=['task', 'sequence_name'], name='engine_segm_task_id_0eb785_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.10 on 2026-10-19 12:00
+
+import os
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_preview_sizes(apps, schema_editor):
+    Task = apps.get_model('engine', 'Task')
+    for task in Task.objects.only('id').iterator():
+        try:
+            names = os.listdir(os.path.join(settings.DATA_ROOT, str(task.id), 'previews'))
+        except FileNotFoundError:
+            continue
+        sizes = sorted(int(name) for name in names if name.isdigit())
+        if sizes:
+            Task.objects.filter(id=task.id).update(preview_sizes=",".join(str(size) for size in sizes))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engine', '0031_segment_sequence_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='preview_sizes',
+            field=models.CharField(blank=True, default='', max_length=256),
+        ),
+        migrations.RunPython(fill_preview_sizes, migrations.RunPython.noop),
+    ]
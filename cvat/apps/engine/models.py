@@ -8,7 +8,6 @@ import re
 import shlex
 import os
 
-import django_rq
 from django.db import models, connection
 from django.conf import settings
 
@@ -16,7 +15,6 @@ from django.contrib.auth.models import User
 from django.core.files.storage import FileSystemStorage
 
 from cvat.apps.engine.ddln.inventory_client import record_sequence_completion
-from cvat.apps.engine.ddln.utils import parse_frame_name
 
 
 class SafeCharField(models.CharField):
@@ -81,18 +79,36 @@ class Task(models.Model):
     frame_filter = models.CharField(max_length=256, default="", blank=True)
     status = models.CharField(max_length=32, choices=StatusChoice.choices(),
         default=StatusChoice.ANNOTATION)
+    # comma separated sizes of the downscaled frame levels, see get_preview_sizes()
+    preview_sizes = models.CharField(max_length=256, default="", blank=True)
 
     # Extend default permission model
     class Meta:
         default_permissions = ()
 
     def get_frame_path(self, frame):
-        d1 = str(int(frame) // 10000)
-        d2 = str(int(frame) // 100)
-        path = os.path.join(self.get_data_dirname(), d1, d2,
-            str(frame) + '.jpg')
+        return os.path.join(self.get_data_dirname(), _get_frame_subpath(frame))
 
-        return path
+    def get_preview_frame_path(self, frame, size):
+        return os.path.join(self.get_preview_dirname(), str(size), _get_frame_subpath(frame))
+
+    def get_preview_sizes(self):
+        """Return sizes (the longest image side) of the downscaled frame levels
+        generated for the task in ascending order.
+        """
+        return sorted(int(size) for size in self.preview_sizes.split(",") if size)
+
+    def set_preview_sizes(self, sizes):
+        self.preview_sizes = ",".join(str(size) for size in sorted(set(sizes)))
+
+    def choose_preview_size(self, size=None):
+        """Pick the smallest downscaled level which is at least `size` pixels wide.
+        Returns None if the original frame should be used instead.
+        """
+        sizes = self.get_preview_sizes()
+        if size is None:
+            return sizes[0] if sizes else None
+        return next((s for s in sizes if s >= size), None)
 
     @staticmethod
     def get_image_frame(image_path):
@@ -110,6 +126,9 @@ class Task(models.Model):
     def get_data_dirname(self):
         return os.path.join(self.get_task_dirname(), "data")
 
+    def get_preview_dirname(self):
+        return os.path.join(self.get_task_dirname(), "previews")
+
     def get_log_path(self):
         return os.path.join(self.get_task_dirname(), "task.log")
 
@@ -127,7 +146,7 @@ class Task(models.Model):
         Returns a list of (version, sequence_name, user) tuples.
         User is None if the sequence doesn't have the assignee.
         """
-        segments = Segment.objects.filter(task_id=self.id).prefetch_related("job_set__assignee").with_sequence_name()
+        segments = Segment.objects.filter(task_id=self.id).prefetch_related("job_set__assignee")
         result = []
         for segment in segments:
             for job in segment.job_set.all():
@@ -138,6 +157,11 @@ class Task(models.Model):
     def __str__(self):
         return self.name
 
+def _get_frame_subpath(frame):
+    d1 = str(int(frame) // 10000)
+    d2 = str(int(frame) // 100)
+    return os.path.join(d1, d2, str(frame) + '.jpg')
+
 # Redefined a couple of operation for FileSystemStorage to avoid renaming
 # or other side effects.
 class MyFileSystemStorage(FileSystemStorage):
@@ -199,32 +223,18 @@ class Image(models.Model):
         default_permissions = ()
 
 
-class SegmentQuerySet(models.QuerySet):
-    def with_sequence_name(self):
-        start_frame = Image.objects.filter(task_id=models.OuterRef('task_id'), frame=models.OuterRef('start_frame'))
-        return self.annotate(_start_frame_image_path=models.Subquery(start_frame.values('path')))
-
-
 class Segment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE)
     start_frame = models.IntegerField()
     stop_frame = models.IntegerField()
+    # name of the sequence of the start frame, '' if the task has no images
+    sequence_name = models.CharField(max_length=256, default='')
     # version field for optimistic/pessimistic locks
     concurrent_version = models.PositiveIntegerField(default=0)
 
-    objects = SegmentQuerySet.as_manager()
-
     class Meta:
         default_permissions = ()
-
-    @property
-    def sequence_name(self):
-        if not hasattr(self, "_start_frame_image_path"):
-            raise AttributeError("Segment should be loaded by '.with_sequence_name()' to have '.sequence_name' attribute")
-        if self._start_frame_image_path is None:
-            return ''
-        _, sequence_name = parse_frame_name(self._start_frame_image_path)
-        return sequence_name
+        indexes = [models.Index(fields=['task', 'sequence_name'])]
 
     @property
     def length(self):
@@ -256,16 +266,13 @@ class Job(models.Model):
         default_permissions = ()
 
     def complete(self):
-        segment = Segment.objects.select_related("task").with_sequence_name().get(id=self.segment_id)
+        segment = Segment.objects.select_related("task").get(id=self.segment_id)
         task_name = segment.task.name
         sequence_name = segment.sequence_name
         annotator = self.assignee.username if self.assignee else ''
 
-        # making request to google sheet api might take a long time,
-        # so make api call in a worker rather than in request handler
-        q = django_rq.get_queue('default')
-        rq_job_id = "inventory.task.complete.{}".format(self.id)
-        q.enqueue_call(func=record_sequence_completion, args=(self.id, sequence_name, self.version, task_name, annotator), job_id=rq_job_id)
+        # the record is only queued here, queued records are written to google sheet by a periodic job
+        record_sequence_completion(self.id, sequence_name, self.version, task_name, annotator)
 
 
 class Label(models.Model):
@@ -16,6 +16,7 @@ from cvat.apps.annotation.models import AnnotationDumper
 from cvat.apps.engine import models
 from cvat.apps.engine.ddln.tasks import guess_task_type
 from cvat.apps.engine.log import slogger
+from cvat.apps.engine.media_extractors import JPEG_ENCODERS, MEDIA_TYPES, get_mime
 from cvat.apps.engine.utils import natural_order
 
 
@@ -111,7 +112,6 @@ class SimpleJobSerializer(serializers.ModelSerializer):
 
 class SegmentSerializer(serializers.ModelSerializer):
     jobs = SimpleJobSerializer(many=True, source='job_set')
-    sequence_name = serializers.SerializerMethodField()
     extra_info = serializers.SerializerMethodField()
 
     class Meta:
@@ -124,14 +124,8 @@ class SegmentSerializer(serializers.ModelSerializer):
         value['jobs'].sort(key=lambda e: e['version'])
         return value
 
-    def get_sequence_name(self, obj):
-        sequence_by_segment_id = self.context.get('sequence_by_segment_id')
-        if not sequence_by_segment_id:
-            return ''
-        return sequence_by_segment_id.get(obj.id, '')
-
     def get_extra_info(self, obj):
-        sequence_name = self.get_sequence_name(obj)
+        sequence_name = obj.sequence_name
         if not sequence_name:
             return None
         extra_info_by_task_id = self.context.get('extra_info_by_task_id')
@@ -202,26 +196,54 @@ class TaskDataSerializer(serializers.ModelSerializer):
         model = models.Task
         fields = ('client_files', 'server_files', 'remote_files')
 
+    def validate(self, data):
+        # frames are appended to a task which already has some, the files are checked
+        # here as they are attached to the task before they are extracted
+        if self.instance is not None and self.instance.size != 0:
+            if self.instance.mode != 'annotation' or self.instance.external:
+                raise serializers.ValidationError("Only images can be added to an existing task")
+            names = [f['file'].name for f in data['clientfile_set']]
+            names.extend(os.path.join(settings.SHARE_ROOT, f['file'].lstrip('/')) for f in data['serverfile_set'])
+            names.extend(f['file'] for f in data['remotefile_set'])
+            for name in names:
+                media_type = MEDIA_TYPES.get(get_mime(name))
+                if media_type is not None and media_type['mode'] != 'annotation':
+                    raise serializers.ValidationError("Only images can be added to an existing task")
+        return data
+
     # pylint: disable=no-self-use
     def update(self, instance, validated_data):
         client_files = validated_data.pop('clientfile_set')
         server_files = validated_data.pop('serverfile_set')
         remote_files = validated_data.pop('remotefile_set')
+        self._new_files = {'client_files': [], 'server_files': [], 'remote_files': []}
 
         for file in client_files:
             client_file = models.ClientFile(task=instance, **file)
             client_file.save()
+            self._new_files['client_files'].append(client_file)
 
         for file in server_files:
             server_file = models.ServerFile(task=instance, **file)
             server_file.save()
+            self._new_files['server_files'].append(server_file)
 
         for file in remote_files:
             remote_file = models.RemoteFile(task=instance, **file)
             remote_file.save()
+            self._new_files['remote_files'].append(remote_file)
 
         return instance
 
+    @property
+    def new_data(self):
+        """Files attached by the last save() only (the task may have data from earlier requests)"""
+        return {
+            'client_files': list(ClientFileSerializer(self._new_files['client_files'], many=True).data),
+            'server_files': list(ServerFileSerializer(self._new_files['server_files'], many=True).data),
+            'remote_files': list(RemoteFileSerializer(self._new_files['remote_files'], many=True).data),
+        }
+
 
 class ExternalFrameSerializer(serializers.Serializer):
     path = serializers.CharField()
@@ -239,6 +261,11 @@ class ExternalSequenceSerializer(serializers.Serializer):
 class ExternalFilesSerializer(serializers.ListSerializer):
     child = ExternalSequenceSerializer()
 
+    def validate(self, attrs):
+        if attrs and self.context['task'].size != 0:
+            raise serializers.ValidationError("Only images can be added to an existing task")
+        return attrs
+
     def to_internal_value(self, data):
         if isinstance(data, str):
             data = json.loads(data)
@@ -268,6 +295,15 @@ class DataOptionsSerializer(serializers.Serializer):
             default=[],
         )
     chunk_size = serializers.IntegerField(default=None, min_value=1)
+    # sizes (the longest image side) of downscaled frame copies used for previews
+    preview_sizes = CommaSeparatedValuesField(
+            child=serializers.IntegerField(min_value=16),
+            default=[],
+        )
+    # backend used to compress frames of image tasks
+    jpeg_encoder = serializers.ChoiceField(choices=list(JPEG_ENCODERS), default='pillow')
+    # optimized Huffman tables make frames a few percent smaller, but the encoding is slower
+    jpeg_optimize = serializers.BooleanField(default=True)
 
     def validate(self, data):
         if not data['split_on_sequence'] and data['assignees']:
@@ -314,7 +350,7 @@ class TaskDumpSerializer(JobSelectionSerializer):
 
 class RequestExtraAnnotationSerializer(serializers.Serializer):
     assignees = serializers.PrimaryKeyRelatedField(queryset=User.objects, many=True, allow_empty=False)
-    segments = serializers.PrimaryKeyRelatedField(queryset=models.Segment.objects.with_sequence_name(), many=True)
+    segments = serializers.PrimaryKeyRelatedField(queryset=models.Segment.objects.all(), many=True)
 
     def validate(self, data):
         task = self.context['task']
@@ -329,7 +365,7 @@ class RequestExtraAnnotationSerializer(serializers.Serializer):
 
 
 class AcceptSegmentsSerializer(serializers.Serializer):
-    segments = serializers.PrimaryKeyRelatedField(queryset=models.Segment.objects.with_sequence_name(), many=True)
+    segments = serializers.PrimaryKeyRelatedField(queryset=models.Segment.objects.all(), many=True)
 
     def validate(self, data):
         task = self.context['task']
@@ -346,6 +382,8 @@ class ExternalImageSerializer(serializers.Serializer):
     url = serializers.SerializerMethodField()
 
     def get_url(self, image):
+        if settings.EXTERNAL_FRAME_CACHE_ROOT:
+            return reverse("cvat:task-frame", args=[image.task_id, image.frame])
         path = image.url
         host = settings.EXTERNAL_STORAGE_HOST
         return "{}{}".format(host, path)
@@ -433,7 +471,7 @@ class TaskSerializer(WriteOnceMixin, serializers.ModelSerializer):
         ordering = ['-id']
 
     def get_preview_url(self, task):
-        if task.external:
+        if task.external and not settings.EXTERNAL_FRAME_CACHE_ROOT:
             try:
                 image = models.Image.objects.get(frame=0, task=task)
                 path = image.url
@@ -442,7 +480,10 @@ class TaskSerializer(WriteOnceMixin, serializers.ModelSerializer):
             if path:
                 host = settings.EXTERNAL_STORAGE_HOST
                 return "{}{}".format(host, path)
-        return reverse("cvat:task-frame", args=[task.id, 0])
+        url = reverse("cvat:task-frame", args=[task.id, 0])
+        if task.choose_preview_size() is not None:
+            url += "?quality=preview"
+        return url
 
     def get_task_type(self, task):
         return guess_task_type(task)
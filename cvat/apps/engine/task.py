@@ -3,27 +3,32 @@
 #
 # SPDX-License-Identifier: MIT
 
+import fcntl
+import io
 import itertools
 import os
 import sys
+import threading
 import rq
 import shutil
 from PIL import Image
 from traceback import print_exception
 from ast import literal_eval
-from urllib import error as urlerror
+from concurrent.futures import ThreadPoolExecutor
 from urllib import parse as urlparse
 from urllib import request as urlrequest
 
-from cvat.apps.engine.media_extractors import get_mime, MEDIA_TYPES
+from cvat.apps.engine.media_extractors import create_encoder, get_mime, MEDIA_TYPES
 
 import django_rq
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import transaction
-from distutils.dir_util import copy_tree
 
 from . import models
+from .annotation import bulk_create
+from .downloader import Downloader
+from .frame_store import get_frame_store, write_manifest
 from .ddln.inventory_client import record_task_creation
 from .ddln.sequences import group, distribute
 from .ddln.tasks import create_task_handler, guess_task_type
@@ -64,20 +69,12 @@ def make_image_meta_cache(db_task):
             })
             image.close()
         else:
-            filenames = []
-            for root, _, files in os.walk(db_task.get_upload_dirname()):
-                fullnames = map(lambda f: os.path.join(root, f), files)
-                images = filter(lambda x: get_mime(x) == 'image', fullnames)
-                filenames.extend(images)
-            filenames.sort()
-
-            for image_path in filenames:
-                image = Image.open(image_path)
+            # source images of archives aren't kept on disk, use the sizes saved at task creation
+            for db_image in db_task.image_set.order_by('frame'):
                 cache['original_size'].append({
-                    'width': image.size[0],
-                    'height': image.size[1]
+                    'width': db_image.width,
+                    'height': db_image.height
                 })
-                image.close()
 
         meta_file.write(str(cache))
 
@@ -91,32 +88,107 @@ def get_image_meta_cache(db_task):
         with open(db_task.get_image_meta_cache_path()) as meta_cache_file:
             return literal_eval(meta_cache_file.read())
 
+def _extend_image_meta_cache(db_task, db_images):
+    cache = get_image_meta_cache(db_task)
+    cache['original_size'].extend({'width': db_image.width, 'height': db_image.height}
+        for db_image in db_images)
+    with open(db_task.get_image_meta_cache_path(), 'w') as meta_file:
+        meta_file.write(str(cache))
+
+def _save_previews(db_task, frame, sizes):
+    """Save downscaled copies of the frame, one per requested size."""
+    if not sizes:
+        return
+    sizes = sorted(sizes, reverse=True)
+    with Image.open(db_task.get_frame_path(frame)) as image:
+        # let JPEG decoder skip the details which are not needed for the largest preview
+        image.draft('RGB', (sizes[0], sizes[0]))
+        image = image.convert('RGB')
+        # each level is downscaled from the previous (larger) one
+        for size in sizes:
+            image.thumbnail((size, size), Image.BILINEAR)
+            preview_path = db_task.get_preview_frame_path(frame, size)
+            os.makedirs(os.path.dirname(preview_path), exist_ok=True)
+            image.save(preview_path, quality=db_task.image_quality)
+
+def _save_stored_image(extractor, frame, dest_path, frame_store):
+    """Save the frame reusing the already encoded image from the frame store if possible"""
+    # the source is read once for both hashing and encoding
+    data = extractor.read(frame)
+    key = frame_store.get_key(io.BytesIO(data), **extractor.encoder.params)
+    if frame_store.link_to(key, dest_path):
+        with Image.open(dest_path) as image:
+            width, height = image.size
+    else:
+        width, height = extractor.save_image(frame, dest_path, data)
+        frame_store.add(key, dest_path)
+    return key, width, height
+
+SHARE_IMPORT_MODES = ('copy', 'hardlink', 'reflink', 'symlink')
+# ioctl request for cloning file extents on Linux (copy-on-write file systems only)
+_FICLONE = 0x40049409
+
 def _copy_data_from_share(server_files, upload_dir):
     job = rq.get_current_job()
     job.meta['status'] = 'Data are being copied from share..'
     job.save_meta()
 
+    file_pairs = []
     for path in server_files:
         source_path = os.path.join(settings.SHARE_ROOT, os.path.normpath(path))
         target_path = os.path.join(upload_dir, path)
         if os.path.isdir(source_path):
-            copy_tree(source_path, target_path)
+            for root, _, files in os.walk(source_path, followlinks=True):
+                target_root = os.path.normpath(os.path.join(target_path, os.path.relpath(root, source_path)))
+                os.makedirs(target_root, exist_ok=True)
+                file_pairs.extend((os.path.join(root, f), os.path.join(target_root, f)) for f in files)
         else:
-            target_dir = os.path.dirname(target_path)
-            if not os.path.exists(target_dir):
-                os.makedirs(target_dir)
-            shutil.copyfile(source_path, target_path)
-
-def _save_task_to_db(db_task, segments):
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            file_pairs.append((source_path, target_path))
+
+    mode = settings.SHARE_IMPORT_MODE
+    progress = 0
+    with ThreadPoolExecutor(max_workers=settings.SHARE_IMPORT_THREADS) as executor:
+        results = executor.map(lambda pair: _import_shared_file(*pair, mode=mode), file_pairs)
+        for done, _ in enumerate(results, start=1):
+            current_progress = done * 100 // len(file_pairs)
+            if current_progress != progress:
+                progress = current_progress
+                job.meta['status'] = 'Data are being copied from share.. {}%'.format(progress)
+                job.save_meta()
+
+def _import_shared_file(source_path, target_path, mode='copy'):
+    """Make the shared file available in the upload directory.
+    Linking modes fall back to copying when the link cannot be created
+    (e.g. the share is on another file system).
+    """
+    if mode not in SHARE_IMPORT_MODES:
+        raise ValueError("Unexpected share import mode: {!r}".format(mode))
+    try:
+        if mode == 'hardlink':
+            os.link(source_path, target_path)
+            return
+        if mode == 'symlink':
+            os.symlink(source_path, target_path)
+            return
+        if mode == 'reflink':
+            with open(source_path, 'rb') as source_file, open(target_path, 'wb') as target_file:
+                fcntl.ioctl(target_file.fileno(), _FICLONE, source_file.fileno())
+            return
+    except OSError:
+        pass
+    shutil.copyfile(source_path, target_path)
+
+def _save_task_to_db(db_task, segments, start_frame=0):
     job = rq.get_current_job()
     job.meta['status'] = 'Task is being saved in database'
     job.save_meta()
 
     if segments:
-        for seg in segments:
-            _, _, start_frame, stop_frame, assignees = seg
-            _create_job(db_task, start_frame, stop_frame, assignees)
+        job_count = _create_jobs(db_task, [(seq_name, start_frame, stop_frame, assignees)
+            for seq_name, _, start_frame, stop_frame, assignees in segments])
         db_task.overlap = 0
+        _update_appended_task_status(db_task, start_frame, job_count)
         db_task.save()
         return
 
@@ -136,30 +208,54 @@ def _save_task_to_db(db_task, segments):
 
     segment_step -= db_task.overlap
 
-    for x in range(0, db_task.size, segment_step):
+    first_frame = start_frame
+    frame_ranges = []
+    for x in range(start_frame, db_task.size, segment_step):
         start_frame = x
         stop_frame = min(x + segment_size - 1, db_task.size - 1)
-        _create_job(db_task, start_frame, stop_frame)
+        frame_ranges.append((start_frame, stop_frame))
+    start_frame_paths = dict(models.Image.objects.filter(task=db_task, frame__in=[r[0] for r in frame_ranges])
+        .values_list('frame', 'path'))
+    job_count = _create_jobs(db_task, [(_get_sequence_name(start_frame_paths.get(start_frame)), start_frame, stop_frame, ())
+        for start_frame, stop_frame in frame_ranges])
 
+    _update_appended_task_status(db_task, first_frame, job_count)
     db_task.save()
 
 
-def _create_job(db_task, start_frame, stop_frame, assignees=()):
-    message = "New segment for task #{}: start_frame = {}, stop_frame = {}".format(db_task.id, start_frame, stop_frame)
-    slogger.glob.info(message)
-    db_segment = models.Segment()
-    db_segment.task = db_task
-    db_segment.start_frame = start_frame
-    db_segment.stop_frame = stop_frame
-    db_segment.save()
-    if not assignees:
-        assignees = [None]
-    for version, assignee in enumerate(assignees):
-        db_job = models.Job()
-        db_job.segment = db_segment
-        db_job.version = version
-        db_job.assignee = assignee
-        db_job.save()
+def _update_appended_task_status(db_task, start_frame, job_count):
+    # bulk_create() skips the post_save signal updating the task status,
+    # the jobs appended to an existing task are being annotated, so is the task
+    if start_frame != 0 and job_count:
+        db_task.status = models.StatusChoice.ANNOTATION
+
+
+def _create_jobs(db_task, segments):
+    """Create segments with their jobs in bulk, returns the number of created jobs.
+    Segments are (sequence_name, start_frame, stop_frame, assignees) tuples, a job is created for each assignee.
+    """
+    db_segments = [models.Segment(task=db_task, sequence_name=seq_name, start_frame=start_frame, stop_frame=stop_frame)
+        for seq_name, start_frame, stop_frame, _ in segments]
+    db_segments = bulk_create(models.Segment, db_segments, {"task_id": db_task.id})
+
+    db_jobs = []
+    for db_segment, (_, _, _, assignees) in zip(db_segments, segments):
+        if not assignees:
+            assignees = [None]
+        for version, assignee in enumerate(assignees):
+            db_jobs.append(models.Job(segment=db_segment, version=version, assignee=assignee))
+    bulk_create(models.Job, db_jobs, {})
+
+    slogger.glob.info("New segments for task #{}: {} segments, {} jobs".format(
+        db_task.id, len(db_segments), len(db_jobs)))
+    return len(db_jobs)
+
+
+def _get_sequence_name(path):
+    if path is None:
+        return ''
+    _, sequence_name = parse_frame_name(path)
+    return sequence_name
 
 
 def _validate_data(data, external=False):
@@ -235,23 +331,23 @@ def _download_data(urls, upload_dir):
         if name in local_files:
             raise Exception("filename collision: {}".format(name))
         slogger.glob.info("Downloading: {}".format(url))
-        job.meta['status'] = '{} is being downloaded..'.format(url)
-        job.save_meta()
-
-        req = urlrequest.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-        try:
-            with urlrequest.urlopen(req) as fp, open(os.path.join(upload_dir, name), 'wb') as tfp:
-                while True:
-                    block = fp.read(8192)
-                    if not block:
-                        break
-                    tfp.write(block)
-        except urlerror.HTTPError as err:
-            raise Exception("Failed to download " + url + ". " + str(err.code) + ' - ' + err.reason)
-        except urlerror.URLError as err:
-            raise Exception("Invalid URL: " + url + ". " + err.reason)
-
-        local_files[name] = True
+        local_files[name] = url
+
+    progress_by_url = {}
+    progress_lock = threading.Lock()
+
+    def report_progress(url, downloaded, total):
+        progress = downloaded * 100 // total if total else downloaded // (1024 * 1024)
+        with progress_lock:
+            if progress_by_url.get(url) == progress:
+                return
+            progress_by_url[url] = progress
+            unit = '%' if total else ' MB'
+            job.meta['status'] = '{} is being downloaded.. {}{}'.format(url, progress, unit)
+            job.save_meta()
+
+    downloader = Downloader(pool_size=settings.REMOTE_FILES_POOL_SIZE, on_progress=report_progress)
+    downloader.download_all([(url, os.path.join(upload_dir, name)) for name, url in local_files.items()])
     return list(local_files.keys())
 
 @transaction.atomic
@@ -259,8 +355,10 @@ def _create_thread(tid, data, options):
     slogger.glob.info("create task #{}".format(tid))
 
     db_task = models.Task.objects.select_for_update().get(pk=tid)
-    if db_task.size != 0:
-        raise NotImplementedError("Adding more data is not implemented")
+    # frames are appended to the task if it already has some
+    start_size = db_task.size
+    if start_size != 0 and (db_task.mode != 'annotation' or db_task.external):
+        raise ValueError("Only images can be added to an existing task")
 
     upload_dir = db_task.get_upload_dirname()
 
@@ -279,6 +377,14 @@ def _create_thread(tid, data, options):
     db_images = []
     extractors = []
     length = 0
+    if start_size == 0:
+        db_task.set_preview_sizes(options.get('preview_sizes', []))
+    # appended frames get the same preview levels as the existing ones
+    preview_sizes = db_task.get_preview_sizes()
+    frame_store = get_frame_store()
+    frame_store_keys = []
+    encoder = create_encoder(options.get('jpeg_encoder', 'pillow'), db_task.image_quality,
+        options.get('jpeg_optimize', True))
     for media_type, media_files in media.items():
         if not media_files:
             continue
@@ -290,8 +396,11 @@ def _create_thread(tid, data, options):
             step=db_task.get_frame_step(),
             start=db_task.start_frame,
             stop=db_task.stop_frame,
+            encoder=encoder,
         )
         length += len(extractor)
+        if start_size != 0 and MEDIA_TYPES[media_type]['mode'] != db_task.mode:
+            raise ValueError("Only images can be added to an existing task")
         db_task.mode = MEDIA_TYPES[media_type]['mode']
         extractors.append(extractor)
 
@@ -306,18 +415,26 @@ def _create_thread(tid, data, options):
             if db_task.mode == 'interpolation':
                 extractor.save_image(frame, image_dest_path)
             else:
-                width, height = extractor.save_image(frame, image_dest_path)
+                if frame_store:
+                    key, width, height = _save_stored_image(extractor, frame, image_dest_path, frame_store)
+                    frame_store_keys.append(key)
+                else:
+                    width, height = extractor.save_image(frame, image_dest_path)
                 db_images.append(models.Image(
                     task=db_task,
                     path=image_orig_path,
                     frame=db_task.size,
                     width=width, height=height))
+            _save_previews(db_task, db_task.size, preview_sizes)
 
             db_task.size += 1
             progress = frame * 100 // length
             job.meta['status'] = 'Images are being compressed... {}%'.format(progress)
             job.save_meta()
 
+    if frame_store_keys:
+        write_manifest(db_task.get_task_dirname(), frame_store_keys, append=start_size != 0)
+
     if db_task.mode == 'interpolation':
         image = Image.open(db_task.get_frame_path(0))
         models.Video.objects.create(
@@ -349,17 +466,24 @@ def _create_thread(tid, data, options):
                     segment[4] = chunk_assignees
     else:
         segments = []
-    _save_task_to_db(db_task, segments)
+    _save_task_to_db(db_task, segments, start_frame=start_size)
 
     job.meta['status'] = 'Image meta cache is being created'
     job.save_meta()
-    make_image_meta_cache(db_task)
+    if start_size != 0:
+        _extend_image_meta_cache(db_task, db_images)
+        # only the new jobs get the data of the task finalization (e.g. hints)
+        new_jobs = models.Job.objects.filter(segment__task=db_task, segment__start_frame__gte=start_size)
+        job_selection = dict(jobs=list(new_jobs.values_list('id', flat=True)), version=None)
+    else:
+        make_image_meta_cache(db_task)
+        job_selection = None
     job.meta['status'] = 'Finishing task creation...'
     job.save_meta()
     task_type = guess_task_type(db_task)
     if task_type is not None:
         handler = create_task_handler(task_type)
-        handler.finalize_task_creation(db_task)
+        handler.finalize_task_creation(db_task, job_selection)
     record_task_creation(db_task, segments)
 
 
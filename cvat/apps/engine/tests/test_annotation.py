@@ -0,0 +1,43 @@
+import os
+import shutil
+
+from django import test
+from django.contrib.auth.models import AnonymousUser
+
+from cvat.apps.engine.annotation import TaskAnnotation
+from cvat.apps.engine.models import Task, Job, Label, LabeledShape, Segment
+
+
+class TaskAnnotationVersionsTest(test.TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(name="task", size=40, mode="annotation", times_annotated=4,
+            segment_size=20, overlap=0)
+        # job annotations log into the task directory
+        os.makedirs(self.task.get_task_dirname())
+        label = Label.objects.create(task=self.task, name="car")
+        for start_frame in (0, 20):
+            segment = Segment.objects.create(task=self.task, start_frame=start_frame, stop_frame=start_frame + 19)
+            for version in range(4):
+                # the extra annotation covers the first segment only
+                if version == 3 and start_frame:
+                    continue
+                job = Job.objects.create(segment=segment, version=version)
+                for frame in range(start_frame, start_frame + 20, 5):
+                    LabeledShape.objects.create(job=job, label=label, frame=frame, type="rectangle",
+                        points=[version, frame, version + 10, frame + 10])
+
+    def tearDown(self):
+        shutil.rmtree(self.task.get_task_dirname())
+
+    def test_same_as_job_selection_by_version(self):
+        data_by_version = TaskAnnotation(self.task.id, AnonymousUser()).init_versions_from_db()
+
+        self.assertEqual(list(data_by_version), [0, 1, 2, 3])
+        for version, (ir_data, frame_container) in data_by_version.items():
+            expected = TaskAnnotation(self.task.id, AnonymousUser(), dict(version=version, jobs=[]))
+            expected.init_from_db()
+            with self.subTest(version=version):
+                self.assertEqual(ir_data.data, expected.data)
+                self.assertEqual(frame_container is None, version != 3)
+        self.assertEqual(len(data_by_version[0][0].shapes), 8)
+        self.assertEqual(len(data_by_version[3][0].shapes), 4)
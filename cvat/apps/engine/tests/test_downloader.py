@@ -0,0 +1,116 @@
+import os
+import re
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase
+
+from cvat.apps.engine.downloader import Downloader, DownloadError
+
+CONTENT = bytes(range(256)) * 64
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """Serves CONTENT on any path. Supports Range requests.
+
+    /flaky/<n> fails with 503 first n times,
+    /broken/<n> sends only the first n bytes of the first response.
+    """
+    requests_by_path = {}
+
+    def do_GET(self):
+        count = self.requests_by_path.get(self.path, 0)
+        self.requests_by_path[self.path] = count + 1
+
+        if self.path.startswith('/missing'):
+            self.send_error(404)
+            return
+        match = re.match(r'/flaky/(\d+)', self.path)
+        if match and count < int(match.group(1)):
+            self.send_error(503)
+            return
+
+        start = 0
+        match = re.match(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        if match:
+            start = int(match.group(1))
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(start, len(CONTENT) - 1, len(CONTENT)))
+        else:
+            self.send_response(200)
+        body = CONTENT[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        match = re.match(r'/broken/(\d+)', self.path)
+        if match and count == 0:
+            body = body[:int(match.group(1))]
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class DownloaderTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), FileHandler)
+        cls.base_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FileHandler.requests_by_path.clear()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.progress = []
+        self.downloader = Downloader(pool_size=4, retries=2, backoff=0, block_size=1024,
+            on_progress=lambda *args: self.progress.append(args))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self._temp_dir.name, name)
+
+    def _read(self, name):
+        with open(self._path(name), 'rb') as f:
+            return f.read()
+
+    def test_download_all(self):
+        files = [('{}/{}.jpg'.format(self.base_url, i), self._path('{}.jpg'.format(i))) for i in range(10)]
+
+        self.downloader.download_all(files)
+
+        for i in range(10):
+            self.assertEqual(self._read('{}.jpg'.format(i)), CONTENT)
+        url, downloaded, total = self.progress[-1]
+        self.assertEqual(total, len(CONTENT))
+
+    def test_retry_server_errors(self):
+        self.downloader.download(self.base_url + '/flaky/2', self._path('a.jpg'))
+
+        self.assertEqual(self._read('a.jpg'), CONTENT)
+        self.assertEqual(FileHandler.requests_by_path['/flaky/2'], 3)
+
+    def test_give_up_after_retries(self):
+        with self.assertRaises(DownloadError):
+            self.downloader.download(self.base_url + '/flaky/5', self._path('a.jpg'))
+
+    def test_resume_partial_download(self):
+        self.downloader.download(self.base_url + '/broken/5000', self._path('a.jpg'))
+
+        self.assertEqual(self._read('a.jpg'), CONTENT)
+        self.assertEqual(FileHandler.requests_by_path['/broken/5000'], 2)
+        # the second request continues from the received data instead of starting over
+        downloaded = [d for _, d, _ in self.progress]
+        self.assertEqual(downloaded.count(1024), 1)
+        self.assertEqual(downloaded[-1], len(CONTENT))
+
+    def test_client_error(self):
+        with self.assertRaises(DownloadError):
+            self.downloader.download(self.base_url + '/missing', self._path('a.jpg'))
+        self.assertEqual(FileHandler.requests_by_path['/missing'], 1)
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase, mock
+
+from cvat.apps.engine.downloader import Downloader, DownloadError
+from cvat.apps.engine.external_frame_cache import ExternalFrameCache
+
+FRAME_SIZE = 1000
+
+
+class FrameHandler(BaseHTTPRequestHandler):
+    """Stand-in for the external image storage, /missing/* paths don't exist"""
+    requests_by_path = {}
+
+    def do_GET(self):
+        self.requests_by_path[self.path] = self.requests_by_path.get(self.path, 0) + 1
+        if self.path.startswith('/missing'):
+            self.send_error(404)
+            return
+        body = self.path.encode().ljust(FRAME_SIZE, b'\0')
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ExternalFrameCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), FrameHandler)
+        cls.base_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FrameHandler.requests_by_path.clear()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        downloader = Downloader(pool_size=4, retries=0, backoff=0)
+        self.cache = ExternalFrameCache(self._temp_dir.name, max_size=int(2.5 * FRAME_SIZE),
+            pool_size=4, downloader=downloader)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _url(self, path):
+        return self.base_url + path
+
+    def _is_cached(self, path):
+        return os.path.exists(self.cache.get_path(self._url(path)))
+
+    def test_read_through(self):
+        path = self.cache.get(self._url('/seq/1.jpg'))
+        self.assertEqual(path, self.cache.get(self._url('/seq/1.jpg')))
+
+        with open(path, 'rb') as f:
+            self.assertTrue(f.read().startswith(b'/seq/1.jpg'))
+        self.assertEqual(FrameHandler.requests_by_path, {'/seq/1.jpg': 1})
+
+    def test_missing_frame(self):
+        with self.assertRaises(DownloadError):
+            self.cache.get(self._url('/missing/1.jpg'))
+        # no partially downloaded files are left
+        self.assertEqual([files for _, _, files in os.walk(self._temp_dir.name) if files], [])
+
+    def test_prefetch(self):
+        self.cache.get(self._url('/seq/1.jpg'))
+
+        failed = self.cache.prefetch([self._url(p) for p in ('/seq/1.jpg', '/seq/2.jpg', '/missing/3.jpg')])
+
+        self.assertEqual(failed, [self._url('/missing/3.jpg')])
+        self.assertTrue(self._is_cached('/seq/1.jpg'))
+        self.assertTrue(self._is_cached('/seq/2.jpg'))
+        self.assertEqual(FrameHandler.requests_by_path['/seq/1.jpg'], 1)
+
+    def test_least_recently_used_frames_are_evicted(self):
+        self.cache.get(self._url('/seq/1.jpg'))
+        self.cache.get(self._url('/seq/2.jpg'))
+        os.utime(self.cache.get_path(self._url('/seq/1.jpg')), (100, 100))
+        os.utime(self.cache.get_path(self._url('/seq/2.jpg')), (200, 200))
+
+        self.cache.get(self._url('/seq/1.jpg'))
+        self.cache.get(self._url('/seq/3.jpg'))
+
+        self.assertTrue(self._is_cached('/seq/1.jpg'))
+        self.assertFalse(self._is_cached('/seq/2.jpg'))
+        self.assertTrue(self._is_cached('/seq/3.jpg'))
+
+    def test_cache_is_scanned_over_budget_only(self):
+        self.cache.get(self._url('/seq/1.jpg'))
+
+        with mock.patch('cvat.apps.engine.external_frame_cache._scan_files') as scan_files:
+            self.cache.get(self._url('/seq/2.jpg'))
+        self.assertFalse(scan_files.called)
+
+        with mock.patch('cvat.apps.engine.external_frame_cache._scan_files', return_value=[]) as scan_files:
+            self.cache.get(self._url('/seq/3.jpg'))
+        self.assertTrue(scan_files.called)
@@ -0,0 +1,49 @@
+import os
+import stat
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from cvat.apps.engine.ddln.file_copy import copy_tree
+
+
+class CopyTreeTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self.source = self.root / "source"
+        self._write("ddln.yaml", b"metadata")
+        self._write("seq1/frame_000_y.csv", b"1,2,3,4\n")
+        self._write("seq2/frame_000_y.csv", b"")
+        os.utime(str(self.source / "seq1"), ns=(0, 0))
+        self.source.chmod(stat.S_IRWXU | stat.S_ISGID)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = self.source / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    def test_copy(self):
+        destination_dir = self.root / "destination"
+
+        copy_tree(self.source, destination_dir, threads=2)
+
+        for name in ("ddln.yaml", "seq1/frame_000_y.csv", "seq2/frame_000_y.csv"):
+            source = self.source / name
+            destination = destination_dir / name
+            self.assertEqual(destination.read_bytes(), source.read_bytes())
+            self.assertEqual(os.stat(str(destination)).st_mtime_ns, os.stat(str(source)).st_mtime_ns)
+        for name in (".", "seq1"):
+            source_stat = os.stat(str(self.source / name))
+            destination_stat = os.stat(str(destination_dir / name))
+            self.assertEqual(destination_stat.st_mtime_ns, source_stat.st_mtime_ns)
+            self.assertEqual(destination_stat.st_mode, source_stat.st_mode)
+
+    def test_existing_destination(self):
+        (self.root / "destination").mkdir()
+
+        with self.assertRaises(FileExistsError):
+            copy_tree(self.source, self.root / "destination", threads=2)
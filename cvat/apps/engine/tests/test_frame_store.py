@@ -0,0 +1,62 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from cvat.apps.engine.frame_store import FrameStore, write_manifest, read_manifest
+
+
+class FrameStoreTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = self._temp_dir.name
+        self.store = FrameStore(os.path.join(self.root, "store"))
+        self.source_path = self._write("source.png", b"image data")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_key_depends_on_content_and_params(self):
+        other_path = self._write("other.png", b"image data")
+
+        key = self.store.get_key(self.source_path, quality=50)
+
+        self.assertEqual(key, self.store.get_key(other_path, quality=50))
+        self.assertNotEqual(key, self.store.get_key(self.source_path, quality=70))
+
+    def test_stored_frame_is_shared(self):
+        key = self.store.get_key(self.source_path, quality=50)
+        first_frame = self._write("first.jpg", b"encoded")
+        second_frame = os.path.join(self.root, "second.jpg")
+
+        self.assertFalse(self.store.link_to(key, second_frame))
+        self.store.add(key, first_frame)
+        self.assertTrue(self.store.link_to(key, second_frame))
+
+        self.assertTrue(os.path.samefile(first_frame, second_frame))
+
+    def test_release_keeps_referenced_frames(self):
+        key = self.store.get_key(self.source_path, quality=50)
+        first_frame = self._write("first.jpg", b"encoded")
+        second_frame = os.path.join(self.root, "second.jpg")
+        self.store.add(key, first_frame)
+        self.store.link_to(key, second_frame)
+
+        os.remove(first_frame)
+        self.store.release([key])
+        self.assertTrue(os.path.exists(self.store.get_path(key)))
+
+        os.remove(second_frame)
+        self.store.release([key])
+        self.assertFalse(os.path.exists(self.store.get_path(key)))
+
+    def test_manifest(self):
+        write_manifest(self.root, ["a", "b"])
+
+        self.assertEqual(read_manifest(self.root), ["a", "b"])
+        self.assertEqual(read_manifest(os.path.join(self.root, "missing")), [])
@@ -0,0 +1,80 @@
+import tempfile
+from pathlib import Path
+
+from django import test
+
+from cvat.apps.engine.ddln.tasks.spotter.hints import load_hints
+from cvat.apps.engine.models import (AttributeSpec, Image, Job, JobCommit, Label, LabeledTrack,
+    LabeledTrackAttributeVal, Segment, Task, TrackedShape)
+
+
+class LoadHintsTest(test.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.hints_dir = Path(self._temp_dir.name)
+        self.task = Task.objects.create(name="task", size=6, mode="annotation")
+        label = Label.objects.create(task=self.task, name="Hint")
+        for name, mutable in (("Id", False), ("Aircraft_type", False), ("Raw_type", False),
+                              ("Distance_m", True), ("Height_diff_m", True), ("Velocity_mps", True)):
+            AttributeSpec.objects.create(label=label, name=name, mutable=mutable, input_type="text",
+                default_value="", values="")
+        # frames 0-2 belong to seq1, frames 3-5 to seq2
+        Image.objects.bulk_create([
+            Image(task=self.task, frame=frame, width=1000, height=500,
+                path="/data/seq{}/camera/left/{:020d}.png".format(frame // 3 + 1, frame % 3))
+            for frame in range(6)
+        ])
+        self.jobs = []
+        for start_frame, stop_frame in ((0, 3), (4, 5)):
+            segment = Segment.objects.create(task=self.task, start_frame=start_frame, stop_frame=stop_frame)
+            self.jobs.append(Job.objects.create(segment=segment))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write_hints(self, sequence_name, frame, rows):
+        path = self.hints_dir / sequence_name / "{}.csv".format(frame)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = ["id,x,y,type,distance,vertical_distance,velocity"] + [",".join(map(str, row)) for row in rows]
+        path.write_text("\n".join(lines) + "\n")
+
+    def test_hints_are_saved_as_tracks(self):
+        self._write_hints("seq1", 0, [("a", 0.5, 0.5, "GLIDER", 100, 10, 20)])
+        self._write_hints("seq1", 1, [("a", 0.6, 0.5, "GLIDER", 90, 10, 20)])
+
+        load_hints(self.hints_dir, self.task)
+
+        db_track = LabeledTrack.objects.get()
+        self.assertEqual(db_track.job_id, self.jobs[0].id)
+        self.assertEqual(db_track.frame, 0)
+        attributes = {v.spec.name: v.value for v in LabeledTrackAttributeVal.objects.filter(track=db_track)}
+        self.assertEqual(attributes, {"Id": "a", "Aircraft_type": "Fixed wing aircraft", "Raw_type": "GLIDER"})
+        db_shapes = TrackedShape.objects.filter(track=db_track).order_by('frame')
+        self.assertEqual([(s.frame, s.outside) for s in db_shapes], [(0, False), (1, False), (2, True)])
+        self.assertEqual(db_shapes[0].points, [450, 200, 550, 300])
+        self.assertEqual(db_shapes[0].trackedshapeattributeval_set.get(spec__name="Distance_m").value, "100.0")
+
+    def test_track_is_closed_inside_its_sequence(self):
+        self._write_hints("seq1", 1, [("a", 0.5, 0.5, "UAV", 100, 10, 20)])
+        self._write_hints("seq1", 2, [("a", 0.5, 0.5, "UAV", 100, 10, 20)])
+        self._write_hints("seq2", 2, [("b", 0.5, 0.5, "UAV", 100, 10, 20)])
+
+        load_hints(self.hints_dir, self.task)
+
+        shapes = TrackedShape.objects.order_by('track__job_id', 'frame').values_list('track__job_id', 'frame', 'outside')
+        self.assertEqual(list(shapes), [
+            (self.jobs[0].id, 1, False), (self.jobs[0].id, 2, True),
+            (self.jobs[1].id, 5, False),
+        ])
+
+    def test_track_is_added_to_every_job_having_its_frames(self):
+        self._write_hints("seq2", 0, [("a", 0.5, 0.5, "UAV", 100, 10, 20)])
+        self._write_hints("seq2", 1, [("a", 0.5, 0.5, "UAV", 100, 10, 20)])
+
+        load_hints(self.hints_dir, self.task)
+
+        self.assertEqual(sorted(LabeledTrack.objects.values_list('job_id', flat=True)), [j.id for j in self.jobs])
+        commits = JobCommit.objects.order_by('job_id').values_list('job_id', 'version', 'message')
+        self.assertEqual(list(commits), [
+            (job.id, 1, "Changes: tags - 0; shapes - 0; tracks - 1") for job in self.jobs
+        ])
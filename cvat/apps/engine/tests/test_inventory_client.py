@@ -0,0 +1,201 @@
+import datetime as dt
+import re
+from unittest import TestCase, mock
+
+from cvat.apps.engine.ddln import inventory_client
+from cvat.apps.engine.ddln.inventory_client import InventoryClient, InventoryUpdateQueue, flush_inventory_updates
+
+
+class FakeRequest:
+    def __init__(self, response):
+        self._response = response
+
+    def execute(self):
+        return self._response()
+
+
+class FakeSheetsService:
+    """Spreadsheet of the inventory file, implements the subset of Sheets API the client uses"""
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+        self.requests = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range):
+        self.requests.append(("get", range))
+        start_row = int(re.match(r"A(\d+):C$", range).group(1))
+        values = [row[:3] for row in self.rows[start_row - 1:]]
+        return FakeRequest(lambda: {"values": values} if values else {})
+
+    def batchGet(self, spreadsheetId, ranges):
+        self.requests.append(("batchGet", ranges))
+        value_ranges = []
+        for value_range in ranges:
+            start_row, end_row = map(int, re.match(r"A(\d+):C(\d+)$", value_range).groups())
+            values = [row[:3] for row in self.rows[start_row - 1:end_row]]
+            value_ranges.append({"range": value_range, "values": values} if values else {"range": value_range})
+        return FakeRequest(lambda: {"valueRanges": value_ranges})
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        self.requests.append(("append", range))
+
+        def response():
+            start_row = len(self.rows) + 1
+            self.rows.extend([str(v) for v in row] for row in body["values"])
+            return {"updates": {"updatedRange": "A{}:F{}".format(start_row, len(self.rows))}}
+        return FakeRequest(response)
+
+    def batchUpdate(self, spreadsheetId, body):
+        self.requests.append(("batchUpdate", [entry["range"] for entry in body["data"]]))
+
+        def response():
+            for entry in body["data"]:
+                first_column, first_row = re.match(r"([A-Z])(\d+):", entry["range"]).groups()
+                for i, values in enumerate(entry["values"]):
+                    row = self.rows[int(first_row) - 1 + i]
+                    column = ord(first_column) - ord("A")
+                    row.extend([""] * (column + len(values) - len(row)))
+                    row[column:column + len(values)] = values
+            return {"responses": [{"updatedRange": entry["range"]} for entry in body["data"]]}
+        return FakeRequest(response)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.values = {}
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    def lrange(self, key, start, end):
+        assert (start, end) == (0, -1)
+        return list(self.lists.get(key, []))
+
+    def ltrim(self, key, start, end):
+        assert end == -1
+        self.lists[key] = self.lists.get(key, [])[start:]
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        self.values.pop(key, None)
+        self.lists.pop(key, None)
+
+
+class InventoryClientTest(TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService([
+            ["Sequence", "Version", "Task"],
+            ["seq1", "1", "T1"],
+            ["seq2", "1", "T1"],
+            ["seq1", "1", "T2"],
+        ])
+        self.client = InventoryClient("spreadsheet", self.service)
+
+    def test_updates_are_batched(self):
+        updates = [
+            ("completion", "seq2", 0, "T1", "alice", "01.02.2020"),
+            ("completion", "seq1", 0, "T2", "bob", "02.02.2020"),
+            ("validation", "T1", "abc", "03.02.2020"),
+        ]
+
+        affected_cells = self.client.write_updates(updates)
+
+        self.assertEqual(affected_cells, ["F3:G3", "F4:G4", "H2:I3"])
+        self.assertEqual([r[0] for r in self.service.requests].count("batchUpdate"), 1)
+        self.assertEqual(self.service.rows[2][5:], ["alice", "01.02.2020", "abc", "03.02.2020"])
+        self.assertEqual(self.service.rows[3][5:], ["bob", "02.02.2020"])
+
+    def test_only_appended_rows_are_read(self):
+        self.client.record_sequence_completion("seq1", 0, "T1", "alice", dt.date(2020, 2, 1))
+        self.client.record_task_creation("T3", [("seq3", 0, "bob")])
+        self.client.record_sequence_completion("seq3", 0, "T3", "bob", dt.date(2020, 2, 2))
+
+        reads = [r[1] for r in self.service.requests if r[0] == "get"]
+        self.assertEqual(reads, ["A1:C", "A5:C", "A5:C"])
+        self.assertEqual(self.service.rows[4][5:], ["bob", "02.02.2020"])
+
+    def test_missing_rows_are_skipped(self):
+        affected_cells = self.client.write_updates([
+            ("completion", "seq9", 0, "T1", "alice", "01.02.2020"),
+            ("validation", "T9", "abc", "03.02.2020"),
+        ])
+
+        self.assertEqual(affected_cells, [])
+        self.assertNotIn("batchUpdate", [r[0] for r in self.service.requests])
+
+    def test_moved_rows_rebuild_index(self):
+        self.client.write_updates([("completion", "seq1", 0, "T2", "alice", "01.02.2020")])
+        # somebody sorted the file by hand
+        self.service.rows[1:] = [["seq1", "1", "T2"], ["seq1", "1", "T1"], ["seq2", "1", "T1"]]
+
+        affected_cells = self.client.write_updates([
+            ("completion", "seq1", 0, "T2", "bob", "02.02.2020"),
+            ("validation", "T1", "abc", "03.02.2020"),
+        ])
+
+        self.assertEqual(affected_cells, ["F2:G2", "H3:I4"])
+        self.assertEqual(self.service.rows[1][5:], ["bob", "02.02.2020"])
+        self.assertEqual(self.service.rows[2][5:], ["", "", "abc", "03.02.2020"])
+        self.assertEqual(self.service.rows[3][5:], ["", "", "abc", "03.02.2020"])
+        self.assertEqual([r[1] for r in self.service.requests if r[0] == "get"], ["A1:C", "A5:C", "A1:C", "A5:C"])
+
+    def test_indexed_rows_are_checked_in_one_request(self):
+        self.client.write_updates([
+            ("completion", "seq2", 0, "T1", "alice", "01.02.2020"),
+            ("validation", "T1", "abc", "03.02.2020"),
+        ])
+
+        checks = [r[1] for r in self.service.requests if r[0] == "batchGet"]
+        self.assertEqual(checks, [["A3:C3", "A2:C3"]])
+        self.assertEqual([r[1] for r in self.service.requests if r[0] == "get"], ["A1:C", "A5:C"])
+
+
+class FlushInventoryUpdatesTest(TestCase):
+    def setUp(self):
+        self.connection = FakeRedis()
+        self.queue = InventoryUpdateQueue(self.connection)
+        self.updates = [
+            ["completion", "seq2", 0, "T1", "alice", "01.02.2020"],
+            ["validation", "T1", "abc", "03.02.2020"],
+        ]
+        for update in self.updates:
+            self.queue.push(update)
+        self.queue.mark_flush_scheduled(60)
+        patcher = mock.patch.object(inventory_client, "django_rq")
+        self.django_rq = patcher.start()
+        self.django_rq.get_connection.return_value = self.connection
+        self.addCleanup(patcher.stop)
+
+    def _flush(self, client):
+        with mock.patch.object(inventory_client, "create_inventory_client", return_value=client):
+            flush_inventory_updates()
+
+    def test_written_updates_are_removed(self):
+        client = mock.Mock()
+        client.write_updates.side_effect = lambda updates: self.queue.push(["validation", "T2", "abc", "04.02.2020"])
+
+        self._flush(client)
+
+        client.write_updates.assert_called_once_with(self.updates)
+        # the update queued while writing is kept for the next flush
+        self.assertEqual(self.queue.peek_all(), [["validation", "T2", "abc", "04.02.2020"]])
+
+    def test_failed_updates_are_kept(self):
+        client = mock.Mock()
+        client.write_updates.side_effect = RuntimeError("quota exceeded")
+
+        self._flush(client)
+
+        self.assertEqual(self.queue.peek_all(), self.updates)
+        self.django_rq.get_scheduler.return_value.enqueue_in.assert_called_once()
@@ -0,0 +1,128 @@
+import importlib.util
+import os
+import tarfile
+import tempfile
+import zipfile
+from unittest import TestCase, skipUnless
+
+import numpy as np
+from PIL import Image
+
+from cvat.apps.engine.media_extractors import (ArchiveExtractor, DirectoryExtractor,
+    ImageListExtractor, create_encoder)
+
+
+class ArchiveExtractorTest(TestCase):
+    names = ["seq2/frame_0.png", "seq1/frame_10.png", "seq1/frame_2.png", "seq1/notes.txt"]
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self._temp_dir.name, "source")
+        self.dest_dir = os.path.join(self._temp_dir.name, "upload")
+        os.makedirs(self.dest_dir)
+        for i, name in enumerate(self.names):
+            path = os.path.join(self.source_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if name.endswith(".png"):
+                Image.new("RGB", (10 + i, 20), (i * 50, 0, 0)).save(path)
+            else:
+                with open(path, "w") as f:
+                    f.write("text")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _make_zip(self):
+        path = os.path.join(self._temp_dir.name, "images.zip")
+        with zipfile.ZipFile(path, "w") as archive:
+            for name in self.names:
+                archive.write(os.path.join(self.source_dir, name), name)
+        return path
+
+    def _make_tar(self, name="images.tar", mode="w"):
+        path = os.path.join(self._temp_dir.name, name)
+        with tarfile.open(path, mode) as archive:
+            for name in self.names:
+                archive.add(os.path.join(self.source_dir, name), "./" + name)
+        return path
+
+    def _check_extractor(self, archive_path, extracted=False):
+        extractor = ArchiveExtractor([archive_path], self.dest_dir, image_quality=95)
+        expected = DirectoryExtractor([self.source_dir], self.source_dir, image_quality=95)
+
+        self.assertEqual(
+            list(extractor),
+            [os.path.join(self.dest_dir, os.path.relpath(p, self.source_dir)) for p in expected],
+        )
+        for frame in range(len(extractor)):
+            frame_path = os.path.join(self._temp_dir.name, "{}.jpg".format(frame))
+            width, height = extractor.save_image(frame, frame_path)
+            with Image.open(expected[frame]) as image:
+                self.assertEqual((width, height), image.size)
+        # only the compressed frames are written unless the archive has to be extracted
+        self.assertEqual(bool(os.listdir(self.dest_dir)), extracted)
+
+    def test_zip(self):
+        self._check_extractor(self._make_zip())
+
+    def test_tar(self):
+        self._check_extractor(self._make_tar())
+
+    def test_compressed_tar(self):
+        self._check_extractor(self._make_tar("images.tar.gz", "w:gz"), extracted=True)
+
+    def test_read_once(self):
+        extractor = ArchiveExtractor([self._make_zip()], self.dest_dir, image_quality=95)
+        data = extractor.read(0)
+        extractor.open = None
+
+        width, height = extractor.save_image(0, os.path.join(self._temp_dir.name, "0.jpg"), data)
+
+        self.assertEqual((width, height), (11, 20))
+
+
+class JpegEncoderTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        # 12-bit grayscale camera frame with a gradient and some noise
+        rows, cols = np.mgrid[0:120, 0:160]
+        noise = np.random.RandomState(0).randint(0, 64, size=rows.shape)
+        data = ((rows * 16 + cols * 8 + noise) % 4096).astype(np.int32)
+        self.source_path = os.path.join(self._temp_dir.name, "source.png")
+        Image.fromarray(data, mode="I").save(self.source_path)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _save(self, encoder_name, optimize=True):
+        encoder = create_encoder(encoder_name, 95, optimize)
+        extractor = ImageListExtractor([self.source_path], self._temp_dir.name, 95, encoder=encoder)
+        dest_path = os.path.join(self._temp_dir.name, "{}-{}.jpg".format(encoder_name, optimize))
+        self.assertEqual(extractor.save_image(0, dest_path), (160, 120))
+        with Image.open(dest_path) as image:
+            self.assertEqual(image.mode, "RGB")
+            return np.asarray(image, dtype=np.int16)
+
+    def test_rescale_matches_float_conversion(self):
+        with Image.open(self.source_path) as image:
+            im_data = np.array(image)
+            im_data = im_data * (2**8 / im_data.max())
+            expected = Image.fromarray(im_data.astype(np.int32)).convert("RGB")
+        extractor = ImageListExtractor([self.source_path], self._temp_dir.name, 95)
+        encoded = []
+        extractor.encoder.encode = lambda image, dest_path: encoded.append(np.asarray(image))
+
+        extractor.save_image(0, os.path.join(self._temp_dir.name, "frame.jpg"))
+
+        np.testing.assert_array_equal(encoded[0], np.asarray(expected))
+
+    def test_optimize_is_lossless(self):
+        np.testing.assert_array_equal(self._save("pillow", optimize=False), self._save("pillow"))
+
+    @skipUnless(importlib.util.find_spec("cv2"), "OpenCV is not installed")
+    def test_opencv_is_visually_equivalent(self):
+        reference = self._save("pillow")
+        for optimize in (True, False):
+            data = self._save("opencv", optimize)
+            self.assertLessEqual(np.abs(data - reference).mean(), 1.0)
+            self.assertLessEqual(np.abs(data - reference).max(), 16)
@@ -23,3 +23,14 @@ class TaskModelTest(TestCase):
             self.assertTrue(src_path.endswith(src_path_expected),
                 '%s vs. %s' % (src_path, src_path_expected))
             self.assertEqual(i, dst_frame)
+
+    def test_choose_preview_size(self):
+        task = Task(2)
+        self.assertIsNone(task.choose_preview_size())
+
+        task.set_preview_sizes([256, 64])
+        self.assertEqual(task.preview_sizes, "64,256")
+        self.assertEqual(task.get_preview_sizes(), [64, 256])
+        self.assertEqual(task.choose_preview_size(), 64)
+        self.assertEqual(task.choose_preview_size(100), 256)
+        self.assertIsNone(task.choose_preview_size(1000))
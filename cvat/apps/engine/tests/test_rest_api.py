@@ -12,7 +12,7 @@ from rest_framework import status
 from django.conf import settings
 from django.contrib.auth.models import User, Group
 from cvat.apps.engine.models import (Task, Segment, Job, StatusChoice,
-    AttributeType, Project)
+    AttributeType, Project, ClientFile, ServerFile)
 from cvat.apps.annotation.models import AnnotationFormat
 from unittest import mock
 import io
@@ -21,6 +21,7 @@ from collections import defaultdict
 import zipfile
 from pycocotools import coco as coco_loader
 import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 def create_db_users(cls):
     (group_admin, _) = Group.objects.get_or_create(name="admin")
@@ -1543,6 +1544,52 @@ class TaskDataAPITestCase(APITestCase):
         response = self._create_task(None, data)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def _create_task_with_frames(self, **fields):
+        task = Task.objects.create(name="task with frames", owner=self.admin, size=3, mode="annotation",
+            image_quality=75, **fields)
+        return task
+
+    @mock.patch('cvat.apps.engine.task.create')
+    def test_api_v1_tasks_id_data_append_images(self, create):
+        task = self._create_task_with_frames()
+        data = {
+            "client_files[0]": generate_image_file("test_4.jpg"),
+            "external_files": "[]",
+        }
+
+        response = self._run_api_v1_tasks_id_data(task.id, self.admin, data)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        create.assert_called_once()
+
+    @mock.patch('cvat.apps.engine.task.create')
+    def test_api_v1_tasks_id_data_append_video(self, create):
+        task = self._create_task_with_frames()
+        data = {
+            "client_files[0]": SimpleUploadedFile("test.mp4", b"video", content_type="video/mp4"),
+            "external_files": "[]",
+        }
+
+        response = self._run_api_v1_tasks_id_data(task.id, self.admin, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ClientFile.objects.filter(task=task).exists())
+        create.assert_not_called()
+
+    @mock.patch('cvat.apps.engine.task.create')
+    def test_api_v1_tasks_id_data_append_to_external_task(self, create):
+        task = self._create_task_with_frames(external=True)
+        data = {
+            "server_files[0]": "test_1.jpg",
+            "external_files": "[]",
+        }
+
+        response = self._run_api_v1_tasks_id_data(task.id, self.admin, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ServerFile.objects.filter(task=task).exists())
+        create.assert_not_called()
+
 def compare_objects(self, obj1, obj2, ignore_keys, fp_tolerance=.001):
     if isinstance(obj1, dict):
         self.assertTrue(isinstance(obj2, dict), "{} != {}".format(obj1, obj2))
@@ -2087,6 +2134,28 @@ class JobAnnotationAPITestCase(APITestCase):
     def test_api_v1_jobs_id_annotations_no_auth(self):
         self._run_api_v1_jobs_id_annotations(self.user, self.assignee, None)
 
+    def test_api_v1_jobs_id_annotations_not_modified(self):
+        _, jobs = self._create_task(self.user, self.assignee)
+        job = jobs[0]
+
+        response = self._get_api_v1_jobs_id_data(job["id"], self.user)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        with ForceLogin(self.user, self.client):
+            response = self.client.get("/api/v1/jobs/{}/annotations".format(job["id"]),
+                HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        data = {"version": 0, "tags": [], "shapes": [], "tracks": []}
+        response = self._put_api_v1_jobs_id_data(job["id"], self.user, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with ForceLogin(self.user, self.client):
+            response = self.client.get("/api/v1/jobs/{}/annotations".format(job["id"]),
+                HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
 class TaskAnnotationAPITestCase(JobAnnotationAPITestCase):
     def _put_api_v1_tasks_id_annotations(self, pk, user, data):
         with ForceLogin(user, self.client):
@@ -1,3 +1,4 @@
+import heapq
 import pathlib
 import random
 import re
@@ -71,6 +72,37 @@ class ExtendAssigneesTest(TestCase):
             ('D', alice),
         ])
 
+    def test_same_as_heap_assignment(self):
+        rng = random.Random(0)
+        assignees = ["annotator{}".format(i) for i in range(10)]
+        others = ["other{}".format(i) for i in range(3)]
+        sequences = [
+            ("seq{}".format(i), rng.randint(1, 5), set(rng.sample(assignees + others, rng.randint(0, 11))))
+            for i in range(300)
+        ]
+
+        self.assertEqual(extend_assignees(sequences, assignees), extend_assignees_with_heap(sequences, assignees))
+
+
+def extend_assignees_with_heap(sequences_data, assignees):
+    """Reference implementation, pops the heap until an assignee who isn't a performer comes up"""
+    assignments = []
+    failed_sequences = []
+    queue = [(0, order, a) for order, a in enumerate(assignees)]
+    for sequence, sequence_length, performers in sequences_data:
+        skipped = []
+        while queue and queue[0][2] in performers:
+            skipped.append(heapq.heappop(queue))
+        if queue:
+            workload, order, candidate = heapq.heappop(queue)
+            assignments.append((sequence, candidate))
+            heapq.heappush(queue, (workload + sequence_length, order, candidate))
+        else:
+            failed_sequences.append(sequence)
+        for item in skipped:
+            heapq.heappush(queue, item)
+    return assignments, failed_sequences
+
 
 def calc_workload(assignments, sequences):
     workload_by_user = {}
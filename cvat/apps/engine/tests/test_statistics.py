@@ -0,0 +1,79 @@
+from datetime import datetime
+from unittest import TestCase
+
+from cvat.apps.engine.ddln import statistics
+from cvat.apps.engine.ddln.statistics import get_analytics_data
+
+
+class StubElasticsearch:
+    """Answers composite aggregation queries with the given events, one page at a time"""
+    def __init__(self, events):
+        self._events = events
+        self.queries = []
+
+    def __call__(self, data):
+        self.queries.append(data)
+        event = data['query']['bool']['must'][1]['match_phrase']['event']['query']
+        composite = data['aggs']['jobs']['composite']
+        order = data['aggs']['jobs']['aggs']['entry']['top_hits']['sort'][0]['@timestamp']['order']
+        after = composite.get('after', {}).get('job_id', 0)
+
+        entries_by_job = {}
+        for entry in self._events:
+            if entry['event'] == event and entry['job_id'] > after:
+                entries_by_job.setdefault(entry['job_id'], []).append(entry)
+        buckets = []
+        for job_id in sorted(entries_by_job)[:composite['size']]:
+            entries = sorted(entries_by_job[job_id], key=lambda e: e['@timestamp'], reverse=order == 'desc')
+            buckets.append({'key': {'job_id': job_id}, 'entry': {'hits': {'hits': [{'_source': entries[0]}]}}})
+        aggregation = {'buckets': buckets}
+        if buckets:
+            aggregation['after_key'] = buckets[-1]['key']
+        return {'aggregations': {'jobs': aggregation}}
+
+
+def _event(event, job_id, timestamp, object_count):
+    return {
+        'event': event,
+        'job_id': job_id,
+        'username': 'user{}'.format(job_id),
+        'frame count': 10,
+        'object count': object_count,
+        '@timestamp': timestamp,
+    }
+
+
+class AnalyticsDataTest(TestCase):
+    def setUp(self):
+        self._page_size = statistics.PAGE_SIZE
+        statistics.PAGE_SIZE = 3
+
+    def tearDown(self):
+        statistics.PAGE_SIZE = self._page_size
+
+    def test_all_jobs_are_fetched(self):
+        events = []
+        for job_id in range(1, 8):
+            events.append(_event("Load job", job_id, "2020-02-01T10:00:00.000Z", 5))
+            events.append(_event("Load job", job_id, "2020-02-01T11:00:00.000Z", 7))
+            events.append(_event("Send task info", job_id, "2020-02-01T12:00:00.000Z", 20))
+            events.append(_event("Send task info", job_id, "2020-02-01T12:30:00.000Z", 25))
+        search = StubElasticsearch(events)
+
+        data = get_analytics_data(datetime(2020, 2, 1), datetime(2020, 2, 2), search)
+
+        self.assertEqual([e['job_id'] for e in data], list(range(1, 8)))
+        self.assertEqual(len(search.queries), 6)
+        self.assertEqual(data[0]['start_time'], "2020-02-01T10:00:00")
+        self.assertEqual(data[0]['finish_time'], "2020-02-01T12:30:00")
+        self.assertEqual(data[0]['time_spent_seconds'], 9000)
+        self.assertEqual(data[0]['object_count'], 20)
+
+    def test_job_without_start(self):
+        events = [_event("Send task info", 1, "2020-02-01T12:00:00.000Z", 20)]
+
+        data = get_analytics_data(datetime(2020, 2, 1), datetime(2020, 2, 2), StubElasticsearch(events))
+
+        self.assertEqual(data[0]['start_time'], '')
+        self.assertIsNone(data[0]['time_spent_seconds'])
+        self.assertEqual(data[0]['object_count'], 20)
@@ -0,0 +1,167 @@
+import os
+import sys
+import tempfile
+import types
+from unittest import TestCase, mock
+
+from django import test
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image as PILImage
+
+from cvat.apps.engine.models import Image, Task, Job, Segment, StatusChoice
+from cvat.apps.engine.frame_store import FrameStore
+from cvat.apps.engine.media_extractors import PDFExtractor
+from cvat.apps.engine.task import _import_shared_file, _save_stored_image, _save_task_to_db
+
+
+class ImportSharedFileTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self._temp_dir.name, "source.jpg")
+        self.target_path = os.path.join(self._temp_dir.name, "target.jpg")
+        with open(self.source_path, "wb") as f:
+            f.write(b"image data")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _read_target(self):
+        with open(self.target_path, "rb") as f:
+            return f.read()
+
+    def test_copy(self):
+        _import_shared_file(self.source_path, self.target_path, mode="copy")
+
+        self.assertEqual(self._read_target(), b"image data")
+        self.assertFalse(os.path.samefile(self.source_path, self.target_path))
+
+    def test_hardlink(self):
+        _import_shared_file(self.source_path, self.target_path, mode="hardlink")
+
+        self.assertTrue(os.path.samefile(self.source_path, self.target_path))
+
+    def test_symlink(self):
+        _import_shared_file(self.source_path, self.target_path, mode="symlink")
+
+        self.assertTrue(os.path.islink(self.target_path))
+        self.assertEqual(self._read_target(), b"image data")
+
+    def test_reflink_falls_back_to_copy(self):
+        _import_shared_file(self.source_path, self.target_path, mode="reflink")
+
+        self.assertEqual(self._read_target(), b"image data")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            _import_shared_file(self.source_path, self.target_path, mode="move")
+
+
+class SaveStoredImageTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.frame_store = FrameStore(os.path.join(self._temp_dir.name, "store"))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_pdf(self):
+        # pages are rendered by poppler, which the tests don't need
+        pages = [PILImage.new("RGB", (30 + i, 40), (i * 100, 0, 0)) for i in range(2)]
+        pdf2image = types.ModuleType("pdf2image")
+        pdf2image.convert_from_path = lambda path: pages
+        with mock.patch.dict(sys.modules, {"pdf2image": pdf2image}):
+            extractor = PDFExtractor([os.path.join(self._temp_dir.name, "doc.pdf")], self._temp_dir.name, 95)
+
+        sizes = []
+        keys = []
+        for frame in (0, 1, 0):
+            dest_path = os.path.join(self._temp_dir.name, "{}-{}.jpg".format(len(keys), frame))
+            key, width, height = _save_stored_image(extractor, frame, dest_path, self.frame_store)
+            keys.append(key)
+            sizes.append((width, height))
+            with open(dest_path, "rb") as dest_file, open(extractor[frame], "rb") as page_file:
+                self.assertEqual(dest_file.read(), page_file.read())
+
+        self.assertEqual(sizes, [(30, 40), (31, 40), (30, 40)])
+        self.assertEqual(keys[0], keys[2])
+        self.assertNotEqual(keys[0], keys[1])
+
+
+@mock.patch('rq.get_current_job', mock.MagicMock())
+class SaveTaskToDbTest(test.TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(name="task", size=2000, mode="annotation", times_annotated=3)
+
+    def test_jobs_per_version(self):
+        users = [User.objects.create(username=name) for name in ("alice", "bob", "chris")]
+        segments = [["seq{}".format(i), 10, i * 10, i * 10 + 9, users] for i in range(20)]
+
+        # the exact number depends on the database backend and the query cache,
+        # but it mustn't grow with the number of segments (20 segments, 60 jobs here)
+        with CaptureQueriesContext(connection) as queries:
+            _save_task_to_db(self.task, segments)
+        self.assertLessEqual(len(queries), 10)
+
+        db_segments = Segment.objects.filter(task=self.task).order_by('start_frame')
+        self.assertEqual([(s.sequence_name, s.start_frame, s.stop_frame) for s in db_segments],
+            [(s[0], s[2], s[3]) for s in segments])
+        jobs = Job.objects.filter(segment__task=self.task)
+        self.assertEqual(jobs.count(), 60)
+        self.assertEqual(
+            {(j.segment.start_frame, j.version, j.assignee.username) for j in jobs},
+            {(s[2], v, u.username) for s in segments for v, u in enumerate(users)},
+        )
+
+    def test_split_on_segment_size(self):
+        self.task.segment_size = 300
+        self.task.overlap = 0
+
+        _save_task_to_db(self.task, [])
+
+        db_segments = Segment.objects.filter(task=self.task).order_by('start_frame')
+        self.assertEqual(len(db_segments), 7)
+        self.assertEqual(db_segments.last().stop_frame, 1999)
+        self.assertEqual(Job.objects.filter(segment__task=self.task, version=0, assignee=None).count(), 7)
+
+    def test_sequence_name_of_start_frame(self):
+        self.task.segment_size = 1000
+        self.task.overlap = 0
+        Image.objects.bulk_create([
+            Image(task=self.task, path="/data/seq{}/camera/left/frame_{:03d}_y.png".format(frame // 700, frame % 700),
+                frame=frame, width=1, height=1)
+            for frame in range(2000)
+        ])
+
+        _save_task_to_db(self.task, [])
+
+        db_segments = Segment.objects.filter(task=self.task).order_by('start_frame')
+        self.assertEqual([s.sequence_name for s in db_segments], ["seq0", "seq1"])
+
+    def test_append_segments(self):
+        self.task.segment_size = 300
+        self.task.overlap = 0
+        _save_task_to_db(self.task, [])
+        existing_ids = set(Segment.objects.filter(task=self.task).values_list('id', flat=True))
+
+        self.task.size = 2500
+        _save_task_to_db(self.task, [], start_frame=2000)
+
+        db_segments = Segment.objects.filter(task=self.task).order_by('start_frame')
+        self.assertTrue(existing_ids.issubset({s.id for s in db_segments}))
+        self.assertEqual([(s.start_frame, s.stop_frame) for s in db_segments[7:]], [(2000, 2299), (2300, 2499)])
+
+    def test_append_resumes_annotation(self):
+        self.task.segment_size = 300
+        self.task.overlap = 0
+        _save_task_to_db(self.task, [])
+        Job.objects.filter(segment__task=self.task).update(status=StatusChoice.COMPLETED)
+        self.task.status = StatusChoice.COMPLETED
+        self.task.save()
+
+        self.task.size = 2500
+        _save_task_to_db(self.task, [], start_frame=2000)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, StatusChoice.ANNOTATION)
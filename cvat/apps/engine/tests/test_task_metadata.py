@@ -0,0 +1,109 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django import test
+from django.core.cache import caches
+
+from cvat.apps.engine.ddln.task_metadata import get_task_metadata
+from cvat.apps.engine.ddln.utils import DdlnYamlWriter, get_annotation_request_id, get_sequence_id_mapping
+
+
+class TaskMetadataTest(test.SimpleTestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        settings_override = self.settings(INCOMING_TASKS_ROOT=self.root, DDLN_TASK_METADATA_CHECK_INTERVAL=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        caches["default"].clear()
+        self._write("T1/spo_1/ddln_id", "spo:1")
+        self._write("T1/seq1/ddln_id", "seq:1")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def _touch_directory(self, name):
+        # mtime resolution of some file systems is too coarse to notice a change made right after the first read
+        os.utime(str(self.root / name), ns=(0, 0))
+
+    def test_ddln_ids(self):
+        self.assertEqual(get_annotation_request_id("T1"), "spo:1")
+        self.assertEqual(get_sequence_id_mapping("T1"), {"spo_1": "spo:1", "seq1": "seq:1"})
+        self.assertIsNone(get_annotation_request_id("T2"))
+
+    def test_loaded_once_until_directory_changes(self):
+        load = mock.Mock(side_effect=lambda task_dir: sorted(p.name for p in task_dir.iterdir()))
+
+        self.assertEqual(get_task_metadata("T1", "names", load), ["seq1", "spo_1"])
+        self.assertEqual(get_task_metadata("T1", "names", load), ["seq1", "spo_1"])
+        self.assertEqual(load.call_count, 1)
+
+        self._write("T1/seq2/ddln_id", "seq:2")
+        self._touch_directory("T1")
+        self.assertEqual(get_task_metadata("T1", "names", load), ["seq1", "seq2", "spo_1"])
+        self.assertEqual(load.call_count, 2)
+
+    def test_nested_directory_changes_are_noticed(self):
+        self.assertEqual(get_sequence_id_mapping("T1")["seq1"], "seq:1")
+
+        (self.root / "T1/seq1/ddln_id").unlink()
+        self._touch_directory("T1/seq1")
+
+        self.assertNotIn("seq1", get_sequence_id_mapping("T1"))
+
+    def test_refresh(self):
+        self.assertEqual(get_annotation_request_id("T1"), "spo:1")
+        stat = os.stat(str(self.root / "T1/spo_1"))
+
+        self._write("T1/spo_1/ddln_id", "spo:2")
+        os.utime(str(self.root / "T1/spo_1"), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(get_annotation_request_id("T1"), "spo:1")
+        self.assertEqual(get_annotation_request_id("T1", refresh=True), "spo:2")
+
+    def test_export_reads_rewritten_ids(self):
+        self.assertEqual(get_sequence_id_mapping("T1")["seq1"], "seq:1")
+        stat = os.stat(str(self.root / "T1/seq1"))
+
+        self._write("T1/seq1/ddln_id", "seq:2")
+        os.utime(str(self.root / "T1/seq1"), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        with self.settings(DDLN_TASK_METADATA_CHECK_INTERVAL=60):
+            writer = DdlnYamlWriter("T1")
+        self.assertEqual(writer.id_by_seq_name["seq1"], "seq:2")
+        self.assertEqual(writer.annotation_request_id, "spo:1")
+
+    def test_only_given_directories_are_checked(self):
+        load = mock.Mock(side_effect=lambda task_dir: sorted(p.name for p in task_dir.glob("spo*/tracks/*")))
+        self._write("T1/spo_1/tracks/seq1.csv", "1")
+        self._write("T1/seq1/images/frame.png", "")
+
+        self.assertEqual(get_task_metadata("T1", "tracks", load, directories=("spo*/tracks",)), ["seq1.csv"])
+        self._write("T1/seq1/images/frame2.png", "")
+        self._touch_directory("T1/seq1/images")
+        self.assertEqual(get_task_metadata("T1", "tracks", load, directories=("spo*/tracks",)), ["seq1.csv"])
+        self.assertEqual(load.call_count, 1)
+
+        self._write("T1/spo_1/tracks/seq2.csv", "2")
+        self._touch_directory("T1/spo_1/tracks")
+        self.assertEqual(get_task_metadata("T1", "tracks", load, directories=("spo*/tracks",)),
+            ["seq1.csv", "seq2.csv"])
+
+    def test_directories_are_checked_once_in_interval(self):
+        load = mock.Mock(side_effect=lambda task_dir: sorted(p.name for p in task_dir.iterdir()))
+        get_task_metadata("T1", "names", load)
+
+        self._write("T1/seq2/ddln_id", "seq:2")
+        self._touch_directory("T1")
+        with self.settings(DDLN_TASK_METADATA_CHECK_INTERVAL=60), \
+                mock.patch("cvat.apps.engine.ddln.task_metadata.get_directory_state") as get_directory_state:
+            self.assertEqual(get_task_metadata("T1", "names", load), ["seq1", "spo_1"])
+        get_directory_state.assert_not_called()
+        self.assertEqual(load.call_count, 1)
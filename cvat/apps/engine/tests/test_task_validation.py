@@ -0,0 +1,146 @@
+import tempfile
+from unittest import mock
+
+from django import test
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from cvat.apps.engine.ddln.task_validation import get_cached_report, validate_task
+from cvat.apps.engine.ddln.tasks.spotter import SpotterTaskHandler
+from cvat.apps.engine.ddln.transports import CVATImporter, CsvDirectoryImporter
+from cvat.apps.engine.models import Job, JobCommit, Segment, Task
+from cvat.apps.engine.tests.test_rest_api import ForceLogin, create_db_users
+from cvat.apps.engine.tests.test_validation import _write_sequences
+
+SEQUENCE_NAMES = ["seq0", "seq1", "seq2", "seq3"]
+
+
+class _SequenceImporter(CsvDirectoryImporter):
+    """Reads annotations of the given sequences from CSV files instead of the database"""
+    def __init__(self, directory_path, sequence_names):
+        super().__init__(directory_path)
+        self._sequence_names = sequence_names
+
+    def iterate_frames(self):
+        return (f for f in super().iterate_frames() if f.sequence_name in self._sequence_names)
+
+
+class _TaskValidationMixin:
+    def _create_task(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        _write_sequences(self._temp_dir.name, sequence_count=len(SEQUENCE_NAMES))
+        caches["default"].clear()
+
+        self.task = Task.objects.create(name="task", size=15 * len(SEQUENCE_NAMES), mode="annotation")
+        self.jobs = {}
+        for i, sequence_name in enumerate(SEQUENCE_NAMES):
+            segment = Segment.objects.create(task=self.task, start_frame=i * 15, stop_frame=i * 15 + 14,
+                sequence_name=sequence_name)
+            self.jobs[sequence_name] = Job.objects.create(segment=segment, version=0)
+            JobCommit.objects.create(job=self.jobs[sequence_name], version=1)
+
+        self.loaded_sequences = []
+        patcher = mock.patch.object(CVATImporter, "for_task", side_effect=self._load_jobs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _load_jobs(self, task_id, job_selection):
+        sequence_names = set(
+            Job.objects.filter(id__in=job_selection["jobs"]).values_list("segment__sequence_name", flat=True))
+        self.loaded_sequences.append(sorted(sequence_names))
+        return _SequenceImporter(self._temp_dir.name, sequence_names), None
+
+    def _validate_all(self):
+        handler = SpotterTaskHandler()
+        reporter = handler.validate(handler.load_sequences(CsvDirectoryImporter(self._temp_dir.name)))
+        return reporter.get_text_report(reporter.severity.WARNING)
+
+
+class TaskValidationTest(_TaskValidationMixin, test.TestCase):
+    job_selection = {"jobs": [], "version": None}
+
+    def setUp(self):
+        self._create_task()
+
+    def _validate(self):
+        return validate_task(self.task.id, "spotter", {}, self.job_selection)
+
+    def test_report_is_cached(self):
+        self.assertIsNone(get_cached_report(self.task.id, "spotter", {}, self.job_selection))
+
+        report = self._validate()
+
+        self.assertEqual(report, self._validate_all())
+        self.assertEqual(get_cached_report(self.task.id, "spotter", {}, self.job_selection), report)
+        self.assertEqual(self.loaded_sequences, [SEQUENCE_NAMES])
+
+    def test_only_changed_sequences_are_validated(self):
+        self._validate()
+
+        JobCommit.objects.create(job=self.jobs["seq2"], version=2)
+        self.assertIsNone(get_cached_report(self.task.id, "spotter", {}, self.job_selection))
+        report = self._validate()
+
+        self.assertEqual(self.loaded_sequences, [SEQUENCE_NAMES, ["seq2"]])
+        self.assertEqual(report, self._validate_all())
+
+    def test_unchanged_task_is_not_loaded(self):
+        report = self._validate()
+
+        self.assertEqual(self._validate(), report)
+        self.assertEqual(self.loaded_sequences, [SEQUENCE_NAMES])
+
+
+class TaskValidateAPITestCase(_TaskValidationMixin, APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self._create_task()
+        self.task.owner = self.admin
+        self.task.save()
+
+    @classmethod
+    def setUpTestData(cls):
+        create_db_users(cls)
+
+    def _get_validate(self):
+        with ForceLogin(self.admin, self.client):
+            return self.client.get("/api/v1/tasks/{}/validate?task_type=spotter".format(self.task.id))
+
+    def test_report_is_polled(self):
+        # rq jobs run synchronously in tests, so the report is ready on the second request
+        response = self._get_validate()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        response = self._get_validate()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["report"], self._validate_all())
+
+        # the cached report is returned without a new rq job
+        response = self._get_validate()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["report"], self._validate_all())
+        self.assertEqual(self.loaded_sequences, [SEQUENCE_NAMES])
+
+    def test_changed_sequence_is_validated_again(self):
+        self._get_validate()
+        self._get_validate()
+        JobCommit.objects.create(job=self.jobs["seq1"], version=2)
+
+        self.assertEqual(self._get_validate().status_code, status.HTTP_202_ACCEPTED)
+        response = self._get_validate()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["report"], self._validate_all())
+        self.assertEqual(self.loaded_sequences, [SEQUENCE_NAMES, ["seq1"]])
+
+    def test_failed_validation(self):
+        rq_job = mock.Mock(is_finished=False, is_failed=True, exc_info="ValueError: broken annotations")
+        with mock.patch("django_rq.get_queue") as get_queue:
+            get_queue.return_value.fetch_job.return_value = rq_job
+            response = self._get_validate()
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.data, "ValueError: broken annotations")
+        rq_job.delete.assert_called_once_with()
@@ -0,0 +1,121 @@
+import io
+import os
+import tempfile
+import zipfile
+from unittest import TestCase
+
+from cvat.apps.engine.ddln.tasks.spotter import SpotterTaskHandler
+from cvat.apps.engine.ddln.transports import (CsvDirectoryExporter, CsvDirectoryImporter, CsvZipImporter,
+    CsvZipExporter, PackedDirectoryExporter, PackedDirectoryImporter, PackedZipExporter, PackedZipImporter,
+    convert, migrate_and_load)
+
+FRAMES = {
+    "seq2/frame_000_y.csv": "0.100000,0.100000,0.200000,0.200000,1,1\n",
+    "seq1/frame_001_y.csv": "0.300000,0.300000,0.400000,0.400000,1,1\n0.5,0.5,0.6,0.6,2,1\n",
+    "seq1/frame_000_y.csv": "0.300000,0.300000,0.400000,0.400000,1,1\n",
+    "seq10/frame_000_y.csv": "",
+}
+
+
+class _SizedImporter:
+    """CSV importer with known image dimensions, as CVAT importer provides them"""
+    def __init__(self, importer):
+        self._importer = importer
+
+    def iterate_frames(self):
+        for frame_reader in self._importer.iterate_frames():
+            frame_reader.image_width = 100
+            frame_reader.image_height = 100
+            yield frame_reader
+
+
+def _serialize(sequences):
+    return [
+        (s.name, [(f.name, f.index, [(b.left, b.top, b.right, b.bottom, b.class_id, b.track_id)
+            for b in f.objects]) for f in s.frames])
+        for s in sequences
+    ]
+
+
+def _make_archive():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        for path, content in FRAMES.items():
+            zip_file.writestr(path, content)
+    return archive
+
+
+class MigrateAndLoadTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.archive = _make_archive()
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_same_as_migrate_then_load(self):
+        handler = SpotterTaskHandler()
+        importer = _SizedImporter(CsvZipImporter(self.archive))
+        exporter = CsvDirectoryExporter(self._temp_dir.name)
+
+        sequences = migrate_and_load(importer, exporter, handler)
+
+        expected = list(SpotterTaskHandler().load_sequences(CsvDirectoryImporter(self._temp_dir.name)))
+        self.assertEqual(_serialize(sequences), _serialize(expected))
+        self.assertEqual([s.name for s in sequences], ["seq1", "seq2", "seq10"])
+        self.assertEqual(
+            handler.validate(sequences).get_json_report(),
+            SpotterTaskHandler().validate(expected).get_json_report(),
+        )
+
+
+class PackedTransportTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.packed_dir = os.path.join(self._temp_dir.name, "packed")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _load(self, importer):
+        return _serialize(SpotterTaskHandler().load_sequences(importer, 100, 100))
+
+    def test_directory_round_trip(self):
+        convert(CsvZipImporter(_make_archive()), PackedDirectoryExporter(self.packed_dir))
+        self.assertEqual(sorted(os.listdir(self.packed_dir)),
+            ["seq10_y.packed.csv", "seq1_y.packed.csv", "seq2_y.packed.csv"])
+
+        self.assertEqual(self._load(PackedDirectoryImporter(self.packed_dir)),
+            self._load(CsvZipImporter(_make_archive())))
+
+        archive = io.BytesIO()
+        convert(PackedDirectoryImporter(self.packed_dir), CsvZipExporter(archive))
+        with zipfile.ZipFile(archive) as zip_file:
+            self.assertEqual({name: zip_file.read(name).decode() for name in zip_file.namelist()}, FRAMES)
+
+    def test_migrate_into_zip(self):
+        archive = io.BytesIO()
+        handler = SpotterTaskHandler()
+        sequences = migrate_and_load(_SizedImporter(CsvZipImporter(_make_archive())),
+            PackedZipExporter(archive), handler)
+
+        self.assertEqual(self._load(PackedZipImporter(archive)), _serialize(sequences))
+
+    def test_sequences_are_written_one_by_one(self):
+        exporter = PackedDirectoryExporter(self.packed_dir)
+        with exporter:
+            with exporter.begin_frame("frame_000", "seq1") as frame_writer:
+                frame_writer.write_row((0.1, 0.1, 0.2, 0.2, 1, 1))
+            with exporter.begin_frame("frame_000", "seq2"):
+                pass
+            self.assertEqual(os.listdir(self.packed_dir), ["seq1_y.packed.csv"])
+            with exporter.begin_frame("frame_001", "seq1"):
+                pass
+
+        frames = [(f.sequence_name, f.name, list(f.iterate_rows()))
+            for f in PackedDirectoryImporter(self.packed_dir).iterate_frames()]
+        self.assertEqual(frames, [
+            ("seq1", "frame_000", [["0.1", "0.1", "0.2", "0.2", "1", "1"]]),
+            ("seq1", "frame_001", []),
+            ("seq2", "frame_000", []),
+        ])
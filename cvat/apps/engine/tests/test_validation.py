@@ -0,0 +1,163 @@
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+from cvat.apps.engine.ddln.tasks.models import Frame, Sequence, group_sequences
+from cvat.apps.engine.ddln.tasks.spotter import SpotterTaskHandler
+from cvat.apps.engine.ddln.tasks.spotter.models import LabeledBoundingBox
+from cvat.apps.engine.ddln.tasks.spotter.validation import (SpotterValidationReporter, validate,
+    validate_per_object)
+from cvat.apps.engine.ddln.transports import CsvDirectoryImporter
+
+
+def _write_sequences(base_dir, sequence_count=12, frame_count=15):
+    rng = random.Random(0)
+    for s in range(sequence_count):
+        sequence_dir = os.path.join(base_dir, "seq{}".format(s))
+        os.makedirs(sequence_dir)
+        for f in range(frame_count):
+            rows = []
+            for track_id in range(1, rng.randint(0, 3) + 1):
+                left, top = rng.uniform(-0.05, 0.9), rng.uniform(0, 0.9)
+                class_id = rng.choice(["1", "1", "1", "2", "7"])
+                rows.append("{:.6f},{:.6f},{:.6f},{:.6f},{},{}\n".format(
+                    left, top, left + 0.1, top + 0.1, class_id, rng.choice([track_id, track_id, 5])))
+            with open(os.path.join(sequence_dir, "frame_{:03d}_y.csv".format(f)), "w") as file:
+                file.write("".join(rows))
+
+
+class ParallelValidationTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        _write_sequences(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _validate_serially(self):
+        handler = SpotterTaskHandler()
+        sequences = list(handler.load_sequences(CsvDirectoryImporter(self._temp_dir.name)))
+        return validate(sequences, handler.reporter)
+
+    def test_same_report(self):
+        expected = self._validate_serially()
+        self.assertTrue(expected.has_violations())
+
+        for processes in (1, 3):
+            with self.subTest(processes=processes):
+                handler = SpotterTaskHandler()
+                sequences = handler.load_sequences(CsvDirectoryImporter(self._temp_dir.name))
+                reporter = handler.validate(sequences, processes=processes)
+
+                severity = reporter.severity.WARNING
+                self.assertEqual(reporter.get_json_report(severity), expected.get_json_report(severity))
+                self.assertEqual(reporter.get_text_report(severity), expected.get_text_report(severity))
+
+
+class SplitBySequenceTest(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        _write_sequences(self._temp_dir.name, sequence_count=4)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_split(self):
+        handler = SpotterTaskHandler()
+        reporter = handler.validate(handler.load_sequences(CsvDirectoryImporter(self._temp_dir.name)))
+
+        parts = reporter.split_by_sequence()
+
+        self.assertEqual(sorted(parts), ["seq0", "seq1", "seq2", "seq3"])
+        combined = SpotterValidationReporter()
+        for sequence_name, part in parts.items():
+            self.assertTrue(all(v[0] == sequence_name for v in part._violations))
+            self.assertEqual(part._frames_count_by_sequence, {sequence_name: 15})
+            combined.extend(part)
+        self.assertCountEqual(combined._violations, reporter._violations)
+        self.assertEqual(combined._frames_count_by_sequence, reporter._frames_count_by_sequence)
+
+class GroupSequencesTest(TestCase):
+    def test_frames_are_sorted(self):
+        frames = [("a", Frame("2", [])), ("a", Frame("1", [])), ("b", Frame("1", []))]
+
+        sequences = list(group_sequences(frames))
+
+        self.assertEqual([(s.name, [f.name for f in s.frames]) for s in sequences], [("a", ["1", "2"]), ("b", ["1"])])
+
+    def test_not_consecutive(self):
+        frames = [("a", Frame("1", [])), ("b", Frame("1", [])), ("a", Frame("2", []))]
+
+        with self.assertRaises(ValueError):
+            list(group_sequences(frames))
+
+
+def _random_box(rng, previous, track_id):
+    kind = rng.random()
+    if previous is not None and kind < 0.2:
+        # the same position or a move within the tolerance
+        delta = rng.choice([0, 1e-6, 9e-6, 2e-5])
+        box = LabeledBoundingBox(previous.left + delta, previous.top, previous.width, previous.height,
+            previous.class_id, track_id)
+    elif previous is not None and kind < 0.3:
+        # a jump to the other corner of the image
+        box = LabeledBoundingBox(1 - previous.right, 1 - previous.bottom, previous.width, previous.height,
+            previous.class_id, track_id)
+    elif kind < 0.35:
+        # inverted or out of bounds
+        box = LabeledBoundingBox(rng.uniform(-0.2, 1.2), rng.uniform(-0.2, 1.2), rng.uniform(-0.1, 0.1),
+            rng.uniform(-0.1, 0.1), "1", track_id)
+    else:
+        size = rng.choice([0.001, 0.01, 0.1])
+        box = LabeledBoundingBox(rng.uniform(0, 0.9), rng.uniform(0, 0.9), size, size, "1", track_id)
+    if rng.random() < 0.05:
+        box.class_id = rng.choice(["3", "5", "42"])
+    return box
+
+
+def _random_sequence(rng, name, frame_count):
+    track_ids = ["1", "2", "3", "4", "6", "x"]
+    frames = []
+    previous_by_track = {}
+    for f in range(frame_count):
+        objects = []
+        for track_id in rng.sample(track_ids, rng.randint(0, 4)):
+            if rng.random() < 0.05:
+                objects.append(_random_box(rng, None, track_id))
+            box = _random_box(rng, previous_by_track.get(track_id), track_id)
+            previous_by_track[track_id] = box
+            objects.append(box)
+        frame = Frame("frame_{:03d}".format(f), objects)
+        frame.index = f
+        frames.append(frame)
+    return Sequence(name, frames)
+
+
+class VectorizedSpotterValidationTest(TestCase):
+    def _check(self, sequences, **kwargs):
+        expected = validate_per_object(sequences, SpotterValidationReporter(), **kwargs)
+        actual = validate(sequences, SpotterValidationReporter(), **kwargs)
+        self.assertEqual(actual._violations, expected._violations)
+        self.assertEqual(actual._frames_count_by_sequence, expected._frames_count_by_sequence)
+
+    def test_same_violations(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            sequences = [_random_sequence(rng, "seq{}".format(s), rng.randint(0, 40)) for s in range(3)]
+            with self.subTest(seed=seed):
+                self._check(sequences)
+                self._check(sequences, jump_threshold=2)
+
+    def test_empty_sequences(self):
+        self._check([Sequence("seq1", []), Sequence("seq2", [Frame("frame_000", [])])])
+
+    def test_last_duplicate_is_compared(self):
+        first = LabeledBoundingBox(0.1, 0.1, 0.1, 0.1, "1", "1")
+        duplicate = LabeledBoundingBox(0.5, 0.5, 0.1, 0.1, "1", "1")
+        moved = LabeledBoundingBox(0.5, 0.5, 0.1, 0.1, "1", "1")
+        sequence = Sequence("seq1", [Frame("frame_000", [first, duplicate]), Frame("frame_001", [moved])])
+
+        self._check([sequence])
+        messages = [v[3] for v in validate([sequence])._violations]
+        self.assertIn("Bounding box has the same position as on the previous frame", messages)
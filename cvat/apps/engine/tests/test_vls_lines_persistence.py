@@ -1,7 +1,15 @@
+import io
+import math
+import random
+from itertools import combinations
 from unittest import TestCase
 
-from cvat.apps.engine.ddln.geometry import Point, Line
+from cvat.apps.engine.ddln.geometry import Point, Line, get_angle_between
+from cvat.apps.engine.ddln.tasks.vls_lines.models import (ANGLE_THRESHOLD, Runway, calculate_vanishing_points,
+    find_disorder)
+from cvat.apps.engine.ddln.tasks.vls_lines.handler import VlsLinesTaskHandler
 from cvat.apps.engine.ddln.tasks.vls_lines.persistence.csv import as_row, from_row
+from cvat.apps.engine.ddln.transports.csv import FrameReader
 
 # tests fail for now due to rounding on export ( distance = format(distance, ".3f") )
 WIDTH = HEIGHT = 100
@@ -65,3 +73,157 @@ class SerializeTest(TestCase):
                     second = from_row([str(angle), str(distance)], WIDTH, HEIGHT)
 
                     self.assertEqual(first, second)
+
+
+class RecordingReporter:
+    def __init__(self):
+        self.messages = []
+
+    def report_not_crossing(self, error):
+        self.messages.append(("not crossing", error))
+
+    def report_lon_disorder(self):
+        self.messages.append(("lon disorder",))
+
+    def report_lat_disorder(self):
+        self.messages.append(("lat disorder",))
+
+
+def _reference_vanishing_point(lines):
+    # per-object implementation the vectorized one is checked against
+    combs = [(a.intersect(b), get_angle_between(a.get_angle(), b.get_angle())) for a, b in combinations(lines, 2)]
+    points = [p for p, _ in combs if p]
+    angles = [min(angle, math.pi - angle) for _, angle in combs]
+    if not points or max(angles) <= ANGLE_THRESHOLD:
+        return None
+    return Point(sum(p.x for p in points) / len(points), sum(p.y for p in points) / len(points))
+
+
+def _reference_disorder(runway):
+    # per-object implementation the vectorized one is checked against, all longitudinal lines are set
+    def get_points_side(points, line):
+        sides = [-1 if d < 0 else (1 if d > 0 else 0) for d in (p.signed_distance_to(line) for p in points)]
+        return sides[0], all(side == sides[0] or side == 0 for side in sides)
+
+    lon_disorder = False
+    lat_lines = [runway.start_line, runway.designator_line]
+    if all(lat_lines):
+        left_points = [line.intersect(runway.left_line) for line in lat_lines]
+        right_points = [line.intersect(runway.right_line) for line in lat_lines]
+        if any(p is None for p in left_points + right_points):
+            lon_disorder = True
+        else:
+            left_side, is_left_correct = get_points_side(left_points, runway.center_line)
+            right_side, is_right_correct = get_points_side(right_points, runway.center_line)
+            lon_disorder = not (is_left_correct and is_right_correct and left_side == -right_side)
+
+    lat_disorder = False
+    original = [runway.end_line, runway.designator_line, runway.start_line]
+    distant_point = runway.lon_vanishing_point
+    if all(original) and distant_point:
+        final = sorted(original, key=lambda line: distant_point.distance_to(runway.center_line.intersect(line)))
+        lat_disorder = final != original
+    return lon_disorder, lat_disorder
+
+
+def _random_line(rng):
+    if rng.random() < 0.2:
+        return None
+    return Line.by_point_and_angle(Point(rng.uniform(0, 1000), rng.uniform(0, 1000)), rng.uniform(0, math.pi))
+
+
+def _runway_through(vanishing_point, angles, offsets):
+    lon = [Line.by_point_and_angle(vanishing_point, phi) for phi in angles]
+    lat = [Line(0, 1, -y) for y in offsets]
+    return Runway("1", lon[0], lon[2], lon[1], lat[0], lat[2], lat[1])
+
+
+class RunwayGeometryTest(TestCase):
+    def test_vanishing_points_parity(self):
+        rng = random.Random(0)
+        runways = [Runway(str(i), *(_random_line(rng) for _ in range(6))) for i in range(200)]
+
+        calculate_vanishing_points(runways)
+
+        for runway in runways:
+            lon_lines = [l for l in (runway.left_line, runway.center_line, runway.right_line) if l]
+            lat_lines = [runway.start_line, runway.designator_line, runway.end_line]
+            expected_lon = _reference_vanishing_point(lon_lines) if len(lon_lines) > 1 else None
+            expected_lat = _reference_vanishing_point(lat_lines) if all(lat_lines) else None
+            for actual, expected in ((runway.lon_vanishing_point, expected_lon),
+                    (runway.lat_vanishing_point, expected_lat)):
+                with self.subTest(runway=runway.id):
+                    if expected is None:
+                        self.assertIsNone(actual)
+                    else:
+                        self.assertAlmostEqual(actual.x, expected.x, delta=1e-6 * max(1, abs(expected.x)))
+                        self.assertAlmostEqual(actual.y, expected.y, delta=1e-6 * max(1, abs(expected.y)))
+
+    def test_disorder_parity(self):
+        rng = random.Random(0)
+        runways = []
+        for i in range(300):
+            angles = [rng.uniform(1.2, 1.9) for _ in range(3)]
+            offsets = [rng.uniform(0, 1000) for _ in range(3)]
+            runway = _runway_through(Point(rng.uniform(0, 1000), rng.uniform(-200, 200)), angles, offsets)
+            if i % 5 == 0:
+                runway.start_line = runway.designator_line = runway.end_line = None
+            runways.append(runway)
+        calculate_vanishing_points(runways)
+
+        expected = [_reference_disorder(runway) for runway in runways]
+
+        self.assertEqual(find_disorder(runways), expected)
+        # both orders are covered
+        self.assertEqual({lon for lon, _ in expected}, {False, True})
+        self.assertEqual({lat for _, lat in expected}, {False, True})
+
+    def test_crossing_lines(self):
+        runway = _runway_through(Point(500, 100), (1.4, 1.57, 1.74), (900, 600, 400))
+        reporter = RecordingReporter()
+
+        runway.calculate_vanishing_points(reporter)
+        runway.fix_order(reporter)
+
+        self.assertAlmostEqual(runway.lon_vanishing_point.x, 500)
+        self.assertAlmostEqual(runway.lon_vanishing_point.y, 100)
+        self.assertIsNone(runway.lat_vanishing_point)
+        self.assertEqual(reporter.messages, [])
+
+    def test_not_crossing_lines(self):
+        runway = _runway_through(Point(500, 100), (1.4, 1.57, 1.74), (900, 600, 400))
+        runway.center_line = Line(runway.center_line.a, runway.center_line.b, runway.center_line.c + 100)
+        reporter = RecordingReporter()
+
+        runway.calculate_vanishing_points(reporter)
+
+        self.assertEqual([m[0] for m in reporter.messages], ["not crossing"])
+
+    def test_disorder(self):
+        runway = _runway_through(Point(500, 100), (1.4, 1.57, 1.74), (900, 600, 400))
+        runway.calculate_vanishing_points(RecordingReporter())
+        runway.left_line, runway.center_line = runway.center_line, runway.left_line
+        runway.start_line, runway.end_line = runway.end_line, runway.start_line
+        reporter = RecordingReporter()
+
+        runway.fix_order(reporter)
+
+        self.assertEqual(reporter.messages, [("lon disorder",), ("lat disorder",)])
+
+
+class VlsLinesTaskHandlerTest(TestCase):
+    def test_csv_files_are_closed_after_parsing(self):
+        runway = _runway_through(Point(50, 10), (1.4, 1.57, 1.74), (90, 60, 40))
+        lines = (runway.left_line, runway.right_line, runway.center_line,
+            runway.start_line, runway.end_line, runway.designator_line)
+        row = [runway.id] + [value for line in lines for value in as_row(line, WIDTH, HEIGHT)]
+        files = [io.BytesIO((",".join(map(str, row)) + "\n").encode()) for _ in range(3)]
+        readers = [FrameReader(f, "frame_{:03d}".format(i), "seq1") for i, f in enumerate(files)]
+        for reader in readers:
+            reader.image_width, reader.image_height = WIDTH, HEIGHT
+
+        frame_reader, runways = next(VlsLinesTaskHandler().iterate_sequence_objects(iter(readers)))
+
+        self.assertIs(frame_reader, readers[0])
+        self.assertEqual([r.id for r in runways], ["1"])
+        self.assertTrue(all(f.closed for f in files))
@@ -0,0 +1,66 @@
+import json
+import pathlib
+from io import BytesIO
+from unittest import TestCase
+
+import msgpack
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+
+from cvat.apps.engine.wire_format import (AnnotationMsgPackParser, AnnotationMsgPackRenderer,
+    pack_annotations, unpack_annotations)
+
+data_dir = pathlib.Path(__file__).parent / "data"
+
+
+class AnnotationWireFormatTest(TestCase):
+    data = {
+        "version": 3,
+        "tags": [{"frame": 0, "label_id": 1, "group": 0, "attributes": []}],
+        "shapes": [{"type": "rectangle", "frame": 0, "label_id": 1, "points": [1.5, 2.25, 100.1, 2000.7],
+            "attributes": [{"spec_id": 1, "value": "a"}]}],
+        "tracks": [{"frame": 0, "label_id": 1, "attributes": [], "shapes": [
+            {"type": "points", "frame": 0, "outside": False, "points": [0.1, 0.2], "attributes": []},
+            {"type": "points", "frame": 5, "outside": True, "points": [3.0, 4.0], "attributes": []},
+        ]}],
+    }
+
+    def test_round_trip(self):
+        self.assertEqual(unpack_annotations(pack_annotations(self.data)), self.data)
+
+    def test_points_are_packed_float32(self):
+        document = msgpack.unpackb(pack_annotations(self.data), raw=False)
+
+        self.assertEqual(len(document["shapes"][0]["points"]), 4 * 4)
+        self.assertEqual(len(document["tracks"][0]["shapes"][1]["points"]), 2 * 4)
+        self.assertEqual(self.data["shapes"][0]["points"], [1.5, 2.25, 100.1, 2000.7])
+
+    def test_other_data(self):
+        renderer = AnnotationMsgPackRenderer()
+        parser = AnnotationMsgPackParser()
+
+        content = renderer.render({"detail": "Not found."})
+
+        self.assertEqual(parser.parse(BytesIO(content)), {"detail": "Not found."})
+        self.assertEqual(renderer.render(None), b"")
+
+    def test_error_response(self):
+        errors = {"shapes": [{"points": ["A valid number is required."]}]}
+        response = Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        content = AnnotationMsgPackRenderer().render(errors, renderer_context={"response": response})
+
+        self.assertEqual(msgpack.unpackb(content, raw=False), errors)
+
+    def test_client_fixture(self):
+        # cvat-core/tests/internal/wire-format.js checks that the client encodes the same bytes
+        data = json.loads((data_dir / "annotations.json").read_text())
+        content = (data_dir / "annotations.msgpack").read_bytes()
+
+        self.assertEqual(AnnotationMsgPackParser().parse(BytesIO(content)), data)
+        self.assertEqual(pack_annotations(data), content)
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            AnnotationMsgPackParser().parse(BytesIO(b"\xc1"))
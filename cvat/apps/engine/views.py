@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 import json
+import mimetypes
 import os
 import os.path as osp
 import re
@@ -12,7 +13,7 @@ from datetime import datetime
 from tempfile import mkstemp
 
 from django.views.generic import RedirectView
-from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponse
+from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponse, HttpResponseRedirect
 from django.shortcuts import render
 from django.conf import settings
 from rest_framework.reverse import reverse
@@ -29,18 +30,24 @@ from django_filters import rest_framework as filters
 import django_rq
 from django.db import IntegrityError, transaction
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 
 
 from . import annotation, task, models
+from .wire_format import ANNOTATION_PARSER_CLASSES, ANNOTATION_RENDERER_CLASSES, compress_response
+from .conditional import (get_frames_meta_etag, get_job_annotations_etag, get_not_modified_response,
+    get_task_annotations_etag, make_etag, set_etag, set_immutable)
 from cvat.settings.base import JS_3RDPARTY, CSS_3RDPARTY
 from cvat.apps.authentication.decorators import login_required
 from .ddln.grey_export import export_annotation
 from .ddln.multiannotation import request_extra_annotation, FailedAssignmentError, merge, accept_segments
 from .ddln.statistics import get_statistics
 from .ddln.tasks import create_task_handler, guess_task_type
-from .ddln.transports import CVATImporter
+from .ddln.task_validation import get_cached_report, get_validation_id, validate_task
+from .external_frame_cache import get_external_frame_cache, get_external_frame_url, schedule_frame_prefetch
+from .frame_store import get_frame_store, read_manifest
 from .log import slogger, clogger
-from cvat.apps.engine.models import StatusChoice, Task, Job, Plugin, Segment
+from cvat.apps.engine.models import StatusChoice, Task, Job, Plugin
 from cvat.apps.engine.serializers import (
     ExternalImageSerializer,
     TaskSerializer, UserSerializer, RequestExtraAnnotationSerializer,
@@ -418,14 +425,13 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         task_queryset = self.filter_queryset(self.get_queryset())
-        task_ids = self.paginate_queryset(task_queryset.values_list('id', flat=True))
-        segments = Segment.objects.filter(task_id__in=tuple(task_ids)).with_sequence_name()
-        sequence_by_segment_id = {s.id: s.sequence_name for s in segments}
+        tasks = self.paginate_queryset(task_queryset.values_list('id', 'name'))
+        # incoming files edited in place aren't noticed by the metadata cache until it's refreshed
+        refresh = self.request.query_params.get('refresh_metadata') == '1'
         extra_info_by_task_id = {}
-        for tid in task_ids:
-            extra_info = get_extra_info(tid)
+        for tid, task_name in tasks:
+            extra_info = get_extra_info(tid, task_name, refresh)
             extra_info_by_task_id[tid] = extra_info
-        context['sequence_by_segment_id'] = sequence_by_segment_id
         context['extra_info_by_task_id'] = extra_info_by_task_id
         context['request'] = self.request
         return context
@@ -439,7 +445,20 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         task_dirname = instance.get_task_dirname()
         super().perform_destroy(instance)
+        frame_store_keys = read_manifest(task_dirname)
         shutil.rmtree(task_dirname, ignore_errors=True)
+        frame_store = get_frame_store()
+        if frame_store:
+            frame_store.release(frame_store_keys)
+
+    def retrieve(self, request, pk=None):
+        # details depend on jobs, assignees and incoming files, the etag only saves the transfer
+        serializer = self.get_serializer(self.get_object())
+        etag = make_etag("task", serializer.data)
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        return set_etag(Response(serializer.data), etag)
 
     @swagger_auto_schema(method='get', operation_summary='Returns a list of jobs for a specific task',
         responses={'200': JobSerializer(many=True)})
@@ -456,7 +475,8 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
     @action(detail=True, methods=['POST'], serializer_class=TaskDataSerializer)
     def data(self, request, pk):
         """
-        These data cannot be changed later
+        These data cannot be changed later. Images posted to a task which already
+        has data are appended to it as new frames, segments and jobs
         """
         db_task = self.get_object() # call check_object_permissions as well
         external_files_serializer = ExternalFilesSerializer(data=request.data['external_files'], context=dict(task=db_task))
@@ -470,7 +490,7 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
         if serializer.is_valid(raise_exception=True):
             external_files_serializer.save()
             serializer.save()
-            task.create(db_task.id, serializer.data, options_serializer.validated_data)
+            task.create(db_task.id, serializer.new_data, options_serializer.validated_data)
             return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
     @swagger_auto_schema(method='get', operation_summary='Method returns annotations for a specific task')
@@ -480,7 +500,9 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
             enum=['create', 'update', 'delete'])])
     @swagger_auto_schema(method='delete', operation_summary='Method deletes all annotations for a specific task')
     @action(detail=True, methods=['GET', 'DELETE', 'PUT', 'PATCH'],
-        serializer_class=LabeledDataSerializer)
+        serializer_class=LabeledDataSerializer, renderer_classes=ANNOTATION_RENDERER_CLASSES,
+        parser_classes=ANNOTATION_PARSER_CLASSES)
+    @method_decorator(compress_response)
     def annotations(self, request, pk):
         self.get_object() # force to call check_object_permissions
         params_serializer = JobSelectionSerializer(data=request.query_params)
@@ -488,10 +510,17 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
         job_selection = params_serializer.save()
 
         if request.method == 'GET':
+            # the etag is taken before the data, so a concurrent change can only make it outdated
+            etag = get_task_annotations_etag(pk, request.accepted_renderer.format)
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
             data = annotation.get_task_data(pk, request.user)
             serializer = LabeledDataSerializer(data=data)
             if serializer.is_valid(raise_exception=True):
-                return Response(serializer.data)
+                response = set_etag(Response(serializer.data), etag)
+                patch_vary_headers(response, ('Accept',))
+                return response
         elif request.method == 'PUT':
             if request.query_params.get("format", ""):
                 return load_data_proxy(
@@ -522,9 +551,16 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
                     return Response(data=str(e), status=status.HTTP_400_BAD_REQUEST)
                 return Response(data)
 
-    @swagger_auto_schema(method='get', operation_summary='Method returns validation report for a specific task')
+    @swagger_auto_schema(method='get', operation_summary='Method returns validation report for a specific task',
+        responses={'202': openapi.Response(description='Validation has been started'),
+            '201': openapi.Response(description='Validation report is ready')})
     @action(detail=True, methods=['GET'])
     def validate(self, request, pk):
+        """
+        Validation of a large task cannot be performed within one request.
+        First request starts validation process, repeat the request until the report is ready (code 201).
+        Reports are cached, only sequences changed since the previous validation are validated again.
+        """
         self.get_object() # force to call check_object_permissions
 
         params_serializer = TaskValidateSerializer(data=request.query_params)
@@ -535,13 +571,31 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
         options.pop('version')
         options.pop('jobs')
 
-        importer, _ = CVATImporter.for_task(pk, job_selection)
-        handler = create_task_handler(task_type)
-        sequences = handler.load_sequences(importer)
-        reporter = handler.validate(sequences, **options)
-        report = reporter.get_text_report(reporter.severity.WARNING)
+        queue = django_rq.get_queue("default")
+        rq_id = "/api/v1/tasks/{}/validate/{}".format(pk, get_validation_id(pk, task_type, options, job_selection))
+        rq_job = queue.fetch_job(rq_id)
+        if rq_job:
+            if rq_job.is_finished:
+                report = rq_job.result
+                rq_job.delete()
+                return Response(data={"report": report}, status=status.HTTP_201_CREATED)
+            elif rq_job.is_failed:
+                exc_info = str(rq_job.exc_info)
+                rq_job.delete()
+                return Response(data=exc_info, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            else:  # validation is still in progress
+                return Response(status=status.HTTP_202_ACCEPTED)
 
-        return Response(data={"report": report}, status=status.HTTP_200_OK)
+        report = get_cached_report(pk, task_type, options, job_selection)
+        if report is not None:
+            return Response(data={"report": report}, status=status.HTTP_201_CREATED)
+
+        queue.enqueue_call(
+            func=validate_task,
+            args=(pk, task_type, options, job_selection),
+            job_id=rq_id,
+        )
+        return Response(status=status.HTTP_202_ACCEPTED)
 
     @action(detail=True, methods=['POST'], url_path='grey-export')
     def grey_export(self, request, pk):
@@ -762,8 +816,12 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
     @action(detail=True, methods=['GET'], serializer_class=ImageMetaSerializer,
         url_path='frames/meta')
     def data_info(self, request, pk):
+        db_task = self.get_object() # call check_object_permissions as well
+        etag = get_frames_meta_etag(db_task)
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
         try:
-            db_task = self.get_object() # call check_object_permissions as well
             meta_cache_file = open(db_task.get_image_meta_cache_path())
         except OSError:
             task.make_image_meta_cache(db_task)
@@ -772,7 +830,7 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
         data = literal_eval(meta_cache_file.read())
         serializer = ImageMetaSerializer(many=True, data=data['original_size'])
         if serializer.is_valid(raise_exception=True):
-            return Response(serializer.data)
+            return set_etag(Response(serializer.data), etag)
 
     @action(detail=True, methods=['GET'], serializer_class=ImageMetaSerializer, url_path='frames/external')
     def get_external_frames(self, request, pk):
@@ -783,23 +841,52 @@ class TaskViewSet(auth.TaskGetQuerySetMixin, viewsets.ModelViewSet):
         return Response(data)
 
     @swagger_auto_schema(method='get', manual_parameters=[openapi.Parameter('frame', openapi.IN_PATH, required=True,
-            description="A unique integer value identifying this frame", type=openapi.TYPE_INTEGER)],
+            description="A unique integer value identifying this frame", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('quality', openapi.IN_QUERY, required=False, type=openapi.TYPE_STRING,
+                enum=['original', 'preview'], description="Use 'preview' to get the smallest downscaled copy of the frame"),
+            openapi.Parameter('size', openapi.IN_QUERY, required=False, type=openapi.TYPE_INTEGER,
+                description="Get the smallest downscaled copy of the frame which is at least the given size")],
         operation_summary='Method returns a specific frame for a specific task',
         responses={'200': openapi.Response(description='frame')})
     @action(detail=True, methods=['GET'], serializer_class=None,
         url_path='frames/(?P<frame>\d+)')
     def frame(self, request, pk, frame):
+        quality = request.query_params.get('quality', 'original').lower()
+        if quality not in ('original', 'preview'):
+            raise serializers.ValidationError(
+                "Unexpected parameter 'quality' specified for the request")
+        size = request.query_params.get('size', None)
+        if size is not None and not size.isdigit():
+            raise serializers.ValidationError(
+                "Unexpected parameter 'size' specified for the request")
+
         try:
             # Follow symbol links if the frame is a link on a real image otherwise
             # mimetype detection inside sendfile will work incorrectly.
             db_task = self.get_object()
-            path = os.path.realpath(db_task.get_frame_path(frame))
-            return sendfile(request, path)
+            if db_task.external:
+                return self._external_frame(request, db_task, frame)
+            preview_size = None
+            if size is not None or quality == 'preview':
+                preview_size = db_task.choose_preview_size(int(size) if size else None)
+            if preview_size is not None:
+                path = db_task.get_preview_frame_path(frame, preview_size)
+            else:
+                path = db_task.get_frame_path(frame)
+            return set_immutable(sendfile(request, os.path.realpath(path)))
         except Exception as e:
             slogger.task[pk].error(
                 "cannot get frame #{}".format(frame), exc_info=True)
             return HttpResponseBadRequest(str(e))
 
+    @staticmethod
+    def _external_frame(request, db_task, frame):
+        url = get_external_frame_url(db_task.image_set.get(frame=frame))
+        cache = get_external_frame_cache()
+        if cache is None:
+            return HttpResponseRedirect(url)
+        return sendfile(request, cache.get(url), mimetype=mimetypes.guess_type(url)[0])
+
     @swagger_auto_schema(method='get', operation_summary='Export task as a dataset in a specific format',
         manual_parameters=[openapi.Parameter('action', in_=openapi.IN_QUERY,
                 required=False, type=openapi.TYPE_STRING, enum=['download']),
@@ -893,6 +980,13 @@ class JobViewSet(viewsets.GenericViewSet,
 
         return [perm() for perm in permissions]
 
+    def retrieve(self, request, pk):
+        db_job = self.get_object()
+        if db_job.segment.task.external:
+            schedule_frame_prefetch(db_job)
+        serializer = self.get_serializer(db_job)
+        return Response(serializer.data)
+
     def perform_update(self, serializer):
         job = serializer.instance
         current_status = job.status
@@ -910,12 +1004,20 @@ class JobViewSet(viewsets.GenericViewSet,
             operation_summary='Method performs a partial update of annotations in a specific job')
     @swagger_auto_schema(method='delete', operation_summary='Method deletes all annotations for a specific job')
     @action(detail=True, methods=['GET', 'DELETE', 'PUT', 'PATCH'],
-        serializer_class=LabeledDataSerializer)
+        serializer_class=LabeledDataSerializer, renderer_classes=ANNOTATION_RENDERER_CLASSES,
+        parser_classes=ANNOTATION_PARSER_CLASSES)
+    @method_decorator(compress_response)
     def annotations(self, request, pk):
         self.get_object() # force to call check_object_permissions
         if request.method == 'GET':
+            etag = get_job_annotations_etag(pk, request.accepted_renderer.format)
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
             data = annotation.get_job_data(pk, request.user)
-            return Response(data)
+            response = set_etag(Response(data), etag)
+            patch_vary_headers(response, ('Accept',))
+            return response
         elif request.method == 'PUT':
             if request.query_params.get("format", ""):
                 return load_data_proxy(
@@ -1046,16 +1148,20 @@ class PluginViewSet(viewsets.ModelViewSet):
         pass
 
 
-@cached("extra_info", 60*15)
-def get_extra_info(task_id):
-    task = models.Task.objects.prefetch_related("label_set").get(pk=task_id)
-    task_type = guess_task_type(task)
+def get_extra_info(task_id, task_name, refresh=False):
+    task_type = get_task_type(task_id)
     if task_type is not None:
         handler = create_task_handler(task_type)
-        return handler.get_extra_info(task)
+        return handler.get_extra_info(task_name, refresh)
     return None
 
 
+@cached("task_type", 60*15)
+def get_task_type(task_id):
+    task = models.Task.objects.prefetch_related("label_set").get(pk=task_id)
+    return guess_task_type(task)
+
+
 def rq_handler(job, exc_type, exc_value, tb):
     job.exc_info = "".join(
         traceback.format_exception_only(exc_type, exc_value))
@@ -0,0 +1,122 @@
+"""Compact encoding of annotations.
+
+The msgpack document has the same structure as the JSON one, except that points of shapes and
+tracked shapes are binary strings of little-endian float32 values.
+"""
+import struct
+
+import msgpack
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import decorator_from_middleware
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MSGPACK_MEDIA_TYPE = 'application/x-msgpack'
+
+
+def pack_annotations(data):
+    return msgpack.packb(_map_points(data, _pack_points), use_bin_type=True)
+
+
+def unpack_annotations(content):
+    return _map_points(msgpack.unpackb(content, raw=False), _unpack_points)
+
+
+def _pack_points(points):
+    return struct.pack('<{}f'.format(len(points)), *points)
+
+
+def _unpack_points(points):
+    if not isinstance(points, bytes):
+        return points
+    values = struct.unpack('<{}f'.format(len(points) // 4), points)
+    # float32 has 7 significant digits, the rest are artifacts of the conversion
+    return [float(format(v, '.7g')) for v in values]
+
+
+def _map_points(data, convert):
+    """Returns a copy of annotations with points converted, anything else is returned as is"""
+    if not isinstance(data, dict) or not ('shapes' in data or 'tracks' in data):
+        return data
+    data = dict(data)
+    if 'shapes' in data:
+        data['shapes'] = [_map_shape_points(shape, convert) for shape in data['shapes']]
+    if 'tracks' in data:
+        data['tracks'] = [
+            dict(track, shapes=[_map_shape_points(shape, convert) for shape in track.get('shapes', [])])
+            for track in data['tracks']
+        ]
+    return data
+
+
+def _map_shape_points(shape, convert):
+    if 'points' not in shape:
+        return shape
+    return dict(shape, points=convert(shape['points']))
+
+
+class AnnotationMsgPackRenderer(BaseRenderer):
+    media_type = MSGPACK_MEDIA_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        response = (renderer_context or {}).get('response')
+        if response is not None and response.status_code >= 400:
+            # validation errors of annotations have the same keys, but messages instead of points
+            return msgpack.packb(data, use_bin_type=True)
+        return pack_annotations(data)
+
+
+class AnnotationMsgPackParser(BaseParser):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return unpack_annotations(stream.read())
+        except (ValueError, TypeError, struct.error) as e:
+            raise ParseError('msgpack parse error - {}'.format(e))
+
+
+# the annotation endpoints accept and return msgpack in addition to the default formats
+ANNOTATION_RENDERER_CLASSES = api_settings.DEFAULT_RENDERER_CLASSES + [AnnotationMsgPackRenderer]
+ANNOTATION_PARSER_CLASSES = api_settings.DEFAULT_PARSER_CLASSES + [AnnotationMsgPackParser]
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compresses responses with brotli if the package is installed and the client accepts it, otherwise with gzip"""
+    def process_response(self, request, response):
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is None or 'br' not in accept_encoding or not self._can_compress(response):
+            return super().process_response(request, response)
+
+        compressed_content = brotli.compress(response.content, quality=5)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response['Content-Length'] = str(len(response.content))
+        # the representation is different, but the same content, like GZipMiddleware does
+        if response.has_header('ETag') and response['ETag'].startswith('"'):
+            response['ETag'] = 'W/' + response['ETag']
+        response['Content-Encoding'] = 'br'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    @staticmethod
+    def _can_compress(response):
+        return (not response.streaming and len(response.content) >= 200
+            and not response.has_header('Content-Encoding'))
+
+
+compress_response = decorator_from_middleware(CompressionMiddleware)
@@ -404,6 +404,36 @@ os.makedirs(DATA_ROOT, exist_ok=True)
 SHARE_ROOT = os.path.join(BASE_DIR, 'share')
 os.makedirs(SHARE_ROOT, exist_ok=True)
 
+# How files from the share get into a task: 'copy', 'hardlink', 'reflink' or 'symlink'.
+# Linking modes fall back to copying if the link cannot be created.
+SHARE_IMPORT_MODE = os.environ.get('SHARE_IMPORT_MODE', 'copy')
+SHARE_IMPORT_THREADS = int(os.environ.get('SHARE_IMPORT_THREADS', 8))
+
+# Number of concurrent connections used to download remote files of a task
+REMOTE_FILES_POOL_SIZE = int(os.environ.get('REMOTE_FILES_POOL_SIZE', 8))
+
+# Content-addressed store of encoded frames shared between tasks.
+# Tasks hard link frames from it, so it has to be on the same file system as DATA_ROOT.
+FRAME_STORE_ROOT = None
+if 'yes' == os.environ.get('FRAME_STORE', 'no'):
+    FRAME_STORE_ROOT = os.path.join(DATA_ROOT, 'frame_store')
+    os.makedirs(FRAME_STORE_ROOT, exist_ok=True)
+
+# Local cache of frames of external tasks, the least recently used frames are
+# removed when the cache is bigger than EXTERNAL_FRAME_CACHE_SIZE (in megabytes)
+EXTERNAL_FRAME_CACHE_ROOT = None
+EXTERNAL_FRAME_CACHE_SIZE = int(os.environ.get('EXTERNAL_FRAME_CACHE_SIZE', 10 * 1024)) * 1024 * 1024
+if 'yes' == os.environ.get('EXTERNAL_FRAME_CACHE', 'no'):
+    EXTERNAL_FRAME_CACHE_ROOT = os.path.join(DATA_ROOT, 'external_frame_cache')
+    os.makedirs(EXTERNAL_FRAME_CACHE_ROOT, exist_ok=True)
+
+# Number of processes validating sequences of DDLN tasks, 1 validates in the calling (web or rq worker) process.
+# More processes speed up validation of large tasks, but every validation starts its own pool
+DDLN_VALIDATION_PROCESSES = int(os.environ.get('DDLN_VALIDATION_PROCESSES', 1))
+
+# Number of threads copying files of exported tasks to the outgoing directory
+DDLN_EXPORT_THREADS = int(os.environ.get('DDLN_EXPORT_THREADS', 8))
+
 MODELS_ROOT = os.path.join(BASE_DIR, 'models')
 os.makedirs(MODELS_ROOT, exist_ok=True)
 
@@ -415,6 +445,10 @@ ANNOTATION_TEAM = "msq"
 INCOMING_TASKS_ROOT = Path(SHARE_ROOT) / 'incoming'
 OUTGOING_TASKS_ROOT = Path(SHARE_ROOT) / 'outgoing'
 
+# Metadata read from the incoming task directories is cached, their mtimes are checked
+# at most once in this number of seconds to notice added or removed files
+DDLN_TASK_METADATA_CHECK_INTERVAL = int(os.environ.get('DDLN_TASK_METADATA_CHECK_INTERVAL', 60))
+
 EXTERNAL_STORAGE_HOST = os.environ.get('EXTERNAL_STORAGE_HOST')
 
 # Inventory client configuration
@@ -429,6 +463,9 @@ INVENTORY_CREDENTIALS_FILENAME = os.environ.get('INVENTORY_CREDENTIALS_FILENAME'
 if INVENTORY_CREDENTIALS_FILENAME:
     INVENTORY_CREDENTIALS_FILENAME = str(SENSITIVE_DATA_DIR / INVENTORY_CREDENTIALS_FILENAME)
 
+# Records are queued and written to the inventory file in one batch every INVENTORY_FLUSH_INTERVAL seconds
+INVENTORY_FLUSH_INTERVAL = int(os.environ.get('INVENTORY_FLUSH_INTERVAL', 60))
+
 DATA_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100 MB
 DATA_UPLOAD_MAX_NUMBER_FIELDS = None   # this django check disabled
 LOCAL_LOAD_MAX_FILES_COUNT = 500
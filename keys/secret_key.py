@@ -0,0 +1 @@
+SECRET_KEY = 'f=l(q$wtkq9p2&5dr$$guuq4+ybep7n#s3f=f7+@c97nl*lurc'
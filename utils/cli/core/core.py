@@ -1,13 +1,34 @@
 # SPDX-License-Identifier: MIT
 import json
 import logging
+import msgpack
 import os
 import requests
+import struct
 from io import BytesIO
 from PIL import Image
 from .definition import ResourceType
 log = logging.getLogger(__name__)
 
+MSGPACK_MEDIA_TYPE = 'application/x-msgpack'
+
+
+def unpack_annotations(content):
+    """ Decode msgpack annotations, points are packed little-endian float32. """
+    data = msgpack.unpackb(content, raw=False)
+
+    def unpack_points(shape):
+        points = shape['points']
+        values = struct.unpack('<{}f'.format(len(points) // 4), points)
+        shape['points'] = [float(format(v, '.7g')) for v in values]
+
+    for shape in data['shapes']:
+        unpack_points(shape)
+    for track in data['tracks']:
+        for shape in track['shapes']:
+            unpack_points(shape)
+    return data
+
 
 class CLI():
 
@@ -129,6 +150,22 @@ class CLI():
             "with annotation file {} finished".format(filename)
         log.info(logger_string)
 
+    def tasks_annotations(self, task_id, filename, wire_format='json', **kwargs):
+        """ Save raw annotations of a task as JSON. The msgpack wire format
+        is smaller and faster to decode for long tracks. """
+        url = self.api.tasks_id_annotations(task_id)
+        if wire_format == 'msgpack':
+            response = self.session.get(url, headers={'Accept': MSGPACK_MEDIA_TYPE})
+            response.raise_for_status()
+            data = unpack_annotations(response.content)
+        else:
+            response = self.session.get(url)
+            response.raise_for_status()
+            data = response.json()
+        with open(filename, 'w') as fp:
+            json.dump(data, fp)
+        log.info('Annotations of Task ID {} saved to {}'.format(task_id, filename))
+
 
 class CVAT_API_V1():
     """ Build parameterized API URLs """
@@ -152,6 +189,9 @@ class CVAT_API_V1():
     def tasks_id_frame_id(self, task_id, frame_id):
         return self.tasks_id(task_id) + '/frames/{}'.format(frame_id)
 
+    def tasks_id_annotations(self, task_id):
+        return self.tasks_id(task_id) + '/annotations'
+
     def tasks_id_annotations_format(self, task_id, fileformat):
         return self.tasks_id(task_id) + '/annotations?format={}' \
             .format(fileformat)
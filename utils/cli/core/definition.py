@@ -234,3 +234,29 @@ upload_parser.add_argument(
     default='CVAT XML 1.1',
     help='annotation format (default: %(default)s)'
 )
+
+#######################################################################
+# Raw annotations
+#######################################################################
+
+annotations_parser = task_subparser.add_parser(
+    'annotations',
+    description='Save raw annotations of a CVAT task as JSON.'
+)
+annotations_parser.add_argument(
+    'task_id',
+    type=int,
+    help='task ID'
+)
+annotations_parser.add_argument(
+    'filename',
+    type=str,
+    help='output file'
+)
+annotations_parser.add_argument(
+    '--wire-format',
+    dest='wire_format',
+    choices=['json', 'msgpack'],
+    default='json',
+    help='encoding used for the transfer (default: %(default)s)'
+)
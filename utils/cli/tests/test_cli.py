@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: MIT
+import json
 import logging
 import io
 import os
@@ -65,6 +66,39 @@ class TestCLI(APITestCase):
         self.assertTrue(os.path.exists(path))
         os.remove(path)
 
+    def test_tasks_annotations(self):
+        path = os.path.join(settings.SHARE_ROOT, 'test_cli_annotations.json')
+        for wire_format in ('json', 'msgpack'):
+            self.cli.tasks_annotations(1, path, wire_format)
+            with open(path) as fp:
+                data = json.load(fp)
+            self.assertEqual((data['shapes'], data['tracks']), ([], []))
+        os.remove(path)
+
+    def test_tasks_annotations_points(self):
+        url = self.api.tasks_id(1)
+        label_id = self.client.get(url).json()['labels'][0]['id']
+        shape = {'type': 'rectangle', 'occluded': False, 'z_order': 0, 'points': [1.5, 2.25, 100.1, 2000.7],
+            'frame': 0, 'label_id': label_id, 'group': 0, 'attributes': []}
+        tracked_shape = {'type': 'points', 'occluded': False, 'z_order': 0, 'points': [0.1, 0.2],
+            'frame': 0, 'outside': False, 'attributes': []}
+        track = {'frame': 0, 'label_id': label_id, 'group': 0, 'attributes': [], 'shapes': [tracked_shape]}
+        response = self.client.put(self.api.tasks_id_annotations(1),
+            json={'version': 0, 'tags': [], 'shapes': [shape], 'tracks': [track]})
+        response.raise_for_status()
+
+        path = os.path.join(settings.SHARE_ROOT, 'test_cli_annotations.json')
+        points = {}
+        for wire_format in ('json', 'msgpack'):
+            self.cli.tasks_annotations(1, path, wire_format)
+            with open(path) as fp:
+                data = json.load(fp)
+            points[wire_format] = ([s['points'] for s in data['shapes']],
+                [s['points'] for t in data['tracks'] for s in t['shapes']])
+        os.remove(path)
+        self.assertEqual(points['msgpack'], ([[1.5, 2.25, 100.1, 2000.7]], [[0.1, 0.2]]))
+        self.assertEqual(points['msgpack'], points['json'])
+
     def test_tasks_frame(self):
         path = os.path.join(settings.SHARE_ROOT, 'task_1_frame_000000.jpg')
         self.cli.tasks_frame(1, [0], outdir=settings.SHARE_ROOT)